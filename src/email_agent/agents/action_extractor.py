@@ -6,10 +6,9 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
-from openai import AsyncOpenAI
-
 from ..config import settings
 from ..models import Email
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +17,7 @@ class ActionExtractorAgent:
     """Agent that extracts actionable items, commitments, and deadlines from emails."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client()
         self.model = settings.openai_model
 
     async def extract_actions(self, email: Email) -> Dict[str, Any]:
@@ -229,4 +228,7 @@ class ActionExtractorAgent:
 
     async def shutdown(self) -> None:
         """Shutdown the action extractor agent."""
+        if self.client is not None:
+            client, self.client = self.client, None
+            await release_openai_client(client)
         logger.info("Action extractor agent shutdown completed")
@@ -14,6 +14,7 @@ from ..config import settings
 from ..models import Email, EmailCategory, EmailRule, RuleCondition
 from ..rules import BuiltinRules, RulesEngine
 from ..rules.processors import create_rule_processor
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +48,7 @@ class CategorizerAgent:
         """Initialize OpenAI client for AI categorization."""
         try:
             if AsyncOpenAI and settings.openai_api_key:
-                self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+                self.openai_client = get_openai_client()
                 logger.info("OpenAI client initialized for categorization")
             else:
                 logger.warning(
@@ -507,6 +508,9 @@ Return only the category name (e.g., "primary", "social", "promotions", etc.).
         try:
             # Clear rules engine
             self.rules_engine.rules.clear()
+            if self.openai_client:
+                client, self.openai_client = self.openai_client, None
+                await release_openai_client(client)
             logger.info("Categorizer agent shutdown completed")
         except Exception as e:
             logger.error(f"Error during categorizer shutdown: {str(e)}")
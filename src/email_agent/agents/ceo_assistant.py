@@ -5,10 +5,9 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List
 
-from openai import AsyncOpenAI
-
 from ..config import settings
 from ..models import Email
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +16,7 @@ class CEOAssistantAgent:
     """Agent that acts as an executive assistant for startup CEOs."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client()
         self.model = settings.openai_model
 
         # Define important domains and contacts
@@ -306,3 +305,10 @@ class CEOAssistantAgent:
             ],
             "status": "ready",
         }
+
+    async def shutdown(self) -> None:
+        """Shutdown the CEO assistant agent."""
+        if self.client is not None:
+            client, self.client = self.client, None
+            await release_openai_client(client)
+        logger.info("CEO assistant agent shutdown completed")
@@ -7,10 +7,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from openai import AsyncOpenAI
-
 from ..config import settings
 from ..models import Email
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +18,7 @@ class CommitmentTrackerAgent:
     """Agent that tracks commitments, deadlines, and follow-ups."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client()
         self.model = settings.openai_model
         self.tracker_db_path = Path(settings.data_dir) / "commitments.db"
         self._init_tracker_db()
@@ -562,4 +561,7 @@ class CommitmentTrackerAgent:
 
     async def shutdown(self) -> None:
         """Shutdown the commitment tracker agent."""
+        if self.client is not None:
+            client, self.client = self.client, None
+            await release_openai_client(client)
         logger.info("Commitment tracker agent shutdown completed")
@@ -344,6 +344,8 @@ class EnhancedCEOLabeler:
             except Exception as e:
                 console.print(f"[dim red]Analysis error: {str(e)[:50]}[/dim red]")
                 return [], "analysis_error"
+            finally:
+                await ceo_assistant.shutdown()
 
         # Context-aware label enhancement
         enhanced_labels = self._enhance_with_context(email, base_labels, sender_profile)
@@ -7,9 +7,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from openai import AsyncOpenAI
-
 from ..config import settings
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +17,7 @@ class LearningFeedbackSystem:
     """System that learns from user feedback to improve AI decisions."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client()
         self.model = settings.openai_model
         self.feedback_db_path = Path(settings.data_dir) / "learning_feedback.db"
         self._init_feedback_db()
@@ -586,4 +585,7 @@ class LearningFeedbackSystem:
 
     async def shutdown(self) -> None:
         """Shutdown the learning system."""
+        if self.client is not None:
+            client, self.client = self.client, None
+            await release_openai_client(client)
         logger.info("Learning feedback system shutdown completed")
@@ -0,0 +1,115 @@
+"""Shared OpenAI client for Email Agent agents."""
+
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+try:
+    from openai import AsyncOpenAI
+except ImportError:
+    AsyncOpenAI = None
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Connection pool limits for the shared HTTP client. Every pooled connection
+# may stay alive so bursts of concurrent requests do not redo TLS handshakes.
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = MAX_CONNECTIONS
+
+# Clients are keyed by (event loop, api_key): the HTTP pool is bound to the
+# loop that first uses it, so a client must never be reused on another loop.
+# Clients created outside a running loop are keyed by ``None``.
+_ClientKey = Tuple[Optional[asyncio.AbstractEventLoop], Optional[str]]
+
+_clients: Dict[_ClientKey, "AsyncOpenAI"] = {}
+_refcounts: Dict[_ClientKey, int] = {}
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the running event loop, or None outside of one."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _drop_closed_loop_clients() -> None:
+    """Forget clients whose event loop has been closed.
+
+    Their connections died with the loop and they can no longer be closed.
+    """
+    for key in [key for key in _clients if key[0] and key[0].is_closed()]:
+        del _clients[key]
+        _refcounts.pop(key, None)
+
+
+async def _close_client(client: "AsyncOpenAI") -> None:
+    """Close a client, logging instead of raising on failure."""
+    try:
+        await client.close()
+    except Exception as e:
+        logger.warning(f"Error closing OpenAI client: {str(e)}")
+
+
+def get_openai_client(api_key: Optional[str] = None) -> "AsyncOpenAI":
+    """Return the shared AsyncOpenAI client for ``api_key`` on this loop.
+
+    Agents running on the same event loop share one client (and its HTTP
+    connection pool) instead of each opening their own connections. Callers
+    must not close the returned client; pass it to ``release_openai_client``
+    when done with it, and the client is closed once its last user releases
+    it. ``close_openai_clients`` closes whatever is left at shutdown.
+    """
+    if AsyncOpenAI is None:
+        raise ImportError("The openai package is required for AI features")
+
+    _drop_closed_loop_clients()
+    key = (_running_loop(), api_key or settings.openai_api_key)
+    client = _clients.get(key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=key[1],
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(60.0, connect=10.0),
+            ),
+        )
+        _clients[key] = client
+    _refcounts[key] = _refcounts.get(key, 0) + 1
+    return client
+
+
+async def release_openai_client(client: "AsyncOpenAI") -> None:
+    """Release a client obtained from ``get_openai_client``."""
+    key = next((key for key, shared in _clients.items() if shared is client), None)
+    if key is None:
+        return
+
+    _refcounts[key] -= 1
+    if _refcounts[key] > 0:
+        return
+
+    del _refcounts[key]
+    del _clients[key]
+    await _close_client(client)
+
+
+async def close_openai_clients() -> None:
+    """Close the shared clients usable on the running event loop.
+
+    Closes the clients created on this loop and those created outside any
+    loop, whatever their reference counts. Clients of other, still running
+    loops are left alone.
+    """
+    _drop_closed_loop_clients()
+    loop = _running_loop()
+    for key in [key for key in _clients if key[0] in (loop, None)]:
+        _refcounts.pop(key, None)
+        await _close_client(_clients.pop(key))
@@ -6,6 +6,7 @@ from typing import Any, Dict, List
 from ..config import settings
 from ..models import Email
 from ..sdk.base import BaseAgent
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +33,7 @@ class SentimentAnalyzer(BaseAgent):
                 settings.openai_api_key
                 and settings.openai_api_key != "your_openai_api_key_here"
             ):
-                import openai
-
-                self.openai_client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+                self.openai_client = get_openai_client()
                 logger.info("Sentiment analyzer LLM initialized")
             else:
                 logger.warning("OpenAI API key not configured for sentiment analysis")
@@ -477,7 +476,8 @@ SUMMARY: [brief explanation of the sentiment analysis]
         """Shutdown the sentiment analyzer."""
         try:
             if self.openai_client:
-                await self.openai_client.close()
+                client, self.openai_client = self.openai_client, None
+                await release_openai_client(client)
             logger.info("Sentiment analyzer shutdown completed")
         except Exception as e:
             logger.error(f"Error during sentiment analyzer shutdown: {str(e)}")
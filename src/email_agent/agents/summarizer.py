@@ -13,6 +13,7 @@ except ImportError:
 
 from ..config import settings
 from ..models import DailyBrief, Email, EmailCategory, EmailPriority
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +35,7 @@ class SummarizerAgent:
         """Initialize LLM client."""
         try:
             if AsyncOpenAI and settings.openai_api_key:
-                self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+                self.openai_client = get_openai_client()
                 logger.info("OpenAI client initialized")
             else:
                 logger.warning(
@@ -585,7 +586,8 @@ Return only the matching email IDs, one per line:
         """Shutdown the summarizer agent."""
         try:
             if self.openai_client:
-                await self.openai_client.close()
+                client, self.openai_client = self.openai_client, None
+                await release_openai_client(client)
             logger.info("Summarizer agent shutdown completed")
         except Exception as e:
             logger.error(f"Error during summarizer shutdown: {str(e)}")
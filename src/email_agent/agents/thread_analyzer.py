@@ -8,6 +8,7 @@ from typing import Any, Dict, List
 from ..config import settings
 from ..models import Email
 from ..sdk.base import BaseAgent
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +34,7 @@ class ThreadAnalyzer(BaseAgent):
                 settings.openai_api_key
                 and settings.openai_api_key != "your_openai_api_key_here"
             ):
-                import openai
-
-                self.openai_client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
+                self.openai_client = get_openai_client()
                 logger.info("Thread analyzer LLM initialized")
             else:
                 logger.warning("OpenAI API key not configured for thread analysis")
@@ -553,7 +552,8 @@ Content: {body_preview}
         """Shutdown the thread analyzer."""
         try:
             if self.openai_client:
-                await self.openai_client.close()
+                client, self.openai_client = self.openai_client, None
+                await release_openai_client(client)
             logger.info("Thread analyzer shutdown completed")
         except Exception as e:
             logger.error(f"Error during thread analyzer shutdown: {str(e)}")
@@ -1,123 +1,953 @@
 """Thread summarization agent for Email Agent."""
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List
+import operator
+import sqlite3
+import time
+from array import array
+from collections import Counter, OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
-from openai import AsyncOpenAI
+import orjson
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    from openai import APIConnectionError, RateLimitError
+
+    # APITimeoutError is a subclass of APIConnectionError
+    _OUTAGE_ERRORS: Tuple[type, ...] = (APIConnectionError, RateLimitError)
+except ImportError:
+    _OUTAGE_ERRORS = ()
 
 from ..config import settings
 from ..models import Email
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """Return the cached tiktoken encoding for ``model``, if tiktoken is installed."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count prompt tokens, falling back to ~4 characters per token."""
+    encoding = _get_encoding(model) if model else None
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+def _truncate_to_tokens(text: str, max_tokens: int, model: str) -> Tuple[str, bool]:
+    """Trim ``text`` to ``max_tokens`` tokens, reporting whether it was cut."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        max_chars = max_tokens * 4
+        return text[:max_chars], len(text) > max_chars
+
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text, False
+    return encoding.decode(tokens[:max_tokens]), True
+
+
+def _strict_object(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a strict-mode JSON Schema object requiring every property."""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _enum(*values: str) -> Dict[str, Any]:
+    return {"type": "string", "enum": list(values)}
+
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+THREAD_SUMMARY_SCHEMA = _strict_object(
+    {
+        "thread_summary": _STRING,
+        "key_decisions": _STRING_LIST,
+        "action_items": {
+            "type": "array",
+            "items": _strict_object(
+                {
+                    "action": _STRING,
+                    "owner": _STRING,
+                    "deadline": {"type": ["string", "null"]},
+                    "status": _enum("open", "completed", "blocked"),
+                }
+            ),
+        },
+        "participants": {
+            "type": "array",
+            "items": _strict_object(
+                {
+                    "email": _STRING,
+                    "role": _enum("initiator", "responder", "cc"),
+                    "engagement_level": _enum("high", "medium", "low"),
+                }
+            ),
+        },
+        "thread_status": _enum("resolved", "ongoing", "stalled", "escalated"),
+        "priority_level": _enum("urgent", "high", "medium", "low"),
+        "sentiment": _enum("positive", "neutral", "negative", "mixed"),
+        "next_steps": _STRING_LIST,
+        "key_dates": {
+            "type": "array",
+            "items": _strict_object({"date": _STRING, "event": _STRING}),
+        },
+        "thread_type": _enum(
+            "discussion", "decision", "information", "request", "meeting", "complaint"
+        ),
+        "requires_attention": {"type": "boolean"},
+        "estimated_resolution_time": _STRING,
+    }
+)
+
+THREAD_INSIGHTS_SCHEMA = _strict_object(
+    {
+        "business_impact": _STRING,
+        "risk_factors": _STRING_LIST,
+        "opportunities": _STRING_LIST,
+        "communication_quality": _STRING,
+        "escalation_needed": {"type": "boolean"},
+        "follow_up_strategy": _STRING,
+        "similar_patterns": _STRING,
+        "efficiency_score": {"type": "integer"},
+        "collaboration_score": {"type": "integer"},
+        "recommendations": _STRING_LIST,
+    }
+)
+
+THREAD_ANALYSIS_SCHEMA = _strict_object(
+    {"summary": THREAD_SUMMARY_SCHEMA, "insights": THREAD_INSIGHTS_SCHEMA}
+)
+
+
+def _json_schema_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap a schema as a structured-output ``response_format``."""
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema},
+    }
+
+
+SUMMARY_RESPONSE_FORMAT = _json_schema_format("thread_summary", THREAD_SUMMARY_SCHEMA)
+INSIGHTS_RESPONSE_FORMAT = _json_schema_format(
+    "thread_insights", THREAD_INSIGHTS_SCHEMA
+)
+ANALYSIS_RESPONSE_FORMAT = _json_schema_format(
+    "thread_analysis", THREAD_ANALYSIS_SCHEMA
+)
+
+# Response formats by model name prefix, most specific first. Structured
+# outputs (json_schema) need gpt-4o-2024-08-06 or later; older JSON-mode
+# models get json_object, and anything else (including plain gpt-4, the
+# default model) is prompted for JSON without a response_format.
+MODEL_RESPONSE_FORMATS = (
+    ("gpt-4o-2024-05-13", "json_object"),
+    ("gpt-4o", "json_schema"),
+    ("gpt-4.1", "json_schema"),
+    ("gpt-5", "json_schema"),
+    ("gpt-4-turbo", "json_object"),
+    ("gpt-4-1106", "json_object"),
+    ("gpt-4-0125", "json_object"),
+    ("gpt-3.5-turbo", "json_object"),
+)
+JSON_OBJECT_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Context window sizes by model name prefix, most specific first
+MODEL_CONTEXT_WINDOWS = (
+    ("gpt-4o", 128000),
+    ("gpt-4-turbo", 128000),
+    ("gpt-4.1", 1000000),
+    ("gpt-4-32k", 32768),
+    ("gpt-4", 8192),
+    ("gpt-3.5-turbo", 16385),
+)
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Static prompt fragments, built once at import time rather than per request.
+# The JSON shapes live at the start of the system messages so every request
+# shares an identical prefix that OpenAI can serve from its prompt cache;
+# only the user message varies per thread.
+_SUMMARY_SCHEMA_TEXT = """{
+  "thread_summary": "brief overview of the thread topic and progression",
+  "key_decisions": ["important decisions made"],
+  "action_items": [{"action": "what needs to be done", "owner": "who should do it", "deadline": "YYYY-MM-DD or null", "status": "open|completed|blocked"}],
+  "participants": [{"email": "participant email", "role": "initiator|responder|cc", "engagement_level": "high|medium|low"}],
+  "thread_status": "resolved|ongoing|stalled|escalated",
+  "priority_level": "urgent|high|medium|low",
+  "sentiment": "positive|neutral|negative|mixed",
+  "next_steps": ["what should happen next"],
+  "key_dates": [{"date": "YYYY-MM-DD", "event": "what happened"}],
+  "thread_type": "discussion|decision|information|request|meeting|complaint",
+  "requires_attention": true/false,
+  "estimated_resolution_time": "time estimate for completion"
+}"""
+
+_INSIGHTS_SCHEMA_TEXT = """{
+  "business_impact": "assessment of business/personal impact",
+  "risk_factors": ["potential risks or blockers"],
+  "opportunities": ["potential opportunities identified"],
+  "communication_quality": "assessment of communication effectiveness",
+  "escalation_needed": true/false,
+  "follow_up_strategy": "recommended approach for follow-up",
+  "similar_patterns": "any recurring patterns noticed",
+  "efficiency_score": 1-10,
+  "collaboration_score": 1-10,
+  "recommendations": ["specific actionable recommendations"]
+}"""
+
+_SUMMARY_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "Thread summary JSON shape:\n"
+        + _SUMMARY_SCHEMA_TEXT
+        + "\n\nYou are an expert email thread analyst. Extract key insights and "
+        "actionable information from email conversations, focusing on actionable "
+        "insights and clear next steps. Return only valid JSON in the shape above."
+    ),
+}
+
+_INSIGHTS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "Thread insights JSON shape:\n"
+        + _INSIGHTS_SCHEMA_TEXT
+        + "\n\nYou are a business communication analyst. Provide strategic "
+        "insights on email thread effectiveness and outcomes. Return only valid "
+        "JSON in the shape above."
+    ),
+}
+
+_ANALYSIS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": (
+        "Thread summary JSON shape:\n"
+        + _SUMMARY_SCHEMA_TEXT
+        + "\n\nThread insights JSON shape:\n"
+        + _INSIGHTS_SCHEMA_TEXT
+        + "\n\nYou are an expert email thread analyst and business communication "
+        "analyst. Summarize email conversations, focusing on actionable insights "
+        "and clear next steps, and assess their effectiveness and outcomes. "
+        'Return only valid JSON: {"summary": <thread summary>, '
+        '"insights": <thread insights>}.'
+    ),
+}
+
+_SUMMARY_PROMPT_HEADER = (
+    "Analyze this email thread and provide a comprehensive summary:\n\n"
+)
+
+_INSIGHTS_PROMPT_HEADER = (
+    "Based on this email thread summary, provide strategic insights:\n\n"
+)
+
+_COMBINE_PROMPT_HEADER = (
+    "These are summaries of consecutive parts of one email thread, oldest "
+    "first. Combine them into a single summary of the whole thread:\n\n"
+)
+
+_MESSAGE_TEMPLATE = """
+Message {index} ({date}):
+From: {sender}
+Subject: {subject}
+Body: {body}
+"""
+
+
+def _format_body(text: str, max_tokens: int, model: str) -> str:
+    """Trim a message body to ``max_tokens``, marking it when it was cut."""
+    body, truncated = _truncate_to_tokens(text, max_tokens, model)
+    return body + "..." if truncated else body
+
+
+class _AsyncTokenBucket:
+    """Async token bucket refilling ``capacity`` tokens every ``period`` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until ``amount`` tokens are available and consume them."""
+        amount = min(float(amount), self.capacity)
+
+        # Waiters queue on the lock so the bucket is drained in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+
+class _CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call without sending it."""
+
+
+def _is_outage_error(error: Exception) -> bool:
+    """Return whether an OpenAI error points at an outage, not the request.
+
+    Connection failures, timeouts, rate limiting and 5xx responses count
+    towards opening the circuit breaker; deterministic client errors such
+    as a 400 bad request or a content filter rejection do not.
+    """
+    if isinstance(error, _OUTAGE_ERRORS):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and status_code >= 500
+
+
+class _CircuitBreaker:
+    """Fast-fail OpenAI calls while the API is failing.
+
+    After ``failure_threshold`` consecutive outage failures (see
+    ``_is_outage_error``) the circuit opens and calls are rejected for
+    ``reset_timeout`` seconds. It then half-opens and lets a single probe
+    through; a successful probe closes the circuit, a failed one re-opens it
+    with a doubled timeout. State changes never await, so they are atomic
+    with respect to other tasks on the event loop.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 300.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self.open_timeout = reset_timeout
+        self.probe_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        logger.warning(f"OpenAI circuit breaker: {self.state} -> {state}")
+        self.state = state
+
+    def _open(self) -> None:
+        self.opened_at = time.monotonic()
+        self._transition(self.OPEN)
+
+    def before_call(self) -> None:
+        """Admit a call or raise ``_CircuitOpenError``."""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.open_timeout:
+                raise _CircuitOpenError("circuit_open")
+            self._transition(self.HALF_OPEN)
+
+        if self.state == self.HALF_OPEN:
+            if self.probe_in_flight:
+                raise _CircuitOpenError("circuit_open")
+            self.probe_in_flight = True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+        self.failure_count = 0
+        self.open_timeout = self.reset_timeout
+        self.probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the circuit when needed."""
+        self.failure_count += 1
+
+        if self.state == self.HALF_OPEN:
+            self.probe_in_flight = False
+            self.open_timeout = min(self.open_timeout * 2, self.max_reset_timeout)
+            self._open()
+        elif (
+            self.state == self.CLOSED and self.failure_count >= self.failure_threshold
+        ):
+            self._open()
+
+    def release_probe(self) -> None:
+        """Give up a probe slot without recording an outcome (e.g. cancellation)."""
+        self.probe_in_flight = False
+
+
+class _EmbeddingCache:
+    """LRU cache of text embeddings, persisted to SQLite for reuse across runs.
+
+    Entries are keyed by ``sha256(model + "\\0" + text)``. The database is
+    only created on first use, and all SQLite I/O runs in a worker thread so
+    it never blocks the event loop.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, maxsize: int = 10000):
+        self.db_path = db_path
+        self.maxsize = maxsize
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._db_ready = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database, creating it on first use; None when disabled."""
+        if self.db_path is None:
+            return None
+        try:
+            if not self._db_ready:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            if not self._db_ready:
+                with conn:
+                    conn.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS embeddings (
+                            hash TEXT PRIMARY KEY,
+                            model TEXT,
+                            vec BLOB
+                        )
+                    """
+                    )
+                self._db_ready = True
+            return conn
+        except Exception as e:
+            logger.warning(f"Embedding cache persistence disabled: {str(e)}")
+            self.db_path = None
+            return None
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+    def _read_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Read stored embeddings for ``keys`` (runs in a worker thread)."""
+        conn = self._connect()
+        if conn is None:
+            return {}
+        try:
+            with conn:
+                placeholders = ", ".join("?" * len(keys))
+                rows = conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})",
+                    keys,
+                ).fetchall()
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {str(e)}")
+            return {}
+        finally:
+            conn.close()
+        return {key: array("f", vec).tolist() for key, vec in rows}
+
+    def _write_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """Store embeddings on disk (runs in a worker thread)."""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (hash, model, vec) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (key, model, array("f", vector).tobytes())
+                        for key, vector in vectors.items()
+                    ],
+                )
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {str(e)}")
+        finally:
+            conn.close()
+
+    async def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up embeddings in memory, then on disk; misses are left out."""
+        found: Dict[str, List[float]] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            vector = self._memory.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                self._memory.move_to_end(key)
+                found[key] = vector
+
+        if missing and self.db_path is not None:
+            # SQLite limits the number of bound parameters per statement
+            for start in range(0, len(missing), 500):
+                stored = await asyncio.to_thread(
+                    self._read_many, missing[start : start + 500]
+                )
+                for key, vector in stored.items():
+                    self._remember(key, vector)
+                found.update(stored)
+
+        return found
+
+    async def put_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """Store embeddings in memory and on disk."""
+        for key, vector in vectors.items():
+            self._remember(key, vector)
+
+        if vectors and self.db_path is not None:
+            await asyncio.to_thread(self._write_many, model, vectors)
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+
+class _StreamingObjectParser:
+    """Incrementally extract top-level fields from a streamed JSON object.
+
+    ``feed`` returns the ``(key, value)`` pairs completed by the new text. A
+    value is only reported once the ``,`` or ``}`` that ends it has arrived,
+    so numbers cut off mid-stream (``8`` of ``8.5``) are never emitted early.
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._started = False
+        self.done = False
+
+    @staticmethod
+    def _skip_whitespace(text: str, pos: int) -> int:
+        while pos < len(text) and text[pos] in " \t\r\n":
+            pos += 1
+        return pos
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self.buffer += text
+        buf = self.buffer
+        fields = []
+
+        while not self.done:
+            pos = self._skip_whitespace(buf, self._pos)
+            if pos >= len(buf):
+                break
+
+            if not self._started:
+                if buf[pos] != "{":
+                    raise ValueError("Streamed response is not a JSON object")
+                self._started = True
+                self._pos = pos + 1
+                continue
+
+            if buf[pos] == ",":
+                self._pos = pos + 1
+                continue
+            if buf[pos] == "}":
+                self._pos = pos + 1
+                self.done = True
+                break
+
+            try:
+                key, end = self._decoder.raw_decode(buf, pos)
+                colon = self._skip_whitespace(buf, end)
+                if colon >= len(buf):
+                    break
+                value_start = self._skip_whitespace(buf, colon + 1)
+                value, value_end = self._decoder.raw_decode(buf, value_start)
+            except json.JSONDecodeError:
+                break
+
+            # The value may still be growing until a delimiter follows it
+            delimiter = self._skip_whitespace(buf, value_end)
+            if delimiter >= len(buf) or buf[delimiter] not in ",}":
+                break
+
+            fields.append((key, value))
+            self._pos = value_end
+
+        return fields
+
+
+# Timestamps stamped on results are reused for up to 100ms so that large
+# fan-outs do not format a fresh datetime for every thread
+_NOW_ISO_TTL = 0.1
+_now_iso_cache = [0.0, ""]
+
+
+def _now_iso() -> str:
+    """Return the current local time in ISO format, cached for 100ms."""
+    now = time.time()
+    if now - _now_iso_cache[0] > _NOW_ISO_TTL:
+        _now_iso_cache[:] = [now, datetime.fromtimestamp(now).isoformat()]
+    return _now_iso_cache[1]
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_deadline(value: str) -> date:
+    """Parse a YYYY-MM-DD deadline; many action items share the same dates."""
+    return date.fromisoformat(value)
+
+
+def _sort_by_date(emails: List[Email]) -> List[Email]:
+    """Return emails in date order, skipping the sort when already ordered."""
+    for previous, current in zip(emails, emails[1:]):
+        if current.date < previous.date:
+            return sorted(emails, key=lambda e: e.date)
+    return list(emails)
+
+
+def _thread_key(sorted_emails: List[Email]) -> str:
+    """Identify a thread by the ids and dates of its messages."""
+    digest = hashlib.sha256()
+    for email in sorted_emails:
+        digest.update(f"{email.id}\0{email.date.isoformat()}\0".encode())
+    return digest.hexdigest()
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(map(operator.mul, a, b))
+    norm = (sum(map(operator.mul, a, a)) * sum(map(operator.mul, b, b))) ** 0.5
+    return dot / norm if norm else 0.0
+
+
 class ThreadSummarizerAgent:
     """Agent that summarizes email threads and extracts key insights."""
 
-    def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+    # The Batch API has a latency floor of minutes, so only large jobs use it
+    BATCH_API_MIN_THREADS = 20
+    BATCH_API_POLL_INTERVAL = 30.0
+    BATCH_API_TERMINAL_STATES = ("completed", "failed", "expired", "cancelled")
+
+    # Threads whose embeddings are at least this similar share one summary
+    EMBEDDING_MODEL = "text-embedding-3-small"
+    EMBEDDING_MAX_TOKENS = 2000
+    EMBEDDING_BATCH_SIZE = 2048
+    SEMANTIC_DEDUP_THRESHOLD = 0.97
+
+    # Completion tokens kept free when checking a prompt against the context
+    RESERVED_OUTPUT_TOKENS = 2000
+
+    # Token budget shared by all message bodies in a summary prompt
+    BODY_TOKEN_BUDGET = 3000
+    MIN_BODY_TOKENS_PER_EMAIL = 50
+    MAX_BODY_TOKENS_PER_EMAIL = 200
+
+    def __init__(self, max_concurrency: int = 10):
+        self.client = get_openai_client()
         self.model = settings.openai_model
+        self.max_concurrency = max_concurrency
+        self._response_format_type = self._model_response_format_type()
 
-    async def summarize_thread(self, emails: List[Email]) -> Dict[str, Any]:
-        """Summarize an email thread with key insights."""
+        # Throttle proactively instead of relying on 429 retries
+        self._request_limiter = _AsyncTokenBucket(settings.openai_requests_per_minute)
+        self._token_limiter = _AsyncTokenBucket(settings.openai_tokens_per_minute)
+        self._circuit_breaker = _CircuitBreaker()
+        self._inflight: Dict[str, asyncio.Future] = {}
 
-        if not emails:
-            return {"error": "No emails provided"}
+        # Only semantic deduplication needs embeddings, so the cache (and its
+        # database file) is created the first time it is used
+        self._embedding_cache: Optional[_EmbeddingCache] = None
 
-        # Sort emails by date
-        sorted_emails = sorted(emails, key=lambda e: e.date)
-
-        # Build thread context
-        thread_context = []
-        for i, email in enumerate(sorted_emails):
-            thread_context.append(
-                f"""
-Message {i+1} ({email.date.strftime('%Y-%m-%d %H:%M')}):
-From: {email.sender.name or email.sender.email}
-Subject: {email.subject}
-Body: {email.body[:800]}...
-"""
-            )
+    def _model_response_format_type(self) -> Optional[str]:
+        """Response format type supported by the configured model, if any."""
+        for prefix, format_type in MODEL_RESPONSE_FORMATS:
+            if self.model.startswith(prefix):
+                return format_type
+        return None
 
-        prompt = f"""
-        Analyze this email thread and provide a comprehensive summary:
-        
-        {chr(10).join(thread_context)}
-        
-        Provide a JSON response with:
-        {{
-            "thread_summary": "Brief overview of the thread topic and progression",
-            "key_decisions": ["list of important decisions made"],
-            "action_items": [
-                {{
-                    "action": "what needs to be done",
-                    "owner": "who should do it",
-                    "deadline": "YYYY-MM-DD or null",
-                    "status": "open|completed|blocked"
-                }}
-            ],
-            "participants": [
-                {{
-                    "email": "participant email",
-                    "role": "initiator|responder|cc",
-                    "engagement_level": "high|medium|low"
-                }}
-            ],
-            "thread_status": "resolved|ongoing|stalled|escalated",
-            "priority_level": "urgent|high|medium|low",
-            "sentiment": "positive|neutral|negative|mixed",
-            "next_steps": ["what should happen next"],
-            "key_dates": [
-                {{
-                    "date": "YYYY-MM-DD",
-                    "event": "description of what happened"
-                }}
-            ],
-            "thread_type": "discussion|decision|information|request|meeting|complaint",
-            "requires_attention": true/false,
-            "estimated_resolution_time": "time estimate for completion"
-        }}
-        
-        Focus on actionable insights and clear next steps.
+    def _response_format(self, schema_format: Dict[str, Any]) -> Dict[str, Any]:
+        """Completion arguments requesting ``schema_format`` where supported.
+
+        Models without structured outputs fall back to JSON mode, or to the
+        JSON shape given in the system prompt when they lack that too.
         """
+        if self._response_format_type == "json_schema":
+            return {"response_format": schema_format}
+        if self._response_format_type == "json_object":
+            return {"response_format": JSON_OBJECT_RESPONSE_FORMAT}
+        return {}
+
+    async def _create_completion(self, messages: List[Dict[str, str]], **kwargs):
+        """Create a chat completion once the breaker and rate limiters admit it."""
+        self._circuit_breaker.before_call()
 
         try:
+            estimated_tokens = sum(
+                _estimate_tokens(m["content"], self.model) for m in messages
+            )
+            await self._request_limiter.acquire()
+            await self._token_limiter.acquire(estimated_tokens)
+
             response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert email thread analyst. Extract key insights and actionable information from email conversations. Return only valid JSON.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.1,
+                model=self.model, messages=messages, **kwargs
             )
+        except Exception as e:
+            if _is_outage_error(e):
+                self._circuit_breaker.record_failure()
+            else:
+                self._circuit_breaker.release_probe()
+            raise
+        except BaseException:
+            self._circuit_breaker.release_probe()
+            raise
 
-            result = json.loads(response.choices[0].message.content)
+        self._circuit_breaker.record_success()
 
-            # Add metadata
-            result["thread_id"] = emails[0].thread_id if emails else None
-            result["email_count"] = len(emails)
-            result["date_range"] = {
-                "start": sorted_emails[0].date.isoformat(),
-                "end": sorted_emails[-1].date.isoformat(),
-            }
-            result["summarized_at"] = datetime.now().isoformat()
+        usage = getattr(response, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        if details is not None:
+            logger.debug(
+                f"Prompt tokens: {usage.prompt_tokens}, "
+                f"cached: {getattr(details, 'cached_tokens', 0)}"
+            )
+
+        return response
+
+    def _build_summary_messages(
+        self, sorted_emails: List[Email]
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages used to summarize a date-sorted thread."""
+
+        # Split the body budget evenly across the messages in the thread
+        body_tokens = min(
+            self.MAX_BODY_TOKENS_PER_EMAIL,
+            max(
+                self.MIN_BODY_TOKENS_PER_EMAIL,
+                self.BODY_TOKEN_BUDGET // len(sorted_emails),
+            ),
+        )
 
+        thread_context = [
+            _MESSAGE_TEMPLATE.format(
+                index=i + 1,
+                date=email.date.strftime("%Y-%m-%d %H:%M"),
+                sender=email.sender.name or email.sender.email,
+                subject=email.subject,
+                body=_format_body(email.body_text or "", body_tokens, self.model),
+            )
+            for i, email in enumerate(sorted_emails)
+        ]
+
+        prompt = _SUMMARY_PROMPT_HEADER + "\n".join(thread_context)
+
+        return [_SUMMARY_SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
+
+    def _add_summary_metadata(
+        self,
+        result: Dict[str, Any],
+        emails: List[Email],
+        sorted_emails: List[Email],
+    ) -> Dict[str, Any]:
+        """Attach thread metadata to a parsed summary."""
+        result["thread_id"] = emails[0].thread_id if emails else None
+        result["email_count"] = len(emails)
+        result["date_range"] = {
+            "start": sorted_emails[0].date.isoformat(),
+            "end": sorted_emails[-1].date.isoformat(),
+        }
+        result["summarized_at"] = _now_iso()
+
+        return result
+
+    async def summarize_thread(self, emails: List[Email]) -> Dict[str, Any]:
+        """Summarize an email thread with key insights.
+
+        Concurrent calls for the same thread share a single in-flight request.
+        """
+
+        if not emails:
+            return {"error": "No emails provided"}
+
+        sorted_emails = _sort_by_date(emails)
+        key = _thread_key(sorted_emails)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return dict(await asyncio.shield(pending))
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._summarize_sorted_thread(emails, sorted_emails)
+            future.set_result(result)
             return result
+        finally:
+            if not future.done():
+                future.set_result(
+                    {
+                        "error": "Summarization cancelled",
+                        "thread_id": emails[0].thread_id,
+                        "email_count": len(emails),
+                    }
+                )
+            del self._inflight[key]
 
+    async def _summarize_sorted_thread(
+        self, emails: List[Email], sorted_emails: List[Email]
+    ) -> Dict[str, Any]:
+        """Request a summary for a non-empty, date-sorted thread."""
+
+        try:
+            result = await self._request_summary(sorted_emails)
+
+            return self._add_summary_metadata(result, emails, sorted_emails)
+
+        except _CircuitOpenError as e:
+            return {
+                "error": str(e),
+                "thread_id": emails[0].thread_id,
+                "email_count": len(emails),
+            }
         except Exception as e:
             logger.error(f"Failed to summarize thread: {str(e)}")
             return {
                 "error": str(e),
-                "thread_id": emails[0].thread_id if emails else None,
+                "thread_id": emails[0].thread_id,
                 "email_count": len(emails),
             }
 
+    def _max_input_tokens(self) -> int:
+        """Prompt token budget for the configured model."""
+        context_window = DEFAULT_CONTEXT_WINDOW
+        for prefix, window in MODEL_CONTEXT_WINDOWS:
+            if self.model.startswith(prefix):
+                context_window = window
+                break
+        return context_window - self.RESERVED_OUTPUT_TOKENS
+
+    def _exceeds_input_limit(self, messages: List[Dict[str, str]]) -> bool:
+        prompt_tokens = sum(
+            _estimate_tokens(m["content"], self.model) for m in messages
+        )
+        return prompt_tokens > self._max_input_tokens()
+
+    async def _request_summary(self, sorted_emails: List[Email]) -> Dict[str, Any]:
+        """Request the raw summary JSON for a date-sorted thread.
+
+        Threads whose prompt would overflow the model's context are split in
+        half, summarized separately and merged, instead of being sent to fail.
+        """
+
+        messages = self._build_summary_messages(sorted_emails)
+        if len(sorted_emails) > 1 and self._exceeds_input_limit(messages):
+            return await self._map_reduce_summarize(sorted_emails)
+
+        response = await self._create_completion(
+            messages=messages,
+            temperature=0.1,
+            **self._response_format(SUMMARY_RESPONSE_FORMAT),
+        )
+
+        return orjson.loads(response.choices[0].message.content)
+
+    async def _map_reduce_summarize(self, sorted_emails: List[Email]) -> Dict[str, Any]:
+        """Summarize both halves of an oversized thread and merge the results."""
+
+        middle = len(sorted_emails) // 2
+        logger.info(
+            f"Thread with {len(sorted_emails)} emails exceeds the {self.model} "
+            f"context, summarizing in parts"
+        )
+
+        partials = await asyncio.gather(
+            self._request_summary(sorted_emails[:middle]),
+            self._request_summary(sorted_emails[middle:]),
+        )
+
+        prompt = _COMBINE_PROMPT_HEADER + orjson.dumps(
+            partials, option=orjson.OPT_INDENT_2
+        ).decode()
+        response = await self._create_completion(
+            messages=[_SUMMARY_SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+            temperature=0.1,
+            **self._response_format(SUMMARY_RESPONSE_FORMAT),
+        )
+
+        return orjson.loads(response.choices[0].message.content)
+
+    async def stream_thread_summary(
+        self, emails: List[Email]
+    ) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        """Stream a thread summary, yielding fields as soon as they complete.
+
+        Yields ``(field, value)`` for each top-level summary field while the
+        completion is still being generated, then ``(None, summary)`` with the
+        full summary (or error dict) as returned by ``summarize_thread``.
+        """
+
+        if not emails:
+            yield None, {"error": "No emails provided"}
+            return
+
+        sorted_emails = _sort_by_date(emails)
+        parser = _StreamingObjectParser()
+
+        try:
+            stream = await self._create_completion(
+                messages=self._build_summary_messages(sorted_emails),
+                temperature=0.1,
+                **self._response_format(SUMMARY_RESPONSE_FORMAT),
+                stream=True,
+            )
+
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for field, value in parser.feed(chunk.choices[0].delta.content or ""):
+                    yield field, value
+
+            result = orjson.loads(parser.buffer)
+
+        except Exception as e:
+            if not isinstance(e, _CircuitOpenError):
+                logger.error(f"Failed to stream thread summary: {str(e)}")
+            yield None, {
+                "error": str(e),
+                "thread_id": emails[0].thread_id,
+                "email_count": len(emails),
+            }
+            return
+
+        yield None, self._add_summary_metadata(result, emails, sorted_emails)
+
     async def get_thread_insights(
         self, thread_summary: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -126,76 +956,384 @@ Body: {email.body[:800]}...
         if "error" in thread_summary:
             return thread_summary
 
-        insights_prompt = f"""
-        Based on this email thread summary, provide strategic insights:
-        
-        Thread Summary: {thread_summary.get('thread_summary', 'N/A')}
-        Status: {thread_summary.get('thread_status', 'N/A')}
-        Priority: {thread_summary.get('priority_level', 'N/A')}
-        Type: {thread_summary.get('thread_type', 'N/A')}
-        
-        Action Items: {json.dumps(thread_summary.get('action_items', []), indent=2)}
-        
-        Provide insights as JSON:
-        {{
-            "business_impact": "assessment of business/personal impact",
-            "risk_factors": ["potential risks or blockers"],
-            "opportunities": ["potential opportunities identified"],
-            "communication_quality": "assessment of communication effectiveness",
-            "escalation_needed": true/false,
-            "follow_up_strategy": "recommended approach for follow-up",
-            "similar_patterns": "any recurring patterns noticed",
-            "efficiency_score": 1-10,
-            "collaboration_score": 1-10,
-            "recommendations": ["specific actionable recommendations"]
-        }}
-        """
+        if self._should_skip_insights(thread_summary):
+            return self._local_thread_insights(thread_summary)
+
+        action_items = orjson.dumps(
+            thread_summary.get("action_items", []), option=orjson.OPT_INDENT_2
+        ).decode()
+        insights_prompt = (
+            _INSIGHTS_PROMPT_HEADER
+            + f"Thread Summary: {thread_summary.get('thread_summary', 'N/A')}\n"
+            f"Status: {thread_summary.get('thread_status', 'N/A')}\n"
+            f"Priority: {thread_summary.get('priority_level', 'N/A')}\n"
+            f"Type: {thread_summary.get('thread_type', 'N/A')}\n\n"
+            f"Action Items: {action_items}"
+        )
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._create_completion(
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a business communication analyst. Provide strategic insights on email thread effectiveness and outcomes.",
-                    },
+                    _INSIGHTS_SYSTEM_MESSAGE,
                     {"role": "user", "content": insights_prompt},
                 ],
                 temperature=0.2,
+                **self._response_format(INSIGHTS_RESPONSE_FORMAT),
             )
 
-            insights = json.loads(response.choices[0].message.content)
-            insights["insights_generated_at"] = datetime.now().isoformat()
+            insights = orjson.loads(response.choices[0].message.content)
+            insights["insights_generated_at"] = _now_iso()
 
             return insights
 
+        except _CircuitOpenError as e:
+            return {"error": str(e)}
         except Exception as e:
             logger.error(f"Failed to generate thread insights: {str(e)}")
             return {"error": str(e)}
 
-    async def summarize_multiple_threads(
+    async def summarize_and_analyze(self, emails: List[Email]) -> Dict[str, Any]:
+        """Summarize a thread and generate its insights in a single request.
+
+        Returns the thread summary with the insights under ``"insights"``. If
+        the combined request fails, falls back to ``summarize_thread``
+        followed by ``get_thread_insights``.
+        """
+
+        if not emails:
+            return {"error": "No emails provided"}
+
+        sorted_emails = _sort_by_date(emails)
+        messages = self._build_summary_messages(sorted_emails)
+        messages[0] = _ANALYSIS_SYSTEM_MESSAGE
+
+        # Oversized threads need the split-and-merge path of summarize_thread
+        if self._exceeds_input_limit(messages):
+            result = await self.summarize_thread(emails)
+            if "error" not in result:
+                result["insights"] = await self.get_thread_insights(result)
+            return result
+
+        try:
+            response = await self._create_completion(
+                messages=messages,
+                temperature=0.1,
+                **self._response_format(ANALYSIS_RESPONSE_FORMAT),
+            )
+
+            analysis = orjson.loads(response.choices[0].message.content)
+            result = self._add_summary_metadata(
+                analysis["summary"], emails, sorted_emails
+            )
+            result["insights"] = analysis["insights"]
+            result["insights"]["insights_generated_at"] = result["summarized_at"]
+
+            return result
+
+        except _CircuitOpenError as e:
+            return {
+                "error": str(e),
+                "thread_id": emails[0].thread_id,
+                "email_count": len(emails),
+            }
+        except Exception as e:
+            logger.warning(f"Combined thread analysis failed, falling back: {str(e)}")
+
+        result = await self.summarize_thread(emails)
+        if "error" not in result:
+            result["insights"] = await self.get_thread_insights(result)
+        return result
+
+    def _should_skip_insights(self, thread_summary: Dict[str, Any]) -> bool:
+        """Whether a thread is too trivial to justify a second model call."""
+        return (
+            thread_summary.get("email_count", 0) < 3
+            and thread_summary.get("thread_status") == "resolved"
+            and len(thread_summary.get("action_items", [])) < 2
+            and not thread_summary.get("requires_attention", False)
+        )
+
+    def _local_thread_insights(
+        self, thread_summary: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build insights for a trivial thread without calling the model."""
+        next_steps = thread_summary.get("next_steps", [])
+        return {
+            "business_impact": "low",
+            "risk_factors": [],
+            "opportunities": [],
+            "communication_quality": "Short thread resolved without escalation",
+            "escalation_needed": False,
+            "follow_up_strategy": (
+                next_steps[0] if next_steps else "No follow-up needed"
+            ),
+            "similar_patterns": "none",
+            # Not assessed; the overview leaves these out of its averages
+            "efficiency_score": None,
+            "collaboration_score": None,
+            "recommendations": list(next_steps),
+            "insights_generated_at": _now_iso(),
+            "generated_locally": True,
+        }
+
+    def _embedding_text(self, emails: List[Email]) -> str:
+        """Build the text used to embed a thread for semantic deduplication."""
+        sorted_emails = _sort_by_date(emails)
+        text = "\n\n".join(
+            f"{email.subject}\n{email.body_text or ''}" for email in sorted_emails
+        )
+        truncated, _ = _truncate_to_tokens(
+            text, self.EMBEDDING_MAX_TOKENS, self.EMBEDDING_MODEL
+        )
+        return truncated
+
+    def _get_embedding_cache(self) -> _EmbeddingCache:
+        if self._embedding_cache is None:
+            self._embedding_cache = _EmbeddingCache(
+                Path(settings.data_dir) / "thread_embeddings.db"
+            )
+        return self._embedding_cache
+
+    async def embed_threads(
         self, thread_groups: List[List[Email]]
+    ) -> List[List[float]]:
+        """Embed several threads, sending all cache misses in one request."""
+        cache = self._get_embedding_cache()
+        texts = [self._embedding_text(emails) for emails in thread_groups]
+        keys = [cache.key(self.EMBEDDING_MODEL, text) for text in texts]
+
+        vectors = await cache.get_many(keys)
+        misses = {key: text for key, text in zip(keys, texts) if key not in vectors}
+
+        miss_items = list(misses.items())
+        for start in range(0, len(miss_items), self.EMBEDDING_BATCH_SIZE):
+            chunk = miss_items[start : start + self.EMBEDDING_BATCH_SIZE]
+            response = await self.client.embeddings.create(
+                model=self.EMBEDDING_MODEL, input=[text for _, text in chunk]
+            )
+            data = sorted(response.data, key=lambda item: item.index)
+            computed = {key: item.embedding for (key, _), item in zip(chunk, data)}
+            await cache.put_many(self.EMBEDDING_MODEL, computed)
+            vectors.update(computed)
+
+        return [vectors[key] for key in keys]
+
+    async def _summarize_with_semantic_dedup(
+        self,
+        thread_groups: List[List[Email]],
+        use_batch_api: bool,
+        with_insights: bool,
     ) -> List[Dict[str, Any]]:
-        """Summarize multiple threads efficiently."""
+        """Summarize only one thread per group of near-identical threads."""
+
+        non_empty = [i for i, emails in enumerate(thread_groups) if emails]
+        try:
+            vectors = await self.embed_threads([thread_groups[i] for i in non_empty])
+        except Exception as e:
+            logger.warning(f"Semantic dedup unavailable, summarizing all: {str(e)}")
+            return await self.summarize_multiple_threads(
+                thread_groups, use_batch_api=use_batch_api, with_insights=with_insights
+            )
+        embeddings = dict(zip(non_empty, vectors))
+
+        # Map every thread to the first earlier thread it duplicates
+        representatives: List[int] = []
+        assignments: List[int] = []
+        for index in range(len(thread_groups)):
+            embedding = embeddings.get(index)
+            duplicate_of = None
+            if embedding is not None:
+                for rep in representatives:
+                    if (
+                        rep in embeddings
+                        and _cosine_similarity(embedding, embeddings[rep])
+                        >= self.SEMANTIC_DEDUP_THRESHOLD
+                    ):
+                        duplicate_of = rep
+                        break
+
+            if duplicate_of is None:
+                representatives.append(index)
+                assignments.append(index)
+            else:
+                assignments.append(duplicate_of)
+
+        unique_results = await self.summarize_multiple_threads(
+            [thread_groups[rep] for rep in representatives],
+            use_batch_api=use_batch_api,
+            with_insights=with_insights,
+        )
+        rep_results = dict(zip(representatives, unique_results))
+
+        results = []
+        for index, rep in enumerate(assignments):
+            result = rep_results[rep]
+            if index != rep and "error" not in result:
+                emails = thread_groups[index]
+                result = self._add_summary_metadata(
+                    dict(result), emails, _sort_by_date(emails)
+                )
+                result["deduplicated_from"] = rep_results[rep].get("thread_id")
+            results.append(result)
+
+        return results
+
+    async def summarize_multiple_threads(
+        self,
+        thread_groups: List[List[Email]],
+        use_batch_api: bool = False,
+        semantic_dedup: bool = False,
+        with_insights: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Summarize multiple threads efficiently.
+
+        With ``use_batch_api`` set, jobs of at least ``BATCH_API_MIN_THREADS``
+        threads are submitted through the OpenAI Batch API, which is cheaper
+        but can take minutes to complete. With ``semantic_dedup`` set, threads
+        whose content embeddings are near-identical share a single summary.
+        With ``with_insights`` set, each summary also carries its insights
+        under ``"insights"`` (not supported by the Batch API path).
+        """
+
+        if semantic_dedup and len(thread_groups) > 1:
+            return await self._summarize_with_semantic_dedup(
+                thread_groups, use_batch_api, with_insights
+            )
+
+        if use_batch_api and len(thread_groups) >= self.BATCH_API_MIN_THREADS:
+            return await self._summarize_via_batch_api(thread_groups)
+
+        # Keep up to max_concurrency requests in flight at all times rather
+        # than waiting on the slowest thread of each fixed-size batch
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        summarize = (
+            self.summarize_and_analyze if with_insights else self.summarize_thread
+        )
+
+        async def summarize_one(emails: List[Email]) -> Dict[str, Any]:
+            async with semaphore:
+                return await summarize(emails)
+
+        raw_results = await asyncio.gather(
+            *(summarize_one(emails) for emails in thread_groups),
+            return_exceptions=True,
+        )
 
-        # Process in batches to avoid rate limits
-        batch_size = 3
         results = []
+        for result in raw_results:
+            if isinstance(result, Exception):
+                logger.error(f"Thread summarization error: {result}")
+                results.append({"error": str(result)})
+            else:
+                results.append(result)
+
+        return results
+
+    async def _summarize_via_batch_api(
+        self, thread_groups: List[List[Email]]
+    ) -> List[Dict[str, Any]]:
+        """Summarize threads with a single OpenAI Batch API job."""
+
+        results: List[Dict[str, Any]] = [{} for _ in thread_groups]
+        pending: Dict[str, tuple] = {}
+        request_lines = []
+
+        for index, emails in enumerate(thread_groups):
+            if not emails:
+                results[index] = {"error": "No emails provided"}
+                continue
+
+            sorted_emails = _sort_by_date(emails)
+            custom_id = str(index)
+            pending[custom_id] = (emails, sorted_emails)
+            request_lines.append(
+                orjson.dumps(
+                    {
+                        "custom_id": custom_id,
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": self.model,
+                            "messages": self._build_summary_messages(sorted_emails),
+                            "temperature": 0.1,
+                            **self._response_format(SUMMARY_RESPONSE_FORMAT),
+                        },
+                    }
+                )
+            )
+
+        if not pending:
+            return results
+
+        def thread_error(custom_id: str, error: str) -> Dict[str, Any]:
+            emails, _ = pending[custom_id]
+            return {
+                "error": error,
+                "thread_id": emails[0].thread_id,
+                "email_count": len(emails),
+            }
 
-        for i in range(0, len(thread_groups), batch_size):
-            batch = thread_groups[i : i + batch_size]
-            tasks = [self.summarize_thread(emails) for emails in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            batch_file = await self.client.files.create(
+                file=("thread_summaries.jsonl", b"\n".join(request_lines)),
+                purpose="batch",
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            logger.info(
+                f"Submitted batch {batch.id} with {len(request_lines)} threads"
+            )
 
-            for result in batch_results:
-                if isinstance(result, Exception):
-                    logger.error(f"Thread summarization error: {result}")
-                    results.append({"error": str(result)})
-                else:
-                    results.append(result)
+            while batch.status not in self.BATCH_API_TERMINAL_STATES:
+                await asyncio.sleep(self.BATCH_API_POLL_INTERVAL)
+                batch = await self.client.batches.retrieve(batch.id)
 
-            # Small delay to respect rate limits
-            await asyncio.sleep(0.2)
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+
+            output = await self.client.files.content(batch.output_file_id)
+            output_lines = output.text.splitlines()
+
+        except Exception as e:
+            logger.error(f"Batch thread summarization failed: {str(e)}")
+            for custom_id in pending:
+                results[int(custom_id)] = thread_error(custom_id, str(e))
+            return results
+
+        for line in output_lines:
+            if not line.strip():
+                continue
+
+            record = orjson.loads(line)
+            custom_id = record.get("custom_id")
+            if custom_id not in pending:
+                continue
+
+            try:
+                response = record.get("response") or {}
+                if record.get("error") or response.get("status_code") != 200:
+                    raise RuntimeError(
+                        str(record.get("error") or response.get("body"))
+                    )
+
+                content = response["body"]["choices"][0]["message"]["content"]
+                emails, sorted_emails = pending[custom_id]
+                results[int(custom_id)] = self._add_summary_metadata(
+                    orjson.loads(content), emails, sorted_emails
+                )
+            except Exception as e:
+                logger.error(f"Failed to summarize thread: {str(e)}")
+                results[int(custom_id)] = thread_error(custom_id, str(e))
+
+        for custom_id in pending:
+            if not results[int(custom_id)]:
+                results[int(custom_id)] = thread_error(
+                    custom_id, "Missing from batch output"
+                )
 
         return results
 
@@ -209,53 +1347,59 @@ Body: {email.body[:800]}...
         if not valid_summaries:
             return {"error": "No valid thread summaries provided"}
 
-        # Analyze patterns across threads
+        # Aggregate everything in a single pass over the summaries
         total_threads = len(valid_summaries)
-        urgent_threads = len(
-            [s for s in valid_summaries if s.get("priority_level") == "urgent"]
-        )
-        unresolved_threads = len(
-            [
-                s
-                for s in valid_summaries
-                if s.get("thread_status") in ["ongoing", "stalled"]
-            ]
-        )
-        requires_attention = len(
-            [s for s in valid_summaries if s.get("requires_attention", False)]
-        )
-
-        # Count action items
-        total_actions = sum(len(s.get("action_items", [])) for s in valid_summaries)
+        urgent_threads = 0
+        unresolved_threads = 0
+        requires_attention = 0
+        total_actions = 0
         overdue_actions = 0
+        efficiency_total = 0
+        collaboration_total = 0
+        scored_threads = 0
+        top_priorities = []
+        thread_types = Counter()
+        sentiments = Counter()
 
         today = datetime.now().date()
         for summary in valid_summaries:
-            for action in summary.get("action_items", []):
+            priority_level = summary.get("priority_level")
+            needs_attention = summary.get("requires_attention", False)
+
+            if priority_level == "urgent":
+                urgent_threads += 1
+            if summary.get("thread_status") in ("ongoing", "stalled"):
+                unresolved_threads += 1
+            if needs_attention:
+                requires_attention += 1
+                if priority_level in ("urgent", "high") and len(top_priorities) < 5:
+                    top_priorities.append(summary)
+
+            action_items = summary.get("action_items", [])
+            total_actions += len(action_items)
+            for action in action_items:
                 if action.get("deadline"):
                     try:
-                        deadline = datetime.strptime(
-                            action["deadline"], "%Y-%m-%d"
-                        ).date()
+                        deadline = _parse_deadline(action["deadline"])
                         if deadline < today and action.get("status") != "completed":
                             overdue_actions += 1
                     except ValueError:
                         continue
 
-        # Thread types distribution
-        thread_types = {}
-        for summary in valid_summaries:
-            thread_type = summary.get("thread_type", "unknown")
-            thread_types[thread_type] = thread_types.get(thread_type, 0) + 1
+            thread_types[summary.get("thread_type", "unknown")] += 1
+            sentiments[summary.get("sentiment", "neutral")] += 1
 
-        # Sentiment analysis
-        sentiments = {}
-        for summary in valid_summaries:
-            sentiment = summary.get("sentiment", "neutral")
-            sentiments[sentiment] = sentiments.get(sentiment, 0) + 1
+            # Locally generated insights carry no scores and are not averaged
+            insights = summary.get("insights", {})
+            efficiency = insights.get("efficiency_score", 5)
+            collaboration = insights.get("collaboration_score", 5)
+            if efficiency is not None and collaboration is not None:
+                efficiency_total += efficiency
+                collaboration_total += collaboration
+                scored_threads += 1
 
         return {
-            "overview_generated_at": datetime.now().isoformat(),
+            "overview_generated_at": _now_iso(),
             "total_threads": total_threads,
             "summary_stats": {
                 "urgent_threads": urgent_threads,
@@ -264,34 +1408,18 @@ Body: {email.body[:800]}...
                 "total_action_items": total_actions,
                 "overdue_actions": overdue_actions,
             },
-            "thread_types": thread_types,
-            "sentiment_distribution": sentiments,
+            "thread_types": dict(thread_types),
+            "sentiment_distribution": dict(sentiments),
             "efficiency_metrics": {
                 "avg_efficiency": (
-                    sum(
-                        s.get("insights", {}).get("efficiency_score", 5)
-                        for s in valid_summaries
-                    )
-                    / total_threads
-                    if total_threads > 0
-                    else 0
+                    efficiency_total / scored_threads if scored_threads else None
                 ),
                 "avg_collaboration": (
-                    sum(
-                        s.get("insights", {}).get("collaboration_score", 5)
-                        for s in valid_summaries
-                    )
-                    / total_threads
-                    if total_threads > 0
-                    else 0
+                    collaboration_total / scored_threads if scored_threads else None
                 ),
+                "unscored_threads": total_threads - scored_threads,
             },
-            "top_priorities": [
-                s
-                for s in valid_summaries
-                if s.get("priority_level") in ["urgent", "high"]
-                and s.get("requires_attention", False)
-            ][:5],
+            "top_priorities": top_priorities,
             "recommendations": [
                 f"Focus on {urgent_threads} urgent threads requiring immediate attention",
                 f"Follow up on {unresolved_threads} unresolved threads",
@@ -310,4 +1438,7 @@ Body: {email.body[:800]}...
 
     async def shutdown(self) -> None:
         """Shutdown the thread summarizer agent."""
+        if self.client is not None:
+            client, self.client = self.client, None
+            await release_openai_client(client)
         logger.info("Thread summarizer agent shutdown completed")
@@ -1,9 +1,35 @@
 """Triage agent for intelligent email screening and attention scoring."""
 
+import asyncio
+import bisect
+import functools
+import hashlib
+import heapq
 import logging
-from datetime import datetime, timedelta
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter, OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import orjson
 
 try:
     from openai import AsyncOpenAI
@@ -13,9 +39,208 @@ except ImportError:
 from ..config import settings
 from ..models import Email, EmailCategory
 from ..storage.database import DatabaseManager
+from .openai_client import get_openai_client, release_openai_client
 
 logger = logging.getLogger(__name__)
 
+# Content urgency indicators and their scores
+_URGENCY_INDICATORS = MappingProxyType(
+    {
+        "urgent": 0.9,
+        "asap": 0.9,
+        "immediate": 0.8,
+        "deadline": 0.8,
+        "important": 0.7,
+        "priority": 0.7,
+        "time sensitive": 0.8,
+        "action required": 0.8,
+        "please respond": 0.6,
+        "follow up": 0.5,
+        "reminder": 0.5,
+    }
+)
+
+# Implied time pressure, matched on word boundaries. Words like "today" are
+# common in routine mail, so these scores are scaled by the user's
+# time_pressure_weight preference before they count as urgency.
+_TIME_PRESSURE_INDICATORS = MappingProxyType(
+    {
+        "emergency": 0.9,
+        "as soon as possible": 0.9,
+        "critical": 0.8,
+        "overdue": 0.8,
+        "past due": 0.8,
+        "eod": 0.7,
+        "end of day": 0.7,
+        "blocking": 0.7,
+        "today": 0.6,
+        "tonight": 0.6,
+        "due date": 0.6,
+        "tomorrow": 0.5,
+        "this week": 0.4,
+    }
+)
+
+_SPAM_INDICATORS = frozenset(
+    {
+        "you've won",
+        "claim now",
+        "limited time",
+        "click here immediately",
+        "congratulations",
+        "prize",
+        "lottery",
+        "million dollars",
+        "urgent action required",
+        "verify account",
+        "suspended",
+        "free money",
+        "inheritance",
+        "nigerian prince",
+    }
+)
+
+_SUSPICIOUS_DOMAINS = frozenset({"suspicious", "prize", "lottery", "winner", "claim"})
+
+# Feedback learning: words never learned as urgency keywords, and urgency
+# words flagged as false positives when the user archives the email
+_STOPWORDS = frozenset({"the", "and", "for", "with"})
+_URGENCY_WORDS = frozenset({"urgent", "asap", "immediate", "important", "priority"})
+
+_CATEGORY_SCORES = MappingProxyType(
+    {
+        EmailCategory.PRIMARY: 0.8,  # Usually important
+        EmailCategory.SOCIAL: 0.2,  # Usually low priority
+        EmailCategory.PROMOTIONS: 0.1,  # Usually auto-archive
+        EmailCategory.UPDATES: 0.3,  # Sometimes important
+        EmailCategory.FORUMS: 0.4,  # Context dependent
+        EmailCategory.SPAM: 0.0,  # Always low priority
+        EmailCategory.UNREAD: 0.5,  # Unknown, medium priority
+    }
+)
+
+
+# Attention score factors and their weights in the final score
+_FACTOR_WEIGHTS = MappingProxyType(
+    {
+        "category": 0.30,
+        "sender": 0.25,
+        "urgency": 0.20,
+        "recency": 0.15,
+        "thread": 0.10,
+    }
+)
+_FACTOR_NAMES = tuple(_FACTOR_WEIGHTS)
+
+
+def _explain_category(score: float) -> str:
+    level = "high" if score > 0.7 else "medium" if score > 0.4 else "low"
+    return f"Email category suggests {level} priority"
+
+
+def _explain_sender(score: float) -> str:
+    level = "high" if score > 0.7 else "medium" if score > 0.4 else "low"
+    return f"Sender has {level} importance"
+
+
+def _explain_urgency(score: float) -> str:
+    level = "high" if score > 0.7 else "some" if score > 0.3 else "no"
+    return f"Content shows {level} urgency indicators"
+
+
+def _explain_recency(score: float) -> str:
+    age = "very recent" if score > 0.8 else "recent" if score > 0.5 else "older"
+    return f"Email is {age}"
+
+
+def _explain_thread(score: float) -> str:
+    return "Active thread" if score > 0.5 else "Standalone email"
+
+
+# Explanation for each factor, given that factor's score
+_FACTOR_EXPLANATIONS = MappingProxyType(
+    {
+        "category": _explain_category,
+        "sender": _explain_sender,
+        "urgency": _explain_urgency,
+        "recency": _explain_recency,
+        "thread": _explain_thread,
+    }
+)
+
+# Recency bucket upper bounds in seconds, and one score per bucket (the last
+# score is for anything older than the last bound)
+_RECENCY_BOUNDS = (
+    60 * 60,  # 1 hour
+    6 * 60 * 60,  # 6 hours
+    24 * 60 * 60,  # 1 day
+    3 * 24 * 60 * 60,  # 3 days
+    7 * 24 * 60 * 60,  # 1 week
+)
+_RECENCY_SCORES = (1.0, 0.8, 0.6, 0.4, 0.2, 0.1)
+
+
+def _compile_alternation(
+    terms: Iterable[str], word_boundary: bool = False
+) -> "re.Pattern[str]":
+    """Compile literal terms into one regex, longest alternatives first."""
+    ordered = sorted(terms, key=len, reverse=True)
+    pattern = "|".join(re.escape(term) for term in ordered)
+    if word_boundary:
+        pattern = rf"\b(?:{pattern})\b"
+    return re.compile(pattern)
+
+
+# Explicit and implied urgency cues, scanned in a single pass
+_URGENCY_PATTERN = re.compile(
+    _compile_alternation(_URGENCY_INDICATORS).pattern
+    + "|"
+    + _compile_alternation(_TIME_PRESSURE_INDICATORS, word_boundary=True).pattern
+)
+# Word stems that suggest urgency at all; emails without any of them in the
+# text the AI sees are not worth an AI urgency call
+_URGENCY_PREFILTER = re.compile(
+    r"\b(?:urgen|asap|deadline|priorit|action|respon|remind|follow|important"
+    r"|immediate|sensitive|critical|emergenc|overdue|due|today|tonight"
+    r"|tomorrow|eod|soon|time)"
+)
+_SPAM_PATTERN = _compile_alternation(_SPAM_INDICATORS)
+_SUSPICIOUS_DOMAIN_PATTERN = _compile_alternation(_SUSPICIOUS_DOMAINS)
+_URGENCY_WORDS_PATTERN = _compile_alternation(_URGENCY_WORDS)
+
+
+def _max_urgency_indicator(text: str, time_pressure_weight: float) -> float:
+    """Return the strongest explicit or implied urgency cue in lowercase text.
+
+    Implied time-pressure cues count at ``time_pressure_weight`` of their
+    score; 0 ignores them.
+    """
+    max_score = 0.0
+    for match in _URGENCY_PATTERN.finditer(text):
+        term = match.group(0)
+        score = _URGENCY_INDICATORS.get(term)
+        if score is None:
+            score = _TIME_PRESSURE_INDICATORS[term] * time_pressure_weight
+        max_score = max(max_score, score)
+    return max_score
+
+
+class _LoweredEmail(NamedTuple):
+    """Lowercased email fields, normalized once and shared by the scorers."""
+
+    subject: str
+    body: str
+    sender: str
+
+
+def _lower_email(email: Email) -> _LoweredEmail:
+    """Lowercase the fields the triage scorers match against."""
+    return _LoweredEmail(
+        email.subject.lower(),
+        (email.body_text or "").lower(),
+        email.sender.email.lower(),
+    )
+
 
 class TriageDecision(str, Enum):
     """Triage decision for email routing."""
@@ -26,13 +251,13 @@ class TriageDecision(str, Enum):
     SPAM_FOLDER = "spam_folder"  # Route to spam
 
 
+@dataclass(slots=True, frozen=True)
 class AttentionScore:
     """Represents an email's attention score with explanation."""
 
-    def __init__(self, score: float, factors: Dict[str, float], explanation: str):
-        self.score = score  # 0.0 to 1.0
-        self.factors = factors  # Contributing factors
-        self.explanation = explanation  # Human-readable explanation
+    score: float  # 0.0 to 1.0
+    factors: Dict[str, float]  # Contributing factors
+    explanation: str  # Human-readable explanation
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -42,34 +267,250 @@ class AttentionScore:
         }
 
 
+# Default importance for known sender patterns
+_DEFAULT_SENDER_IMPORTANCE = MappingProxyType(
+    {
+        "boss@": 0.9,
+        "manager@": 0.8,
+        "team@": 0.7,
+        "@company.com": 0.6,
+        "noreply@": 0.1,
+        "notification@": 0.2,
+        "@facebook.com": 0.3,
+        "@linkedin.com": 0.3,
+        "@twitter.com": 0.2,
+    }
+)
+
+# Work domains that get a medium-high score when the sender is unknown
+_WORK_DOMAINS = ("@company.com", "@work.com")
+
+
+def _spam_attention_score() -> AttentionScore:
+    """Attention score for spam, which is routed without scoring."""
+    return AttentionScore(0.0, {"spam": 1.0}, "Spam detected")
+
+
+class _UrgencyCache:
+    """LRU of AI urgency scores, persisted to SQLite so repeated runs skip the API.
+
+    Entries are keyed by ``sha256`` of the model and the prompt inputs and
+    store when they were written, so callers can decide whether a value is
+    fresh, stale but usable, or expired. The database is only created on
+    first use, and SQLite I/O runs in a worker thread off the event loop.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, maxsize: int = 4096):
+        self.db_path = db_path
+        self.maxsize = maxsize
+        self._memory: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._db_ready = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the database, creating it on first use; None when disabled."""
+        if self.db_path is None:
+            return None
+        try:
+            if not self._db_ready:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            if not self._db_ready:
+                with conn:
+                    conn.execute(
+                        """
+                        CREATE TABLE IF NOT EXISTS urgency (
+                            hash TEXT PRIMARY KEY,
+                            score REAL,
+                            stored_at REAL
+                        )
+                    """
+                    )
+                self._db_ready = True
+            return conn
+        except Exception as e:
+            logger.warning("Urgency cache persistence disabled: %s", e)
+            self.db_path = None
+            return None
+
+    @staticmethod
+    def key(model: str, email: Email) -> str:
+        content = "\0".join(
+            (model, email.subject, email.sender.email, (email.body_text or "")[:300])
+        )
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _read(self, key: str) -> Optional[Tuple[float, float]]:
+        """Read a stored ``(score, stored_at)`` entry (runs in a worker thread)."""
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            with conn:
+                return conn.execute(
+                    "SELECT score, stored_at FROM urgency WHERE hash = ?", (key,)
+                ).fetchone()
+        except Exception as e:
+            logger.warning("Urgency cache read failed: %s", e)
+            return None
+        finally:
+            conn.close()
+
+    def _write(self, key: str, score: float, stored_at: float) -> None:
+        """Store a score on disk (runs in a worker thread)."""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO urgency (hash, score, stored_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, score, stored_at),
+                )
+        except Exception as e:
+            logger.warning("Urgency cache write failed: %s", e)
+        finally:
+            conn.close()
+
+    async def get(self, key: str) -> Optional[Tuple[float, float]]:
+        """Return ``(score, age_seconds)`` from memory, then from disk."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        elif self.db_path is not None:
+            entry = await asyncio.to_thread(self._read, key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is None:
+            return None
+        return entry[0], time.time() - entry[1]
+
+    async def put(self, key: str, score: float) -> None:
+        """Store a score with the current time in memory and on disk."""
+        stored_at = time.time()
+        self._remember(key, (score, stored_at))
+
+        if self.db_path is not None:
+            await asyncio.to_thread(self._write, key, score, stored_at)
+
+    def _remember(self, key: str, entry: Tuple[float, float]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+
+def _is_correct_feedback(feedback: Dict[str, Any]) -> bool:
+    """Check whether user feedback confirmed the triage decision."""
+    return "correct" in feedback.get("user_action", "")
+
+
+class _RoutingThresholds(NamedTuple):
+    """User routing preferences, read once per triage batch."""
+
+    priority: float
+    archive: float
+    archive_categories: FrozenSet[EmailCategory]
+
+
+# Sender, subject, category and the body head the urgency scorers read
+_FactorKey = Tuple[str, str, EmailCategory, str]
+
+# Body characters scanned for urgency indicators
+_URGENCY_BODY_CHARS = 500
+
+
 class TriageAgent:
     """Agent responsible for intelligent email screening and routing."""
 
-    def __init__(self):
+    # Emails sharing sender, subject, category and body head reuse content
+    # factor scores
+    FACTOR_CACHE_SIZE = 10_000
+    # Cached AI urgency scores are served as-is for a week, then served stale
+    # while refreshed in the background, and dropped after a month
+    URGENCY_CACHE_FRESH_SECONDS = 7 * 24 * 60 * 60
+    URGENCY_CACHE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+    # Emails scored per AI urgency request, and how long the first queued
+    # email waits for others to join its batch
+    URGENCY_BATCH_SIZE = 16
+    URGENCY_BATCH_WINDOW_SECONDS = 0.01
+    # Most recent user feedback entries kept for accuracy stats
+    FEEDBACK_HISTORY_SIZE = 10_000
+    # Distinct senders whose importance score is memoized
+    SENDER_SCORE_CACHE_SIZE = 8192
+    # Learned senders kept; the least recently updated one is evicted beyond this
+    SENDER_IMPORTANCE_MAX_SIZE = 50_000
+    # Minimum time between habit learning saves during feedback bursts
+    HABIT_FLUSH_INTERVAL_SECONDS = 5.0
+    # Upper bound on the final save and client release at shutdown
+    SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
+    def __init__(self, max_concurrency: int = 10):
         self.openai_client: Optional[AsyncOpenAI] = None
+        self._max_concurrency = max_concurrency
+        self._factor_cache: "OrderedDict[_FactorKey, Tuple[float, float, float]]" = (
+            OrderedDict()
+        )
+        self._factor_inflight: Dict[_FactorKey, asyncio.Future] = {}
+        # Only the opt-in AI urgency analysis uses the cache (and its database
+        # file), so it is created the first time that analysis runs
+        self._urgency_cache: Optional[_UrgencyCache] = None
+        self._urgency_refreshes: Set[str] = set()
+        self._urgency_queue: List[Tuple[Email, asyncio.Future]] = []
+        self._urgency_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._background_tasks: Set[asyncio.Task] = set()
         self.db: DatabaseManager = DatabaseManager()
         self.stats: Dict[str, Any] = {
             "emails_triaged": 0,
             "auto_archived": 0,
             "priority_flagged": 0,
-            "accuracy_feedback": [],
+            "accuracy_feedback": deque(maxlen=self.FEEDBACK_HISTORY_SIZE),
+            "accuracy_correct": 0,
             "last_triage": None,
         }
         self.user_preferences: Dict[str, Any] = {}
-        self.sender_importance: Dict[str, float] = {}
+        # Ordered from least to most recently updated, for eviction
+        self.sender_importance: "OrderedDict[str, float]" = OrderedDict()
+        self.category_preferences: Dict[str, Dict[str, Any]] = {}
+        self.urgency_patterns: Dict[str, Any] = {
+            "learned_keywords": Counter(),
+            "false_positives": set(),
+        }
+        # Keyword occurrences from priority feedback not yet folded into
+        # urgency_patterns["learned_keywords"]
+        self._pending_keyword_counts: Counter = Counter()
+        # Hour histograms; Counter keeps them plain dicts for insights
+        self.time_preferences: Dict[str, Counter] = {
+            "priority_hours": Counter(),
+            "archive_hours": Counter(),
+        }
+        self._sender_prefixes: Dict[str, float] = {}
+        self._sender_domains: Dict[str, float] = {}
+        self._sender_substrings: Tuple[Tuple[str, float], ...] = ()
+        self._sender_score_cache = functools.lru_cache(
+            maxsize=self.SENDER_SCORE_CACHE_SIZE
+        )(self._lookup_sender_score)
+        self._habit_dirty = False
+        self._last_habit_flush = 0.0
+        # Memoized get_learning_insights result, reset whenever learning runs
+        self._cached_insights: Optional[Dict[str, Any]] = None
         self._initialize_ai_client()
         self._load_user_preferences()
+        # Bounds concurrent AI urgency calls across a triage batch
+        self._triage_semaphore = asyncio.Semaphore(
+            self.user_preferences.get("max_concurrent_llm", max_concurrency)
+        )
 
     def _initialize_ai_client(self) -> None:
         """Initialize OpenAI client for advanced analysis."""
         try:
             if AsyncOpenAI and settings.openai_api_key:
-                self.openai_client = AsyncOpenAI(api_key=settings.openai_api_key)
+                self.openai_client = get_openai_client()
                 logger.info("OpenAI client initialized for triage analysis")
             else:
                 logger.warning("No OpenAI API key - using rule-based triage only")
         except Exception as e:
-            logger.error(f"Failed to initialize OpenAI client: {str(e)}")
+            logger.error("Failed to initialize OpenAI client: %s", e)
 
     def _load_user_preferences(self) -> None:
         """Load user preferences and sender importance from database."""
@@ -78,24 +519,32 @@ class TriageAgent:
             self.user_preferences = {
                 "priority_keywords": ["urgent", "asap", "deadline", "important"],
                 "vip_domains": ["company.com"],  # User's work domain
-                "auto_archive_categories": [
-                    EmailCategory.PROMOTIONS,
-                    EmailCategory.UPDATES,
-                    EmailCategory.SOCIAL,
-                ],
+                "auto_archive_categories": frozenset(
+                    {
+                        EmailCategory.PROMOTIONS,
+                        EmailCategory.UPDATES,
+                        EmailCategory.SOCIAL,
+                    }
+                ),
                 "max_auto_archive_score": 0.4,  # Increased threshold for auto-archiving
                 "min_priority_score": 0.7,
+                # Share of an implied time-pressure cue ("today", "eod") that
+                # counts as urgency; 0 scores explicit urgency words only
+                "time_pressure_weight": 0.5,
+                "max_concurrent_llm": self._max_concurrency,
             }
 
             # Load sender importance scores (learned from user behavior)
-            self.sender_importance = self._calculate_sender_importance()
+            self.sender_importance = OrderedDict(self._calculate_sender_importance())
+            self._index_sender_patterns()
 
             logger.info(
-                f"Loaded user preferences and {len(self.sender_importance)} sender importance scores"
+                "Loaded user preferences and %d sender importance scores",
+                len(self.sender_importance),
             )
 
         except Exception as e:
-            logger.error(f"Failed to load user preferences: {str(e)}")
+            logger.error("Failed to load user preferences: %s", e)
 
     def _calculate_sender_importance(self) -> Dict[str, float]:
         """Calculate sender importance based on user interaction history."""
@@ -124,23 +573,9 @@ class TriageAgent:
                 else:
                     sender_scores[sender] = historical_score
 
-            # Add default patterns for known types
-            default_scores = {
-                "boss@": 0.9,
-                "manager@": 0.8,
-                "team@": 0.7,
-                "@company.com": 0.6,
-                "noreply@": 0.1,
-                "notification@": 0.2,
-                "@facebook.com": 0.3,
-                "@linkedin.com": 0.3,
-                "@twitter.com": 0.2,
-            }
-
-            # Apply defaults only if not already scored
-            for pattern, score in default_scores.items():
-                if pattern not in sender_scores:
-                    sender_scores[pattern] = score
+            # Apply default patterns for known types only if not already scored
+            for pattern, score in _DEFAULT_SENDER_IMPORTANCE.items():
+                sender_scores.setdefault(pattern, score)
 
             # Save updated scores
             self._save_sender_importance_scores(sender_scores)
@@ -148,7 +583,7 @@ class TriageAgent:
             return sender_scores
 
         except Exception as e:
-            logger.error(f"Failed to calculate sender importance: {str(e)}")
+            logger.error("Failed to calculate sender importance: %s", e)
             return self._get_default_sender_scores()
 
     def _load_habit_learning_data(self) -> Dict[str, Any]:
@@ -165,7 +600,7 @@ class TriageAgent:
                 "last_updated": None,
             }
         except Exception as e:
-            logger.error(f"Failed to load habit learning data: {str(e)}")
+            logger.error("Failed to load habit learning data: %s", e)
             return {}
 
     def _analyze_response_patterns(self) -> Dict[str, Dict[str, Any]]:
@@ -178,8 +613,26 @@ class TriageAgent:
             sent_emails = []  # self.db.get_sent_emails(limit=1000)
             received_emails = []  # self.db.get_received_emails(limit=1000)
 
+            # Group received emails by sender in one pass
+            by_sender: Dict[str, List[Email]] = defaultdict(list)
+            for email in received_emails:
+                by_sender[email.sender.email].append(email)
+
+            # Attribute sent emails to the senders they mention, scanning each
+            # body once (simplified - would need thread analysis)
+            responses_by_sender: Dict[str, List[Email]] = defaultdict(list)
+            if by_sender and sent_emails:
+                sender_pattern = _compile_alternation(by_sender)
+                for sent in sent_emails:
+                    mentioned = {
+                        match.group(0)
+                        for match in sender_pattern.finditer(sent.body_text or "")
+                    }
+                    for sender_email in mentioned:
+                        responses_by_sender[sender_email].append(sent)
+
             # For each sender, calculate metrics
-            for sender_email in set(email.sender.email for email in received_emails):
+            for sender_email, sender_emails in by_sender.items():
                 pattern_data = {
                     "total_emails": 0,
                     "responded_to": 0,
@@ -191,29 +644,24 @@ class TriageAgent:
                 }
 
                 # Analyze this sender's emails
-                sender_emails = [
-                    e for e in received_emails if e.sender.email == sender_email
-                ]
                 pattern_data["total_emails"] = len(sender_emails)
 
-                # Count responses (simplified - would need thread analysis)
-                responses = [
-                    e for e in sent_emails if sender_email in e.body_text or ""
-                ]
+                # Count responses
+                responses = responses_by_sender.get(sender_email, [])
                 pattern_data["responded_to"] = len(responses)
 
                 # Calculate average response time
                 if responses:
                     response_times = []
+                    sender_dates = sorted(e.date for e in sender_emails)
                     for response in responses:
-                        # Find original email this responds to
-                        for orig in sender_emails:
-                            if response.date > orig.date:
-                                time_diff = (
-                                    response.date - orig.date
-                                ).total_seconds() / 3600
-                                response_times.append(time_diff)
-                                break
+                        # The original is the latest email sent before the reply
+                        i = bisect.bisect_left(sender_dates, response.date)
+                        if i:
+                            time_diff = (
+                                response.date - sender_dates[i - 1]
+                            ).total_seconds() / 3600
+                            response_times.append(time_diff)
 
                     if response_times:
                         pattern_data["avg_response_time"] = sum(response_times) / len(
@@ -225,7 +673,7 @@ class TriageAgent:
             return patterns
 
         except Exception as e:
-            logger.error(f"Failed to analyze response patterns: {str(e)}")
+            logger.error("Failed to analyze response patterns: %s", e)
             return {}
 
     def _calculate_sender_score(self, pattern_data: Dict[str, Any]) -> float:
@@ -276,161 +724,463 @@ class TriageAgent:
             # This would save to database in real implementation
             {"sender_scores": scores, "last_updated": datetime.now().isoformat()}
             # self.db.save_habit_learning_data(habit_data)
-            logger.info(f"Saved {len(scores)} sender importance scores")
+            logger.info("Saved %d sender importance scores", len(scores))
         except Exception as e:
-            logger.error(f"Failed to save sender importance scores: {str(e)}")
+            logger.error("Failed to save sender importance scores: %s", e)
 
     def _get_default_sender_scores(self) -> Dict[str, float]:
         """Get default sender scores as fallback."""
-        return {
-            "boss@": 0.9,
-            "manager@": 0.8,
-            "team@": 0.7,
-            "@company.com": 0.6,
-            "noreply@": 0.1,
-            "notification@": 0.2,
-            "@facebook.com": 0.3,
-            "@linkedin.com": 0.3,
-            "@twitter.com": 0.2,
-        }
-
-    async def calculate_attention_score(self, email: Email) -> AttentionScore:
+        # Copied because feedback learning updates sender scores in place
+        return dict(_DEFAULT_SENDER_IMPORTANCE)
+
+    async def calculate_attention_score(
+        self,
+        email: Email,
+        now: Optional[datetime] = None,
+        lowered: Optional[_LoweredEmail] = None,
+    ) -> AttentionScore:
         """Calculate how much attention this email needs (0-1 scale)."""
         factors = {}
 
         try:
-            # Factor 1: Category-based baseline (30% weight)
-            category_score = self._score_by_category(email.category)
+            # Factors 1-3: Category baseline (30% weight), sender importance
+            # (25% weight) and content urgency indicators (20% weight)
+            category_score, sender_score, urgency_score = await self._content_factors(
+                email, lowered
+            )
             factors["category"] = category_score
-
-            # Factor 2: Sender importance (25% weight)
-            sender_score = self._score_by_sender(email.sender.email)
             factors["sender"] = sender_score
-
-            # Factor 3: Content urgency indicators (20% weight)
-            urgency_score = await self._score_by_urgency(email)
             factors["urgency"] = urgency_score
 
             # Factor 4: Recency and timing (15% weight)
-            recency_score = self._score_by_recency(email.received_date)
+            recency_score = self._score_by_recency(email.received_date, now)
             factors["recency"] = recency_score
 
             # Factor 5: Thread context (10% weight)
             thread_score = await self._score_by_thread_context(email)
             factors["thread"] = thread_score
 
-            # Combine factors with weights
-            weights = {
-                "category": 0.30,
-                "sender": 0.25,
-                "urgency": 0.20,
-                "recency": 0.15,
-                "thread": 0.10,
-            }
-
-            final_score = sum(factors[factor] * weights[factor] for factor in factors)
-            final_score = min(1.0, max(0.0, final_score))
+            return self._combine_factors(factors)
 
-            # Generate explanation
-            explanation = self._generate_score_explanation(
-                factors, weights, final_score
+        except Exception as e:
+            logger.error(
+                "Failed to calculate attention score for email %s: %s", email.id, e
             )
+            return self._fallback_attention_score(email)
+
+    async def score_email_batch(
+        self,
+        emails: List[Email],
+        now: Optional[datetime] = None,
+        lowered: Optional[List[_LoweredEmail]] = None,
+    ) -> List[AttentionScore]:
+        """Calculate attention scores for a batch of emails.
+
+        Factors are computed column by column rather than email by email.
+        Content factors come from the factor cache where possible; misses are
+        scored concurrently, and only emails that still need the opt-in AI
+        urgency analysis make network calls.
+        """
+        if lowered is None:
+            lowered = [_lower_email(email) for email in emails]
+        content_factors = await asyncio.gather(
+            *(
+                self._content_factors(email, email_lower)
+                for email, email_lower in zip(emails, lowered)
+            ),
+            return_exceptions=True,
+        )
+        if now is None:
+            now = datetime.now().astimezone()
+        # Naive received dates are local time; compare them to a naive "now"
+        now_naive = now.replace(tzinfo=None)
+        recency_scores = [
+            self._score_by_recency(
+                email.received_date, now if email.received_date.tzinfo else now_naive
+            )
+            for email in emails
+        ]
+        thread_scores = [await self._score_by_thread_context(e) for e in emails]
 
-            return AttentionScore(final_score, factors, explanation)
+        scores = []
+        for email, content, recency_score, thread_score in zip(
+            emails, content_factors, recency_scores, thread_scores
+        ):
+            try:
+                if isinstance(content, Exception):
+                    raise content
+                row = (*content, recency_score, thread_score)
+                scores.append(self._combine_factors(dict(zip(_FACTOR_NAMES, row))))
+            except Exception as e:
+                logger.error(
+                    "Failed to calculate attention score for email %s: %s",
+                    email.id,
+                    e,
+                )
+                scores.append(self._fallback_attention_score(email))
+
+        return scores
+
+    async def _content_factors(
+        self, email: Email, lowered: Optional[_LoweredEmail] = None
+    ) -> Tuple[float, float, float]:
+        """Return cached (category, sender, urgency) scores for an email.
+
+        Recency and thread context are cheap and time dependent, so they are
+        always computed fresh. Concurrent misses on the same key share one
+        computation instead of each calling the scorers.
+        """
+        if lowered is None:
+            lowered = _lower_email(email)
+        # Urgency depends on the body, so replies reusing a subject must not
+        # share the first message's urgency
+        key = (
+            lowered.sender,
+            email.subject,
+            email.category,
+            lowered.body[:_URGENCY_BODY_CHARS],
+        )
 
-        except Exception as e:
-            logger.error(
-                f"Failed to calculate attention score for email {email.id}: {str(e)}"
+        cached = self._factor_cache.get(key)
+        if cached is not None:
+            self._factor_cache.move_to_end(key)
+            return cached
+
+        pending = self._factor_inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._factor_inflight[key] = future
+        try:
+            category_score = self._score_by_category(email.category)
+            sender_score = self._score_by_lowered_sender(lowered.sender)
+            local_urgency = self._local_urgency_score(email, lowered)
+            # Lower bound on the final score, before recency and thread
+            rule_score = (
+                category_score * _FACTOR_WEIGHTS["category"]
+                + sender_score * _FACTOR_WEIGHTS["sender"]
+                + local_urgency * _FACTOR_WEIGHTS["urgency"]
             )
-            # Fallback: use category as primary indicator
-            fallback_score = self._score_by_category(email.category)
-            return AttentionScore(
-                fallback_score,
-                {"category": fallback_score},
-                f"Fallback scoring based on category: {email.category.value}",
+            factors = (
+                category_score,
+                sender_score,
+                await self._bounded_urgency_score(
+                    email, local_urgency, rule_score, lowered
+                ),
             )
+            future.set_result(factors)
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so waiter-less failures are not logged twice
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            del self._factor_inflight[key]
+
+        self._factor_cache[key] = factors
+        if len(self._factor_cache) > self.FACTOR_CACHE_SIZE:
+            self._factor_cache.popitem(last=False)
+        return factors
+
+    async def _bounded_urgency_score(
+        self,
+        email: Email,
+        local_urgency: float,
+        rule_score: Optional[float] = None,
+        lowered: Optional[_LoweredEmail] = None,
+    ) -> float:
+        """Score urgency, calling the AI model only when it could matter.
+
+        AI requests are batched and bounded by the agent's concurrency limit.
+        """
+        if not self._needs_ai_urgency(email, local_urgency, rule_score, lowered):
+            return local_urgency
+        ai_urgency = await self._ai_urgency_analysis(email)
+        return max(local_urgency, ai_urgency)
+
+    def _combine_factors(self, factors: Dict[str, float]) -> AttentionScore:
+        """Combine factor scores into a weighted attention score."""
+        # Sum the weighted factors, tracking the most influential one
+        final_score = 0.0
+        top_factor = None
+        top_weighted = -1.0
+        for factor, score in factors.items():
+            weighted = score * _FACTOR_WEIGHTS[factor]
+            final_score += weighted
+            if weighted > top_weighted:
+                top_factor, top_weighted = factor, weighted
+        final_score = min(1.0, max(0.0, final_score))
+
+        # Generate explanation
+        explanation = self._generate_score_explanation(
+            top_factor, factors[top_factor], final_score
+        )
+
+        return AttentionScore(final_score, factors, explanation)
+
+    def _fallback_attention_score(self, email: Email) -> AttentionScore:
+        """Use category as the primary indicator when scoring fails."""
+        fallback_score = self._score_by_category(email.category)
+        return AttentionScore(
+            fallback_score,
+            {"category": fallback_score},
+            f"Fallback scoring based on category: {email.category.value}",
+        )
 
     def _score_by_category(self, category: EmailCategory) -> float:
         """Score email based on its category."""
-        category_scores = {
-            EmailCategory.PRIMARY: 0.8,  # Usually important
-            EmailCategory.SOCIAL: 0.2,  # Usually low priority
-            EmailCategory.PROMOTIONS: 0.1,  # Usually auto-archive
-            EmailCategory.UPDATES: 0.3,  # Sometimes important
-            EmailCategory.FORUMS: 0.4,  # Context dependent
-            EmailCategory.SPAM: 0.0,  # Always low priority
-            EmailCategory.UNREAD: 0.5,  # Unknown, medium priority
-        }
-        return category_scores.get(category, 0.5)
+        return _CATEGORY_SCORES.get(category, 0.5)
+
+    def _index_sender_patterns(self) -> None:
+        """Partition sender importance patterns for constant-time lookups.
+
+        Patterns like ``boss@`` match the local part and patterns like
+        ``@company.com`` match the domain; both become dict lookups keyed by
+        that part of the address. Anything else keeps substring matching,
+        longest pattern first so the most specific match wins regardless of
+        the order scores were learned in.
+        """
+        self._sender_prefixes = {}
+        self._sender_domains = {}
+        self._sender_substrings = ()
+        for pattern, score in self.sender_importance.items():
+            self._index_sender_pattern(pattern, score)
+        self._sender_score_cache.cache_clear()
+
+    def _index_sender_pattern(self, pattern: str, score: Optional[float]) -> bool:
+        """Add, update or (with ``score`` None) remove one indexed pattern.
+
+        Returns whether ``pattern`` is a pattern at all; plain addresses are
+        only ever matched exactly and need no index.
+        """
+        at_count = pattern.count("@")
+        if at_count == 1 and pattern.endswith("@"):
+            index = self._sender_prefixes
+        elif at_count == 1 and pattern.startswith("@"):
+            index = self._sender_domains
+        elif at_count == 0:
+            substrings = [
+                item for item in self._sender_substrings if item[0] != pattern
+            ]
+            if score is not None:
+                substrings.append((pattern, score))
+                substrings.sort(key=lambda item: len(item[0]), reverse=True)
+            self._sender_substrings = tuple(substrings)
+            return True
+        else:
+            return False
 
-    def _score_by_sender(self, sender_email: str) -> float:
-        """Score email based on sender importance."""
-        sender_lower = sender_email.lower()
+        if score is None:
+            index.pop(pattern, None)
+        else:
+            index[pattern] = score
+        return True
 
-        # Check exact matches first
-        if sender_lower in self.sender_importance:
-            return self.sender_importance[sender_lower]
+    def _score_by_lowered_sender(self, sender_lower: str) -> float:
+        """Score an already lowercased sender address.
 
-        # Check domain and pattern matches
-        for pattern, score in self.sender_importance.items():
+        Exact matches are checked first and never cached, so learning a
+        sender's score does not invalidate the memoized pattern lookups.
+        """
+        score = self.sender_importance.get(sender_lower)
+        if score is not None:
+            return score
+        return self._sender_score_cache(sender_lower)
+
+    def _lookup_sender_score(self, sender_lower: str) -> float:
+        """Look up the pattern importance of a lowercased sender address."""
+        # Check local part and domain patterns
+        local_part, at, domain = sender_lower.rpartition("@")
+        if at:
+            score = self._sender_prefixes.get(local_part + "@")
+            if score is not None:
+                return score
+            score = self._sender_domains.get("@" + domain)
+            if score is not None:
+                return score
+
+        for pattern, score in self._sender_substrings:
             if pattern in sender_lower:
                 return score
 
         # Default score for unknown senders
-        if any(domain in sender_lower for domain in ["@company.com", "@work.com"]):
+        if sender_lower.endswith(_WORK_DOMAINS):
             return 0.6  # Work emails get medium-high priority
 
         return 0.4  # Default for unknown senders
 
-    async def _score_by_urgency(self, email: Email) -> float:
-        """Score email based on urgency indicators in content."""
-        urgency_indicators = {
-            "urgent": 0.9,
-            "asap": 0.9,
-            "immediate": 0.8,
-            "deadline": 0.8,
-            "important": 0.7,
-            "priority": 0.7,
-            "time sensitive": 0.8,
-            "action required": 0.8,
-            "please respond": 0.6,
-            "follow up": 0.5,
-            "reminder": 0.5,
-        }
+    def _local_urgency_score(
+        self, email: Email, lowered: Optional[_LoweredEmail] = None
+    ) -> float:
+        """Score urgency locally from explicit and implied urgency cues."""
+        if lowered is None:
+            lowered = _lower_email(email)
+
+        time_pressure_weight = self.user_preferences.get("time_pressure_weight", 0.5)
 
         # Check subject line
-        subject_lower = email.subject.lower()
-        max_urgency = 0.0
-
-        for indicator, score in urgency_indicators.items():
-            if indicator in subject_lower:
-                max_urgency = max(max_urgency, score)
-
-        # Check body content if available
-        if email.body_text:
-            body_lower = email.body_text.lower()[:500]  # First 500 chars
-            for indicator, score in urgency_indicators.items():
-                if indicator in body_lower:
-                    max_urgency = max(
-                        max_urgency, score * 0.8
-                    )  # Body gets lower weight
-
-        # Use AI for advanced urgency detection if available
-        if self.openai_client and max_urgency < 0.5:
-            ai_urgency = await self._ai_urgency_analysis(email)
-            max_urgency = max(max_urgency, ai_urgency)
+        max_urgency = _max_urgency_indicator(lowered.subject, time_pressure_weight)
+
+        # Check body content if available (body matches get lower weight)
+        if lowered.body:
+            body_head = lowered.body[:_URGENCY_BODY_CHARS]
+            max_urgency = max(
+                max_urgency,
+                _max_urgency_indicator(body_head, time_pressure_weight) * 0.8,
+            )
 
         return max_urgency
 
+    def _needs_ai_urgency(
+        self,
+        email: Email,
+        local_urgency: float,
+        rule_score: Optional[float] = None,
+        lowered: Optional[_LoweredEmail] = None,
+    ) -> bool:
+        """Check whether the opt-in AI urgency analysis could change the outcome.
+
+        The call is skipped for categories that get auto-archived anyway and
+        when the rule-based score already reaches the priority threshold,
+        since a higher urgency could not change either decision. It is also
+        skipped when the text the model would see has no urgency-related
+        words at all.
+        """
+        if (
+            self.openai_client is None
+            or not settings.triage_ai_urgency
+            or local_urgency >= 0.5
+        ):
+            return False
+        if email.category in self.user_preferences.get("auto_archive_categories", ()):
+            return False
+        priority_threshold = self.user_preferences.get("min_priority_score", 0.7)
+        if rule_score is not None and rule_score >= priority_threshold:
+            return False
+
+        if lowered is None:
+            lowered = _lower_email(email)
+        return (
+            _URGENCY_PREFILTER.search(lowered.subject) is not None
+            or _URGENCY_PREFILTER.search(lowered.body, 0, 300) is not None
+        )
+
+    def _get_urgency_cache(self) -> _UrgencyCache:
+        if self._urgency_cache is None:
+            self._urgency_cache = _UrgencyCache(
+                Path(settings.data_dir) / "triage_urgency.db"
+            )
+        return self._urgency_cache
+
     async def _ai_urgency_analysis(self, email: Email) -> float:
-        """Use AI to analyze email urgency."""
+        """Use AI to analyze email urgency, reusing persisted results."""
+        cache = self._get_urgency_cache()
+        key = _UrgencyCache.key(settings.openai_model, email)
+        cached = await cache.get(key)
+        if cached is not None:
+            urgency_score, age = cached
+            if age <= self.URGENCY_CACHE_FRESH_SECONDS:
+                return urgency_score
+            if age <= self.URGENCY_CACHE_MAX_AGE_SECONDS:
+                # Stale-while-revalidate: answer now, refresh in the background
+                self._schedule_urgency_refresh(key, email)
+                return urgency_score
+
         try:
-            prompt = f"""
-Analyze this email for urgency on a scale of 0.0 to 1.0.
+            urgency_score = await self._request_ai_urgency(email)
+        except Exception as e:
+            logger.error("AI urgency analysis failed: %s", e)
+            return 0.0
+
+        await cache.put(key, urgency_score)
+        return urgency_score
+
+    def _schedule_urgency_refresh(self, key: str, email: Email) -> None:
+        """Refresh a stale cached urgency score once, in the background."""
+        if key in self._urgency_refreshes:
+            return
+        self._urgency_refreshes.add(key)
+        task = asyncio.create_task(self._refresh_urgency(key, email))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
 
+    async def _refresh_urgency(self, key: str, email: Email) -> None:
+        try:
+            urgency_score = await self._request_ai_urgency(email)
+            await self._get_urgency_cache().put(key, urgency_score)
+        except Exception as e:
+            logger.warning("Background urgency refresh failed: %s", e)
+        finally:
+            self._urgency_refreshes.discard(key)
+
+    async def _request_ai_urgency(self, email: Email) -> float:
+        """Queue an email for the next batched AI urgency request.
+
+        Emails queued within URGENCY_BATCH_WINDOW_SECONDS of each other, as
+        when a triage batch is scored concurrently, share one chat completion
+        of up to URGENCY_BATCH_SIZE emails. The window is short rather than a
+        single loop iteration because cache lookups finish in worker threads
+        at slightly different times.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._urgency_queue.append((email, future))
+        if len(self._urgency_queue) >= self.URGENCY_BATCH_SIZE:
+            self._flush_urgency_queue()
+        elif len(self._urgency_queue) == 1:
+            self._urgency_flush_handle = loop.call_later(
+                self.URGENCY_BATCH_WINDOW_SECONDS, self._flush_urgency_queue
+            )
+        return await future
+
+    def _flush_urgency_queue(self) -> None:
+        """Send the queued urgency requests as one batch."""
+        if self._urgency_flush_handle is not None:
+            self._urgency_flush_handle.cancel()
+            self._urgency_flush_handle = None
+        if not self._urgency_queue:
+            return
+        batch, self._urgency_queue = self._urgency_queue, []
+        task = asyncio.create_task(self._send_urgency_batch(batch))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _send_urgency_batch(
+        self, batch: List[Tuple[Email, asyncio.Future]]
+    ) -> None:
+        try:
+            async with self._triage_semaphore:
+                scores = await self._request_ai_urgency_batch(
+                    [email for email, _ in batch]
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            for _, future in batch:
+                future.cancel()
+            raise
+
+        for (_, future), urgency_score in zip(batch, scores):
+            if not future.done():
+                future.set_result(urgency_score)
+
+    async def _request_ai_urgency_batch(self, emails: List[Email]) -> List[float]:
+        """Ask the AI model for the urgency of several emails at once."""
+        email_blocks = "\n\n".join(
+            f"""Email {i}
 Subject: {email.subject}
 From: {email.sender.email}
-Content preview: {(email.body_text or '')[:300]}...
+Content preview: {(email.body_text or '')[:300]}..."""
+            for i, email in enumerate(emails, 1)
+        )
+        prompt = f"""
+Analyze each of these {len(emails)} emails for urgency on a scale of 0.0 to 1.0.
 
 Consider:
 - Explicit urgency words
@@ -438,52 +1188,49 @@ Consider:
 - Business context
 - Tone and language
 
-Return only a number between 0.0 and 1.0.
-"""
-
-            response = await self.openai_client.chat.completions.create(
-                model=settings.openai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at analyzing email urgency. Return only a decimal number between 0.0 and 1.0.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=10,
-                temperature=0.1,
-            )
-
-            urgency_text = response.choices[0].message.content.strip()
-            urgency_score = float(urgency_text)
-            return min(1.0, max(0.0, urgency_score))
+{email_blocks}
 
-        except Exception as e:
-            logger.error(f"AI urgency analysis failed: {str(e)}")
-            return 0.0
+Return a JSON object {{"scores": [...]}} with one number between 0.0 and 1.0
+per email, in the order given.
+"""
 
-    def _score_by_recency(self, received_date: datetime) -> float:
-        """Score email based on how recent it is."""
-        now = (
-            datetime.now(received_date.tzinfo)
-            if received_date.tzinfo
-            else datetime.now()
+        response = await self.openai_client.chat.completions.create(
+            model=settings.openai_model,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are an expert at analyzing email urgency. Return only JSON.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            response_format={"type": "json_object"},
+            max_tokens=8 * len(emails) + 16,
+            temperature=0.1,
         )
-        age = now - received_date
+
+        scores = orjson.loads(response.choices[0].message.content)["scores"]
+        if len(scores) != len(emails):
+            raise ValueError(
+                f"Expected {len(emails)} urgency scores, got {len(scores)}"
+            )
+        return [min(1.0, max(0.0, float(score))) for score in scores]
+
+    def _score_by_recency(
+        self, received_date: datetime, now: Optional[datetime] = None
+    ) -> float:
+        """Score email based on how recent it is.
+
+        ``now`` is local time, aware or naive; batch callers pass one value
+        for every email instead of reading the clock per email.
+        """
+        if now is None:
+            now = datetime.now().astimezone()
+        if received_date.tzinfo is None and now.tzinfo is not None:
+            now = now.replace(tzinfo=None)
+        age_seconds = (now - received_date).total_seconds()
 
         # Newer emails get higher scores
-        if age < timedelta(hours=1):
-            return 1.0
-        elif age < timedelta(hours=6):
-            return 0.8
-        elif age < timedelta(days=1):
-            return 0.6
-        elif age < timedelta(days=3):
-            return 0.4
-        elif age < timedelta(days=7):
-            return 0.2
-        else:
-            return 0.1
+        return _RECENCY_SCORES[bisect.bisect_right(_RECENCY_BOUNDS, age_seconds)]
 
     async def _score_by_thread_context(self, email: Email) -> float:
         """Score email based on thread context and conversation importance."""
@@ -498,28 +1245,14 @@ Return only a number between 0.0 and 1.0.
             return 0.3  # Standalone emails get lower thread score
 
         except Exception as e:
-            logger.error(f"Thread context scoring failed: {str(e)}")
+            logger.error("Thread context scoring failed: %s", e)
             return 0.3
 
     def _generate_score_explanation(
-        self, factors: Dict[str, float], weights: Dict[str, float], final_score: float
+        self, top_factor: str, factor_score: float, final_score: float
     ) -> str:
         """Generate human-readable explanation of the attention score."""
-        # Find the most influential factor
-        weighted_factors = {
-            factor: score * weights[factor] for factor, score in factors.items()
-        }
-        top_factor = max(weighted_factors.keys(), key=lambda k: weighted_factors[k])
-
-        explanations = {
-            "category": f"Email category suggests {'high' if factors['category'] > 0.7 else 'medium' if factors['category'] > 0.4 else 'low'} priority",
-            "sender": f"Sender has {'high' if factors['sender'] > 0.7 else 'medium' if factors['sender'] > 0.4 else 'low'} importance",
-            "urgency": f"Content shows {'high' if factors['urgency'] > 0.7 else 'some' if factors['urgency'] > 0.3 else 'no'} urgency indicators",
-            "recency": f"Email is {'very recent' if factors['recency'] > 0.8 else 'recent' if factors['recency'] > 0.5 else 'older'}",
-            "thread": f"{'Active thread' if factors['thread'] > 0.5 else 'Standalone email'}",
-        }
-
-        primary_reason = explanations[top_factor]
+        primary_reason = _FACTOR_EXPLANATIONS[top_factor](factor_score)
 
         if final_score > 0.7:
             return f"High attention needed: {primary_reason}"
@@ -529,72 +1262,97 @@ Return only a number between 0.0 and 1.0.
             return f"Low attention: {primary_reason}"
 
     async def make_triage_decision(
-        self, email: Email
+        self, email: Email, now: Optional[datetime] = None
     ) -> Tuple[TriageDecision, AttentionScore]:
         """Make triage decision for an email."""
-        attention_score = await self.calculate_attention_score(email)
+        if now is None:
+            now = datetime.now().astimezone()
+
+        # Cheap spam checks first: spam never needs full scoring, and emails
+        # already filed as spam are routed without even lowercasing the body
+        is_spam = email.category == EmailCategory.SPAM
+        if not is_spam:
+            lowered = _lower_email(email)
+            is_spam = self._is_spam_like(email, lowered)
+        if is_spam:
+            decision = TriageDecision.SPAM_FOLDER
+            attention_score = _spam_attention_score()
+        else:
+            attention_score = await self.calculate_attention_score(
+                email, now, lowered
+            )
+            decision = self._decide_triage(email, attention_score)
 
+        logger.debug(
+            "Triaged email %s: %s (score: %.2f)",
+            email.id,
+            decision.value,
+            attention_score.score,
+        )
+        self._record_triage_stats(Counter((decision,)), now)
+        return decision, attention_score
+
+    def _record_triage_stats(
+        self, decision_counts: "Counter[TriageDecision]", now: datetime
+    ) -> None:
+        """Apply the decisions of one triage call to the stats in one update."""
+        self.stats["emails_triaged"] += sum(decision_counts.values())
+        self.stats["priority_flagged"] += decision_counts[TriageDecision.PRIORITY_INBOX]
+        self.stats["auto_archived"] += decision_counts[TriageDecision.AUTO_ARCHIVE]
+        self.stats["last_triage"] = now
+
+    def _routing_thresholds(self) -> _RoutingThresholds:
+        """Read the routing thresholds from the user preferences."""
+        return _RoutingThresholds(
+            self.user_preferences.get("min_priority_score", 0.7),
+            self.user_preferences.get("max_auto_archive_score", 0.4),
+            frozenset(self.user_preferences.get("auto_archive_categories", [])),
+        )
+
+    def _decide_triage(
+        self,
+        email: Email,
+        attention_score: AttentionScore,
+        thresholds: Optional[_RoutingThresholds] = None,
+    ) -> TriageDecision:
+        """Route a non-spam email based on its attention score and category."""
         # Apply user preferences for thresholds
-        priority_threshold = self.user_preferences.get("min_priority_score", 0.7)
-        archive_threshold = self.user_preferences.get("max_auto_archive_score", 0.4)
+        if thresholds is None:
+            thresholds = self._routing_thresholds()
 
-        # Make decision based on score and category
-        if email.category == EmailCategory.SPAM or self._is_spam_like(email):
-            decision = TriageDecision.SPAM_FOLDER
-        elif attention_score.score >= priority_threshold:
+        # Make decision based on score and category (spam is routed earlier)
+        if attention_score.score >= thresholds.priority:
             decision = TriageDecision.PRIORITY_INBOX
-            self.stats["priority_flagged"] += 1
         elif (
-            attention_score.score <= archive_threshold
-            and email.category
-            in self.user_preferences.get("auto_archive_categories", [])
+            attention_score.score <= thresholds.archive
+            and email.category in thresholds.archive_categories
         ):
             decision = TriageDecision.AUTO_ARCHIVE
-            self.stats["auto_archived"] += 1
         else:
             decision = TriageDecision.REGULAR_INBOX
 
-        self.stats["emails_triaged"] += 1
-        self.stats["last_triage"] = datetime.now()
-
-        logger.debug(
-            f"Triaged email {email.id}: {decision.value} (score: {attention_score.score:.2f})"
-        )
+        return decision
 
-        return decision, attention_score
-
-    def _is_spam_like(self, email: Email) -> bool:
+    def _is_spam_like(
+        self, email: Email, lowered: Optional[_LoweredEmail] = None
+    ) -> bool:
         """Detect spam-like characteristics."""
-        spam_indicators = [
-            "you've won",
-            "claim now",
-            "limited time",
-            "click here immediately",
-            "congratulations",
-            "prize",
-            "lottery",
-            "million dollars",
-            "urgent action required",
-            "verify account",
-            "suspended",
-            "free money",
-            "inheritance",
-            "nigerian prince",
-        ]
-
-        content = (email.subject + " " + (email.body_text or "")).lower()
-
-        # Check for multiple spam indicators
-        spam_count = sum(1 for indicator in spam_indicators if indicator in content)
-
-        # Also check sender domain reputation
-        suspicious_domains = ["suspicious", "prize", "lottery", "winner", "claim"]
-        sender_suspicious = any(
-            domain in email.sender.email.lower() for domain in suspicious_domains
-        )
-
-        # Mark as spam if multiple indicators or suspicious sender
-        return spam_count >= 2 or sender_suspicious
+        if lowered is None:
+            lowered = _lower_email(email)
+
+        # Sender domain reputation is the cheapest check
+        if _SUSPICIOUS_DOMAIN_PATTERN.search(lowered.sender) is not None:
+            return True
+
+        # Otherwise look for two distinct spam indicators, stopping the scan
+        # as soon as the second one turns up
+        seen: Set[str] = set()
+        for text in (lowered.subject, lowered.body):
+            for match in _SPAM_PATTERN.finditer(text):
+                seen.add(match.group(0))
+                if len(seen) >= 2:
+                    return True
+        return False
 
     async def process_email_batch(self, emails: List[Email]) -> Dict[str, List[Email]]:
         """Process a batch of emails and return them grouped by triage decision."""
@@ -605,24 +1363,70 @@ Return only a number between 0.0 and 1.0.
             TriageDecision.SPAM_FOLDER.value: [],
         }
 
-        for email in emails:
-            try:
-                decision, attention_score = await self.make_triage_decision(email)
+        # One clock read for the whole batch
+        now = datetime.now().astimezone()
+        triaged_at = now.isoformat()
 
-                # Add triage metadata to email
-                email.connector_data["triage"] = {
-                    "decision": decision.value,
-                    "attention_score": attention_score.to_dict(),
-                    "triaged_at": datetime.now().isoformat(),
-                }
+        # Lowercase each email once for every scorer; emails already filed as
+        # spam are routed on their category alone
+        lowered = [
+            None if email.category == EmailCategory.SPAM else _lower_email(email)
+            for email in emails
+        ]
 
-                results[decision.value].append(email)
+        # Route spam before scoring so it never reaches the urgency scorers
+        spam_flags = [
+            email_lower is None or self._is_spam_like(email, email_lower)
+            for email, email_lower in zip(emails, lowered)
+        ]
+        to_score = [i for i, is_spam in enumerate(spam_flags) if not is_spam]
 
+        # Score the rest of the batch at once, then route each email
+        scored = await self.score_email_batch(
+            [emails[i] for i in to_score], now, [lowered[i] for i in to_score]
+        )
+        attention_scores: List[Optional[AttentionScore]] = [None] * len(emails)
+        for i, attention_score in zip(to_score, scored):
+            attention_scores[i] = attention_score
+
+        thresholds = self._routing_thresholds()
+        decision_counts: "Counter[TriageDecision]" = Counter()
+        for email, is_spam, attention_score in zip(
+            emails, spam_flags, attention_scores
+        ):
+            try:
+                if is_spam:
+                    decision = TriageDecision.SPAM_FOLDER
+                    attention_score = _spam_attention_score()
+                else:
+                    decision = self._decide_triage(email, attention_score, thresholds)
             except Exception as e:
-                logger.error(f"Failed to triage email {email.id}: {str(e)}")
+                logger.error("Failed to triage email %s: %s", email.id, e)
                 # Default to regular inbox on error
                 results[TriageDecision.REGULAR_INBOX.value].append(email)
+                continue
 
+            # Add triage metadata to email
+            email.connector_data["triage"] = {
+                "decision": decision.value,
+                "attention_score": attention_score.to_dict(),
+                "triaged_at": triaged_at,
+            }
+
+            results[decision.value].append(email)
+            decision_counts[decision] += 1
+
+        if emails:
+            self._record_triage_stats(decision_counts, now)
+            # One summary line per batch instead of one line per email
+            logger.debug(
+                "Triaged %d emails: %d priority, %d regular, %d archived, %d spam",
+                len(emails),
+                decision_counts[TriageDecision.PRIORITY_INBOX],
+                decision_counts[TriageDecision.REGULAR_INBOX],
+                decision_counts[TriageDecision.AUTO_ARCHIVE],
+                decision_counts[TriageDecision.SPAM_FOLDER],
+            )
         return results
 
     async def learn_from_user_feedback(
@@ -633,7 +1437,9 @@ Return only a number between 0.0 and 1.0.
             # Get the email to analyze what we got wrong
             email = self.db.get_email_by_id(email_id)
             if not email:
-                logger.warning(f"Could not find email {email_id} for feedback learning")
+                logger.warning(
+                    "Could not find email %s for feedback learning", email_id
+                )
                 return
 
             feedback = {
@@ -643,30 +1449,35 @@ Return only a number between 0.0 and 1.0.
                 ),
                 "correct_decision": correct_decision.value,
                 "user_action": user_action,
-                "sender": email.sender.email,
+                # Interned: the same sender string keys the learned scores and
+                # recurs across the feedback history
+                "sender": sys.intern(email.sender.email),
                 "category": email.category.value,
                 "subject": email.subject,
                 "timestamp": datetime.now().isoformat(),
             }
 
-            self.stats["accuracy_feedback"].append(feedback)
+            self._record_feedback(feedback)
 
             # Learn from the feedback to improve future decisions
             await self._apply_feedback_learning(email, feedback)
 
             logger.info(
-                f"Learning from feedback: email {email_id} from {email.sender.email} should be {correct_decision.value}"
+                "Learning from feedback: email %s from %s should be %s",
+                email_id,
+                email.sender.email,
+                correct_decision.value,
             )
 
         except Exception as e:
-            logger.error(f"Failed to process user feedback: {str(e)}")
+            logger.error("Failed to process user feedback: %s", e)
 
     async def _apply_feedback_learning(
         self, email: Email, feedback: Dict[str, Any]
     ) -> None:
         """Apply feedback to improve future triage decisions."""
         try:
-            sender = email.sender.email
+            sender = feedback["sender"]
             feedback.get("original_decision")
             correct_decision = feedback.get("correct_decision")
             user_action = feedback.get("user_action")
@@ -687,11 +1498,13 @@ Return only a number between 0.0 and 1.0.
             # Update time-based preferences
             await self._update_time_preferences_from_feedback(email, correct_decision)
 
-            # Save updated learning data
+            # Save updated learning data (debounced during feedback bursts)
+            self._habit_dirty = True
+            self._cached_insights = None
             await self._save_habit_learning_updates()
 
         except Exception as e:
-            logger.error(f"Failed to apply feedback learning: {str(e)}")
+            logger.error("Failed to apply feedback learning: %s", e)
 
     async def _update_sender_importance_from_feedback(
         self, sender: str, correct_decision: str, user_action: str
@@ -718,27 +1531,52 @@ Return only a number between 0.0 and 1.0.
         new_score = current_score + (adjustment * learning_rate)
         new_score = min(1.0, max(0.0, new_score))
 
+        if (
+            sender not in self.sender_importance
+            and len(self.sender_importance) >= self.SENDER_IMPORTANCE_MAX_SIZE
+        ):
+            self._evict_least_recent_sender()
         self.sender_importance[sender] = new_score
+        self.sender_importance.move_to_end(sender)
+        if self._index_sender_pattern(sender, new_score):
+            self._sender_score_cache.cache_clear()
+        # Cached sender factors are stale now
+        self._factor_cache.clear()
         logger.debug(
-            f"Updated sender {sender} importance: {current_score:.3f} -> {new_score:.3f}"
+            "Updated sender %s importance: %.3f -> %.3f",
+            sender,
+            current_score,
+            new_score,
         )
 
+    def _evict_least_recent_sender(self) -> None:
+        """Drop the least recently updated learned sender.
+
+        Scores are kept in update order, so this is the first entry that is
+        not one of the default patterns. Recency rather than score decides,
+        so senders the user demoted through feedback stay demoted.
+        """
+        evicted = next(
+            (
+                sender
+                for sender in self.sender_importance
+                if sender not in _DEFAULT_SENDER_IMPORTANCE
+            ),
+            None,
+        )
+        if evicted is not None:
+            del self.sender_importance[evicted]
+            if self._index_sender_pattern(evicted, None):
+                self._sender_score_cache.cache_clear()
+
     async def _update_category_preferences_from_feedback(
         self, category: EmailCategory, correct_decision: str
     ) -> None:
         """Update category-based scoring preferences."""
-        if not hasattr(self, "category_preferences"):
-            self.category_preferences = {}
-
-        category_key = category.value
-        if category_key not in self.category_preferences:
-            self.category_preferences[category_key] = {
-                "priority_tendency": 0.0,
-                "archive_tendency": 0.0,
-                "feedback_count": 0,
-            }
-
-        prefs = self.category_preferences[category_key]
+        prefs = self.category_preferences.setdefault(
+            category.value,
+            {"priority_tendency": 0.0, "archive_tendency": 0.0, "feedback_count": 0},
+        )
         prefs["feedback_count"] += 1
 
         # Update tendencies based on feedback
@@ -755,54 +1593,75 @@ Return only a number between 0.0 and 1.0.
         self, email: Email, correct_decision: str
     ) -> None:
         """Update urgency pattern recognition based on feedback."""
-        if not hasattr(self, "urgency_patterns"):
-            self.urgency_patterns = {"learned_keywords": {}, "false_positives": set()}
-
         content = f"{email.subject} {email.body_text or ''}".lower()
 
         if correct_decision == TriageDecision.PRIORITY_INBOX.value:
-            # Extract potential urgency indicators we might have missed
-            words = content.split()
-            for word in words:
-                if len(word) > 3 and word not in ["the", "and", "for", "with"]:
-                    current_score = self.urgency_patterns["learned_keywords"].get(
-                        word, 0.0
-                    )
-                    self.urgency_patterns["learned_keywords"][word] = min(
-                        1.0, current_score + 0.05
-                    )
+            # Extract potential urgency indicators we might have missed; they
+            # are counted here and folded into the scores when next read
+            self._pending_keyword_counts.update(
+                word
+                for word in content.split()
+                if len(word) > 3 and word not in _STOPWORDS
+            )
 
         elif correct_decision == TriageDecision.AUTO_ARCHIVE.value:
             # Mark patterns that led to false urgency detection
-            urgency_words = ["urgent", "asap", "immediate", "important", "priority"]
-            for word in urgency_words:
-                if word in content:
-                    self.urgency_patterns["false_positives"].add(word)
+            self.urgency_patterns["false_positives"].update(
+                _URGENCY_WORDS_PATTERN.findall(content)
+            )
+
+    def _apply_pending_keyword_counts(self) -> None:
+        """Fold buffered keyword counts into the learned urgency keywords.
+
+        Each distinct word gets one update for all the feedback since the
+        last call, which matches applying the capped +0.05 steps one by one.
+        """
+        if not self._pending_keyword_counts:
+            return
+        learned_keywords = self.urgency_patterns["learned_keywords"]
+        for word, count in self._pending_keyword_counts.items():
+            current_score = learned_keywords.get(word)
+            if current_score is None:
+                # Keep one interned copy of each keyword the agent learns
+                learned_keywords[sys.intern(word)] = min(1.0, 0.05 * count)
+            else:
+                learned_keywords[word] = min(1.0, current_score + 0.05 * count)
+        self._pending_keyword_counts.clear()
 
     async def _update_time_preferences_from_feedback(
         self, email: Email, correct_decision: str
     ) -> None:
         """Update time-based preferences from feedback."""
-        if not hasattr(self, "time_preferences"):
-            self.time_preferences = {"priority_hours": {}, "archive_hours": {}}
-
         hour = email.received_date.hour
 
         if correct_decision == TriageDecision.PRIORITY_INBOX.value:
-            current = self.time_preferences["priority_hours"].get(hour, 0)
-            self.time_preferences["priority_hours"][hour] = current + 1
+            self.time_preferences["priority_hours"][hour] += 1
         elif correct_decision == TriageDecision.AUTO_ARCHIVE.value:
-            current = self.time_preferences["archive_hours"].get(hour, 0)
-            self.time_preferences["archive_hours"][hour] = current + 1
+            self.time_preferences["archive_hours"][hour] += 1
+
+    async def _save_habit_learning_updates(self, force: bool = False) -> None:
+        """Save all habit learning updates to persistent storage.
+
+        Saves are skipped when nothing changed, and unless ``force`` is set
+        they happen at most once per ``HABIT_FLUSH_INTERVAL_SECONDS``; the
+        pending changes are written by a later save or at shutdown.
+        """
+        if not self._habit_dirty:
+            return
+        now = time.monotonic()
+        since_last_flush = now - self._last_habit_flush
+        if not force and since_last_flush < self.HABIT_FLUSH_INTERVAL_SECONDS:
+            return
+        self._habit_dirty = False
+        self._last_habit_flush = now
+        self._apply_pending_keyword_counts()
 
-    async def _save_habit_learning_updates(self) -> None:
-        """Save all habit learning updates to persistent storage."""
         try:
             {
                 "sender_scores": self.sender_importance,
-                "category_preferences": getattr(self, "category_preferences", {}),
-                "urgency_patterns": getattr(self, "urgency_patterns", {}),
-                "time_preferences": getattr(self, "time_preferences", {}),
+                "category_preferences": self.category_preferences,
+                "urgency_patterns": self.urgency_patterns,
+                "time_preferences": self.time_preferences,
                 "last_updated": datetime.now().isoformat(),
                 "total_feedback_processed": len(self.stats["accuracy_feedback"]),
             }
@@ -813,10 +1672,17 @@ Return only a number between 0.0 and 1.0.
             logger.info("Saved habit learning updates to persistent storage")
 
         except Exception as e:
-            logger.error(f"Failed to save habit learning updates: {str(e)}")
+            logger.error("Failed to save habit learning updates: %s", e)
 
     def get_learning_insights(self) -> Dict[str, Any]:
-        """Get insights about what the system has learned from user behavior."""
+        """Get insights about what the system has learned from user behavior.
+
+        The result is memoized until the next feedback event, so repeated
+        status polls do not re-rank every learned sender and keyword.
+        """
+        if self._cached_insights is not None:
+            return self._cached_insights
+
         insights = {
             "sender_insights": {},
             "category_insights": {},
@@ -828,38 +1694,33 @@ Return only a number between 0.0 and 1.0.
         try:
             # Sender insights
             if self.sender_importance:
-                top_senders = sorted(
-                    self.sender_importance.items(), key=lambda x: x[1], reverse=True
-                )[:10]
                 insights["sender_insights"] = {
-                    "most_important": top_senders[:5],
-                    "least_important": sorted(
-                        self.sender_importance.items(), key=lambda x: x[1]
-                    )[:5],
+                    "most_important": heapq.nlargest(
+                        5, self.sender_importance.items(), key=itemgetter(1)
+                    ),
+                    "least_important": heapq.nsmallest(
+                        5, self.sender_importance.items(), key=itemgetter(1)
+                    ),
                     "total_senders_learned": len(self.sender_importance),
                 }
 
             # Category insights
-            if hasattr(self, "category_preferences"):
-                insights["category_insights"] = self.category_preferences
+            insights["category_insights"] = self.category_preferences
 
             # Urgency insights
-            if hasattr(self, "urgency_patterns"):
-                learned_keywords = self.urgency_patterns.get("learned_keywords", {})
-                if learned_keywords:
-                    top_urgency_words = sorted(
-                        learned_keywords.items(), key=lambda x: x[1], reverse=True
-                    )[:10]
-                    insights["urgency_insights"] = {
-                        "learned_urgency_keywords": top_urgency_words,
-                        "false_positive_words": list(
-                            self.urgency_patterns.get("false_positives", set())
-                        ),
-                    }
+            self._apply_pending_keyword_counts()
+            learned_keywords = self.urgency_patterns["learned_keywords"]
+            if learned_keywords:
+                top_urgency_words = learned_keywords.most_common(10)
+                insights["urgency_insights"] = {
+                    "learned_urgency_keywords": top_urgency_words,
+                    "false_positive_words": list(
+                        self.urgency_patterns["false_positives"]
+                    ),
+                }
 
             # Time insights
-            if hasattr(self, "time_preferences"):
-                insights["time_insights"] = self.time_preferences
+            insights["time_insights"] = self.time_preferences
 
             # Learning statistics
             feedback_count = len(self.stats["accuracy_feedback"])
@@ -874,21 +1735,31 @@ Return only a number between 0.0 and 1.0.
             }
 
         except Exception as e:
-            logger.error(f"Failed to generate learning insights: {str(e)}")
+            logger.error("Failed to generate learning insights: %s", e)
+            return insights
 
+        self._cached_insights = insights
         return insights
 
+    def _record_feedback(self, feedback: Dict[str, Any]) -> None:
+        """Append feedback to the bounded history, keeping the correct count."""
+        history = self.stats["accuracy_feedback"]
+        if len(history) == history.maxlen and _is_correct_feedback(history[0]):
+            # The oldest entry is about to be evicted
+            self.stats["accuracy_correct"] -= 1
+        history.append(feedback)
+        self._cached_insights = None
+        if _is_correct_feedback(feedback):
+            self.stats["accuracy_correct"] += 1
+
     async def get_triage_stats(self) -> Dict[str, Any]:
         """Get triage agent statistics."""
         accuracy = 0.0
         if self.stats["accuracy_feedback"]:
             # Calculate accuracy from user feedback
-            correct_decisions = sum(
-                1
-                for fb in self.stats["accuracy_feedback"]
-                if "correct" in fb.get("user_action", "")
-            )
-            accuracy = (correct_decisions / len(self.stats["accuracy_feedback"])) * 100
+            accuracy = (
+                self.stats["accuracy_correct"] / len(self.stats["accuracy_feedback"])
+            ) * 100
 
         return {
             "emails_triaged": self.stats["emails_triaged"],
@@ -908,8 +1779,24 @@ Return only a number between 0.0 and 1.0.
     async def shutdown(self) -> None:
         """Shutdown the triage agent."""
         try:
+            for task in list(self._background_tasks):
+                task.cancel()
+            # Write learning changes still held back by the save debounce while
+            # releasing the client, so a hanging close cannot stall teardown
+            pending = [self._save_habit_learning_updates(force=True)]
             if self.openai_client:
-                await self.openai_client.close()
+                # Shared client: only closed once every agent has released it
+                client, self.openai_client = self.openai_client, None
+                pending.append(release_openai_client(client))
+            await asyncio.wait_for(
+                asyncio.gather(*pending, return_exceptions=True),
+                timeout=self.SHUTDOWN_TIMEOUT_SECONDS,
+            )
             logger.info("Triage agent shutdown completed")
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Triage agent shutdown timed out after %.0fs",
+                self.SHUTDOWN_TIMEOUT_SECONDS,
+            )
         except Exception as e:
-            logger.error(f"Error during triage agent shutdown: {str(e)}")
+            logger.error("Error during triage agent shutdown: %s", e)
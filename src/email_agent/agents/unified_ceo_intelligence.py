@@ -2,12 +2,13 @@
 """Unified CEO Email Intelligence System - Complete Solution."""
 
 import asyncio
-import json
-from collections import defaultdict
+import re
+from collections import Counter, OrderedDict, defaultdict
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import keyring
+import orjson
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
@@ -31,8 +32,56 @@ from .thread_intelligence import ThreadIntelligence
 
 console = Console()
 
+# Subject keywords used by the mock labeling history and escalation rules
+_URGENT_WORDS = frozenset({"urgent", "asap", "critical"})
+_INVESTMENT_WORDS = frozenset({"funding", "investment"})
+_SIGNATURE_WORDS = frozenset({"sign", "signature", "contract"})
+_LEGAL_WORDS = _SIGNATURE_WORDS | {"legal"}
+_CUSTOMER_WORDS = frozenset({"customer", "client", "user"})
+_TEAM_WORDS = frozenset({"team", "hire", "interview"})
+
+# Gmail allows at most 100 calls in one batch HTTP request
+_GMAIL_BATCH_SIZE = 100
+# Verbose per-email insight lines are printed to the console in chunks
+_OUTPUT_FLUSH_LINES = 50
+
+# Mock labeling history: subject keywords per label, in label order
+_MOCK_LABEL_WORDS = (
+    ("Board", frozenset({"board"})),
+    ("Investors", _INVESTMENT_WORDS | {"investor"}),
+    ("SignatureRequired", _SIGNATURE_WORDS),
+    ("DecisionRequired", _URGENT_WORDS),
+    ("Customers", _CUSTOMER_WORDS),
+    ("Team", _TEAM_WORDS),
+)
+_MOCK_LABEL_BY_WORD = {
+    word: label for label, words in _MOCK_LABEL_WORDS for word in words
+}
+# One scan finds every keyword; the lookahead reports overlapping matches too
+_MOCK_LABEL_PATTERN = re.compile(
+    "(?=({}))".format("|".join(map(re.escape, _MOCK_LABEL_BY_WORD)))
+)
+
+
+def _nest_label_counts(counts: Counter) -> Dict[str, Dict[str, int]]:
+    """Turn counts keyed by (key, label) into per-key label counts."""
+    nested: Dict[str, Dict[str, int]] = defaultdict(dict)
+    for (key, label), count in counts.items():
+        nested[key][label] = count
+    return dict(nested)
+
 
-@dataclass
+def _top_labels(patterns: Dict[str, Dict[str, int]]) -> Dict[str, str]:
+    """Pick the most frequent label for each key (first one on ties)."""
+    return {key: max(labels, key=labels.get) for key, labels in patterns.items()}
+
+
+def _mentions_any(text: str, words: frozenset) -> bool:
+    """Check whether any of the words occurs in the (lowercased) text."""
+    return any(word in text for word in words)
+
+
+@dataclass(slots=True)
 class UnifiedIntelligence:
     """Unified intelligence combining all systems."""
 
@@ -43,7 +92,7 @@ class UnifiedIntelligence:
     auto_escalation_rules: List[Dict[str, Any]]
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailPrediction:
     """Prediction for email handling."""
 
@@ -58,55 +107,55 @@ class EmailPrediction:
 class UnifiedCEOIntelligence:
     """Master system integrating all CEO email intelligence."""
 
+    # Predictions memoized for repeated sender/subject/thread combinations
+    PREDICTION_CACHE_SIZE = 4096
+
     def __init__(self):
         self.console = Console()
         self.enhanced_labeler = EnhancedCEOLabeler()
         self.relationship_intel = RelationshipIntelligence()
         self.thread_intel = ThreadIntelligence()
 
-        # Auto-escalation rules
+        # Auto-escalation rules, checked in order; the first match wins. A
+        # rule matches when the sender or contact profile has the given
+        # relationship type and strategic importance and the subject mentions
+        # one of its subject words (each condition only applies when present).
         self.escalation_rules = [
             {
                 "name": "Board Member Priority",
-                "condition": lambda profile, email: (
-                    profile and profile.relationship_type == "board"
-                ),
+                "relationship_type": "board",
                 "action": "immediate_escalation",
                 "labels": ["DecisionRequired", "Board"],
             },
             {
                 "name": "Critical Sender Urgent",
-                "condition": lambda profile, email: (
-                    profile
-                    and profile.strategic_importance == "critical"
-                    and any(
-                        word in email.subject.lower()
-                        for word in ["urgent", "asap", "critical"]
-                    )
-                ),
+                "strategic_importance": "critical",
+                "subject_words": _URGENT_WORDS,
                 "action": "high_priority",
                 "labels": ["DecisionRequired", "QuickWins"],
             },
             {
                 "name": "Investor Communication",
-                "condition": lambda profile, email: (
-                    profile and profile.relationship_type == "investor"
-                ),
+                "relationship_type": "investor",
                 "action": "strategic_attention",
                 "labels": ["Investors", "WeeklyReview"],
             },
             {
                 "name": "Legal/Signature Required",
-                "condition": lambda profile, email: (
-                    any(
-                        word in email.subject.lower()
-                        for word in ["sign", "signature", "contract", "legal"]
-                    )
-                ),
+                "subject_words": _LEGAL_WORDS,
                 "action": "signature_required",
                 "labels": ["SignatureRequired", "Legal"],
             },
         ]
+        # Rules that can apply to each relationship type, in rule order
+        self._escalation_rules_by_relationship: Dict[
+            Optional[str], List[Dict[str, Any]]
+        ] = {}
+
+        # Predictions keyed by (sender, lowercased subject, thread id); only
+        # valid for the unified intelligence they were computed from
+        self._prediction_cache: "OrderedDict[tuple, EmailPrediction]" = OrderedDict()
+        self._prediction_cache_intel: Optional[UnifiedIntelligence] = None
 
         # Predictive patterns storage
         self.historical_patterns = {}
@@ -116,20 +165,18 @@ class UnifiedCEOIntelligence:
         """Initialize all intelligence systems with email data."""
         console.print("🧠 Initializing Unified CEO Intelligence System...")
 
-        # Build sender profiles
-        await self.enhanced_labeler.build_sender_profiles(emails)
-
-        # Analyze relationships
-        relationship_results = await self.relationship_intel.analyze_relationships(
-            emails
+        # Build sender profiles, analyze relationships and thread patterns and
+        # build predictive patterns. Each analyzer only reads the emails and
+        # fills its own state, so they run concurrently.
+        _, relationship_results, thread_results, predictive_patterns = (
+            await asyncio.gather(
+                self.enhanced_labeler.build_sender_profiles(emails),
+                self.relationship_intel.analyze_relationships(emails),
+                self.thread_intel.analyze_thread_patterns(emails),
+                self._build_predictive_patterns(emails),
+            )
         )
 
-        # Analyze thread patterns
-        thread_results = await self.thread_intel.analyze_thread_patterns(emails)
-
-        # Build predictive patterns
-        predictive_patterns = await self._build_predictive_patterns(emails)
-
         # Compile auto-escalation rules
         auto_escalation_rules = self._compile_escalation_rules()
 
@@ -159,25 +206,26 @@ class UnifiedCEOIntelligence:
         """Build predictive patterns from historical email data."""
         console.print("🔮 Building predictive patterns...")
 
-        # Analyze historical labeling patterns
-        sender_label_patterns = defaultdict(lambda: defaultdict(int))
-        subject_label_patterns = defaultdict(lambda: defaultdict(int))
+        # Analyze historical labeling patterns, counted flat by (key, label)
+        sender_label_counts: Counter = Counter()
+        subject_label_counts: Counter = Counter()
         time_patterns = defaultdict(list)
 
         for email in emails:
             sender = email.sender.email.lower()
+            subject_lower = email.subject.lower()
 
             # Mock historical labels (in production, would come from actual labeling history)
-            historical_labels = self._mock_historical_labels(email)
-
-            for label in historical_labels:
-                sender_label_patterns[sender][label] += 1
-
-                # Extract subject keywords
-                subject_words = email.subject.lower().split()
-                for word in subject_words:
-                    if len(word) > 3:
-                        subject_label_patterns[word][label] += 1
+            historical_labels = self._mock_historical_labels(subject_lower, sender)
+
+            # Extract subject keywords once, not once per label
+            subject_keywords = [word for word in subject_lower.split() if len(word) > 3]
+            sender_label_counts.update((sender, label) for label in historical_labels)
+            subject_label_counts.update(
+                (word, label)
+                for label in historical_labels
+                for word in subject_keywords
+            )
 
             # Track timing patterns
             if email.received_date:
@@ -187,38 +235,33 @@ class UnifiedCEOIntelligence:
                     {"hour": hour, "day": day_of_week, "labels": historical_labels}
                 )
 
+        sender_label_patterns = _nest_label_counts(sender_label_counts)
+        subject_label_patterns = _nest_label_counts(subject_label_counts)
         return {
-            "sender_patterns": dict(sender_label_patterns),
-            "subject_patterns": dict(subject_label_patterns),
+            "sender_patterns": sender_label_patterns,
+            "subject_patterns": subject_label_patterns,
+            # Most frequent label per sender and per subject keyword
+            "sender_top_labels": _top_labels(sender_label_patterns),
+            "subject_top_labels": _top_labels(subject_label_patterns),
             "time_patterns": dict(time_patterns),
             "pattern_confidence": self._calculate_pattern_confidence(
                 sender_label_patterns
             ),
         }
 
-    def _mock_historical_labels(self, email: Email) -> List[str]:
+    def _mock_historical_labels(
+        self, subject_lower: str, sender_lower: str
+    ) -> List[str]:
         """Mock historical labels for pattern building (replace with actual data)."""
-        labels = []
-        subject_lower = email.subject.lower()
-        sender_lower = email.sender.email.lower()
-
-        # Mock patterns based on content
-        if "board" in subject_lower or "board" in sender_lower:
-            labels.append("Board")
-        if "investor" in subject_lower or any(
-            word in subject_lower for word in ["funding", "investment"]
-        ):
-            labels.append("Investors")
-        if any(word in subject_lower for word in ["sign", "signature", "contract"]):
-            labels.append("SignatureRequired")
-        if any(word in subject_lower for word in ["urgent", "asap", "critical"]):
-            labels.append("DecisionRequired")
-        if any(word in subject_lower for word in ["customer", "client", "user"]):
-            labels.append("Customers")
-        if any(word in subject_lower for word in ["team", "hire", "interview"]):
-            labels.append("Team")
-
-        return labels
+        # Mock patterns based on content, found in a single subject scan
+        found = {
+            _MOCK_LABEL_BY_WORD[match.group(1)]
+            for match in _MOCK_LABEL_PATTERN.finditer(subject_lower)
+        }
+        if "board" in sender_lower:
+            found.add("Board")
+
+        return [label for label, _ in _MOCK_LABEL_WORDS if label in found]
 
     def _calculate_pattern_confidence(self, patterns: Dict) -> Dict[str, float]:
         """Calculate confidence scores for predictive patterns."""
@@ -253,7 +296,35 @@ class UnifiedCEOIntelligence:
     async def predict_email_handling(
         self, email: Email, unified_intel: UnifiedIntelligence
     ) -> EmailPrediction:
-        """Use unified intelligence to predict optimal email handling."""
+        """Use unified intelligence to predict optimal email handling.
+
+        Newsletters and thread replies repeat the same sender and subject, so
+        predictions are memoized per sender, subject and thread for as long
+        as the same unified intelligence is used.
+        """
+        if unified_intel is not self._prediction_cache_intel:
+            self._prediction_cache.clear()
+            self._prediction_cache_intel = unified_intel
+
+        # Lowercased once for the cache key, the keyword patterns and every
+        # escalation rule
+        subject_lower = email.subject.lower()
+        key = (email.sender.email, subject_lower, email.thread_id)
+        prediction = self._prediction_cache.get(key)
+        if prediction is not None:
+            self._prediction_cache.move_to_end(key)
+            return prediction
+
+        prediction = self._predict_email_handling(email, unified_intel, subject_lower)
+        self._prediction_cache[key] = prediction
+        if len(self._prediction_cache) > self.PREDICTION_CACHE_SIZE:
+            self._prediction_cache.popitem(last=False)
+        return prediction
+
+    def _predict_email_handling(
+        self, email: Email, unified_intel: UnifiedIntelligence, subject_lower: str
+    ) -> EmailPrediction:
+        """Predict email handling from the sender, thread and subject."""
         sender_key = email.sender.email.lower()
 
         # Get intelligence data
@@ -267,88 +338,91 @@ class UnifiedCEOIntelligence:
                 email.thread_id
             )
 
-        # Predictive analysis
+        # Predictive analysis; the set mirrors the list for membership checks
         suggested_labels = []
+        suggested_set = set()
         reasoning = []
         confidence_score = 0.0
         escalation_recommended = False
 
+        def add_label(label: str) -> bool:
+            """Append a label unless already suggested; report whether it was."""
+            if label in suggested_set:
+                return False
+            suggested_set.add(label)
+            suggested_labels.append(label)
+            return True
+
         # Sender-based predictions
         if sender_profile:
             if sender_profile.strategic_importance == "critical":
-                suggested_labels.extend(["DecisionRequired", "QuickWins"])
+                add_label("DecisionRequired")
+                add_label("QuickWins")
                 reasoning.append(
                     f"Critical sender (importance: {sender_profile.importance_score:.1f})"
                 )
                 confidence_score += 0.3
 
             # Historical pattern predictions
-            sender_patterns = unified_intel.predictive_patterns["sender_patterns"].get(
-                sender_key, {}
-            )
-            if sender_patterns:
-                most_common_label = max(sender_patterns.items(), key=lambda x: x[1])[0]
-                if most_common_label not in suggested_labels:
-                    suggested_labels.append(most_common_label)
-                    reasoning.append(
-                        f"Historical pattern: usually gets '{most_common_label}' label"
-                    )
-                    confidence_score += 0.2
+            sender_top_labels = unified_intel.predictive_patterns["sender_top_labels"]
+            most_common_label = sender_top_labels.get(sender_key)
+            if most_common_label and add_label(most_common_label):
+                reasoning.append(
+                    f"Historical pattern: usually gets '{most_common_label}' label"
+                )
+                confidence_score += 0.2
 
         # Relationship-based predictions
         if contact_profile:
             if contact_profile.relationship_type == "board":
-                if "Board" not in suggested_labels:
-                    suggested_labels.append("Board")
+                add_label("Board")
                 reasoning.append("Board member relationship")
                 confidence_score += 0.4
                 escalation_recommended = True
             elif contact_profile.relationship_type == "investor":
-                if "Investors" not in suggested_labels:
-                    suggested_labels.append("Investors")
+                add_label("Investors")
                 reasoning.append("Investor relationship")
                 confidence_score += 0.3
 
         # Thread-based predictions
         if thread_profile:
             if thread_profile.thread_type == "decision":
-                if "DecisionRequired" not in suggested_labels:
-                    suggested_labels.append("DecisionRequired")
+                add_label("DecisionRequired")
                 reasoning.append("Part of decision thread")
                 confidence_score += 0.25
 
             # Inherit thread labels for consistency
             for label in thread_profile.labels_applied:
-                if label.startswith("CEO/") and label not in suggested_labels:
-                    suggested_labels.append(label.replace("CEO/", ""))
+                if label.startswith("CEO/") and label not in suggested_set:
+                    inherited = label.replace("CEO/", "")
+                    suggested_set.add(inherited)
+                    suggested_labels.append(inherited)
                     reasoning.append(f"Thread consistency: {label}")
                     confidence_score += 0.15
 
         # Content-based predictions
-        subject_lower = email.subject.lower()
-        subject_patterns = unified_intel.predictive_patterns["subject_patterns"]
-
-        for word in subject_lower.split():
-            if len(word) > 3 and word in subject_patterns:
-                word_labels = subject_patterns[word]
-                most_common = max(word_labels.items(), key=lambda x: x[1])[0]
-                if most_common not in suggested_labels:
-                    suggested_labels.append(most_common)
+        subject_top_labels = unified_intel.predictive_patterns["subject_top_labels"]
+        subject_words = subject_lower.split()
+
+        for word in subject_words:
+            if len(word) > 3 and word in subject_top_labels:
+                most_common = subject_top_labels[word]
+                if add_label(most_common):
                     reasoning.append(
                         f"Subject keyword '{word}' suggests '{most_common}'"
                     )
                     confidence_score += 0.1
 
         # Auto-escalation check
-        for rule in self.escalation_rules:
-            if rule["condition"](contact_profile or sender_profile, email):
-                escalation_recommended = True
-                for label in rule["labels"]:
-                    if label not in suggested_labels:
-                        suggested_labels.append(label)
-                reasoning.append(f"Auto-escalation rule: {rule['name']}")
-                confidence_score += 0.2
-                break
+        rule = self._match_escalation_rule(
+            contact_profile or sender_profile, subject_lower
+        )
+        if rule is not None:
+            escalation_recommended = True
+            for label in rule["labels"]:
+                add_label(label)
+            reasoning.append(f"Auto-escalation rule: {rule['name']}")
+            confidence_score += 0.2
 
         # Predict response time based on sender importance
         if contact_profile:
@@ -362,7 +436,9 @@ class UnifiedCEOIntelligence:
             predicted_response_time = "when convenient"
 
         # Find similar historical emails (mock implementation)
-        similar_emails = self._find_similar_emails(email, unified_intel)
+        similar_emails = self._find_similar_emails(
+            email, unified_intel, sender_key, subject_words
+        )
 
         # Normalize confidence score
         confidence_score = min(confidence_score, 1.0)
@@ -376,20 +452,54 @@ class UnifiedCEOIntelligence:
             similar_historical_emails=similar_emails,
         )
 
+    def _match_escalation_rule(
+        self, profile: Any, subject_lower: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return the first escalation rule matching the profile and subject."""
+        relationship_type = profile.relationship_type if profile else None
+        # Sender profiles carry strategic_importance; contact profiles use the
+        # same critical/high/medium/low scale under importance_level
+        strategic_importance = getattr(
+            profile, "strategic_importance", getattr(profile, "importance_level", None)
+        )
+
+        # Only rules without a relationship condition, or with this sender's
+        # relationship type, can match; look that list up once per type
+        candidates = self._escalation_rules_by_relationship.get(relationship_type)
+        if candidates is None:
+            candidates = [
+                rule
+                for rule in self.escalation_rules
+                if rule.get("relationship_type") in (None, relationship_type)
+            ]
+            self._escalation_rules_by_relationship[relationship_type] = candidates
+
+        for rule in candidates:
+            importance = rule.get("strategic_importance")
+            if importance is not None and importance != strategic_importance:
+                continue
+            subject_words = rule.get("subject_words")
+            if subject_words and not _mentions_any(subject_lower, subject_words):
+                continue
+            return rule
+        return None
+
     def _find_similar_emails(
-        self, email: Email, unified_intel: UnifiedIntelligence
+        self,
+        email: Email,
+        unified_intel: UnifiedIntelligence,
+        sender_key: str,
+        subject_words: List[str],
     ) -> List[str]:
         """Find historically similar emails (simplified implementation)."""
         # This would use more sophisticated similarity matching in production
         similar = []
         sender_patterns = unified_intel.predictive_patterns["sender_patterns"]
-        sender_key = email.sender.email.lower()
 
         if sender_key in sender_patterns:
             similar.append(f"Similar emails from {email.sender.email}")
 
         # Mock additional similarities
-        subject_words = email.subject.lower().split()
         for word in subject_words:
             if len(word) > 4:
                 similar.append(f"Emails containing '{word}'")
@@ -398,8 +508,87 @@ class UnifiedCEOIntelligence:
         return similar[:3]
 
 
-async def run_unified_ceo_intelligence(limit: int = 200, dry_run: bool = False):
-    """Run the complete unified CEO intelligence system."""
+def _apply_gmail_labels(
+    service: Any, pending: List[Tuple[Email, List[str]]], stats: Dict[str, int]
+) -> None:
+    """Apply label ids to emails with batched Gmail requests.
+
+    Message ids are resolved with one batch HTTP request per chunk, and
+    emails receiving the same labels are modified with a single
+    batchModify call, instead of two requests per email.
+    """
+    for start in range(0, len(pending), _GMAIL_BATCH_SIZE):
+        chunk = pending[start : start + _GMAIL_BATCH_SIZE]
+        gmail_ids: Dict[str, str] = {}
+
+        def on_lookup(request_id, response, exception):
+            if exception is not None:
+                stats["gmail_errors"] += 1
+            elif response.get("messages"):
+                gmail_ids[request_id] = response["messages"][0]["id"]
+
+        lookup = service.new_batch_http_request(callback=on_lookup)
+        for i, (email, _) in enumerate(chunk):
+            query = f"rfc822msgid:{email.message_id.strip('<>')}"
+            lookup.add(
+                service.users().messages().list(userId="me", q=query),
+                request_id=str(i),
+            )
+        try:
+            lookup.execute()
+        except Exception:
+            stats["gmail_errors"] += len(chunk)
+            continue
+
+        # One batchModify per distinct label set in the chunk
+        ids_by_labels: Dict[Tuple[str, ...], List[str]] = defaultdict(list)
+        for i, (_, label_ids) in enumerate(chunk):
+            gmail_id = gmail_ids.get(str(i))
+            if gmail_id:
+                ids_by_labels[tuple(label_ids)].append(gmail_id)
+
+        for label_ids, ids in ids_by_labels.items():
+            try:
+                service.users().messages().batchModify(
+                    userId="me", body={"ids": ids, "addLabelIds": list(label_ids)}
+                ).execute()
+                stats["labeled"] += len(ids)
+            except Exception:
+                stats["gmail_errors"] += len(ids)
+
+
+def _format_prediction(email: Email, prediction: EmailPrediction) -> List[str]:
+    """Format the console lines showing one email's prediction."""
+    confidence_color = (
+        "green"
+        if prediction.confidence_score > 0.7
+        else "yellow" if prediction.confidence_score > 0.4 else "red"
+    )
+    escalation_icon = "🚨" if prediction.escalation_recommended else "🧠"
+
+    label_str = ", ".join(prediction.suggested_labels[:3])
+    if len(prediction.suggested_labels) > 3:
+        label_str += f" +{len(prediction.suggested_labels)-3}"
+
+    lines = [
+        f"   {escalation_icon} [{confidence_color}]{prediction.confidence_score:.2f}[/{confidence_color}] "
+        f"{email.subject[:30]}... → [green]{label_str}[/green]"
+    ]
+
+    # Show top reasoning
+    if prediction.reasoning:
+        lines.append(f"      [dim]└─ {prediction.reasoning[0]}[/dim]")
+    return lines
+
+
+async def run_unified_ceo_intelligence(
+    limit: int = 200, dry_run: bool = False, verbose: bool = False
+):
+    """Run the complete unified CEO intelligence system.
+
+    With ``verbose`` set, the prediction and top reasoning for every email
+    are printed while processing; otherwise only the final summary is shown.
+    """
 
     console.print(
         Panel.fit(
@@ -420,7 +609,7 @@ async def run_unified_ceo_intelligence(limit: int = 200, dry_run: bool = False):
         console.print("[red]❌ No Gmail credentials found.[/red]")
         return
 
-    creds_data = json.loads(creds_json)
+    creds_data = orjson.loads(creds_json)
     creds = Credentials.from_authorized_user_info(
         creds_data,
         [
@@ -438,35 +627,67 @@ async def run_unified_ceo_intelligence(limit: int = 200, dry_run: bool = False):
     with db.get_session() as session:
         from email_agent.storage.models import EmailORM
 
-        # Get comprehensive dataset for intelligence building
-        all_emails_orm = (
-            session.query(EmailORM)
+        # Get comprehensive dataset for intelligence building. Only the
+        # needed columns are selected, so rows come back as plain tuples
+        # instead of tracked EmailORM instances.
+        rows = (
+            session.query(
+                EmailORM.id,
+                EmailORM.message_id,
+                EmailORM.thread_id,
+                EmailORM.subject,
+                EmailORM.sender_email,
+                EmailORM.sender_name,
+                EmailORM.date,
+                EmailORM.received_date,
+                EmailORM.body_text,
+                EmailORM.is_read,
+                EmailORM.is_flagged,
+                EmailORM.category,
+                EmailORM.priority,
+                EmailORM.tags,
+            )
             .order_by(EmailORM.received_date.desc())
             .limit(1500)
             .all()
         )  # Larger dataset for better intelligence
 
         all_emails = []
-        for e in all_emails_orm:
+        for (
+            email_id,
+            message_id,
+            thread_id,
+            subject,
+            sender_email,
+            sender_name,
+            date,
+            received_date,
+            body_text,
+            is_read,
+            is_flagged,
+            category,
+            priority,
+            tags,
+        ) in rows:
             email = Email(
-                id=e.id,
-                message_id=e.message_id,
-                thread_id=e.thread_id,
-                subject=e.subject,
-                sender=EmailAddress(email=e.sender_email, name=e.sender_name),
+                id=email_id,
+                message_id=message_id,
+                thread_id=thread_id,
+                subject=subject,
+                sender=EmailAddress(email=sender_email, name=sender_name),
                 recipients=[],
-                date=e.date,
-                received_date=e.received_date,
-                body_text=e.body_text or "",
-                is_read=e.is_read,
-                is_flagged=e.is_flagged,
+                date=date,
+                received_date=received_date,
+                body_text=body_text or "",
+                is_read=is_read,
+                is_flagged=is_flagged,
                 category=(
-                    EmailCategory(e.category) if e.category else EmailCategory.PERSONAL
+                    EmailCategory(category) if category else EmailCategory.PERSONAL
                 ),
-                priority=(
-                    EmailPriority(e.priority) if e.priority else EmailPriority.NORMAL
-                ),
-                tags=json.loads(e.tags) if e.tags else [],
+                priority=EmailPriority(priority) if priority else EmailPriority.NORMAL,
+                # The JSON column decodes tags already; older rows may hold
+                # them as an encoded string
+                tags=(orjson.loads(tags) if isinstance(tags, str) else tags) or [],
             )
             all_emails.append(email)
 
@@ -485,13 +706,17 @@ async def run_unified_ceo_intelligence(limit: int = 200, dry_run: bool = False):
     )
 
     # Get Gmail label map
-    results = service.users().labels().list(userId="me").execute()
+    results = await asyncio.to_thread(
+        service.users().labels().list(userId="me").execute
+    )
     label_map = {label["name"]: label["id"] for label in results.get("labels", [])}
 
     # Statistics
     stats = defaultdict(int)
     predictions_made = []
     escalations_triggered = []
+    pending_labels = []
+    output_lines: List[str] = []
 
     # Process emails with unified intelligence
     with Progress(
@@ -517,57 +742,22 @@ async def run_unified_ceo_intelligence(limit: int = 200, dry_run: bool = False):
                 if prediction.escalation_recommended:
                     escalations_triggered.append(email)
 
-                # Apply labels based on prediction
+                # Queue labels based on prediction; applied in batches below
                 if prediction.suggested_labels and not dry_run and email.message_id:
-                    try:
-                        msg_id = email.message_id.strip("<>")
-                        query = f"rfc822msgid:{msg_id}"
-                        results = (
-                            service.users()
-                            .messages()
-                            .list(userId="me", q=query)
-                            .execute()
-                        )
-
-                        if results.get("messages"):
-                            gmail_msg_id = results["messages"][0]["id"]
-
-                            labels_to_add = []
-                            for label_name in prediction.suggested_labels:
-                                full_label = f"EmailAgent/CEO/{label_name}"
-                                if full_label in label_map:
-                                    labels_to_add.append(label_map[full_label])
-
-                            if labels_to_add:
-                                body = {"addLabelIds": labels_to_add}
-                                service.users().messages().modify(
-                                    userId="me", id=gmail_msg_id, body=body
-                                ).execute()
-                                stats["labeled"] += 1
-                    except Exception:
-                        stats["gmail_errors"] += 1
+                    labels_to_add = []
+                    for label_name in prediction.suggested_labels:
+                        full_label = f"EmailAgent/CEO/{label_name}"
+                        if full_label in label_map:
+                            labels_to_add.append(label_map[full_label])
+                    if labels_to_add:
+                        pending_labels.append((email, labels_to_add))
 
                 # Display intelligent insights
-                confidence_color = (
-                    "green"
-                    if prediction.confidence_score > 0.7
-                    else "yellow" if prediction.confidence_score > 0.4 else "red"
-                )
-                escalation_icon = "🚨" if prediction.escalation_recommended else "🧠"
-
-                label_str = ", ".join(prediction.suggested_labels[:3])
-                if len(prediction.suggested_labels) > 3:
-                    label_str += f" +{len(prediction.suggested_labels)-3}"
-
-                progress.console.print(
-                    f"   {escalation_icon} [{confidence_color}]{prediction.confidence_score:.2f}[/{confidence_color}] "
-                    f"{email.subject[:30]}... → [green]{label_str}[/green]"
-                )
-
-                # Show top reasoning
-                if prediction.reasoning:
-                    top_reason = prediction.reasoning[0]
-                    progress.console.print(f"      [dim]└─ {top_reason}[/dim]")
+                if verbose:
+                    output_lines.extend(_format_prediction(email, prediction))
+                    if len(output_lines) >= _OUTPUT_FLUSH_LINES:
+                        progress.console.print("\n".join(output_lines))
+                        output_lines.clear()
 
                 stats["processed"] += 1
 
@@ -581,6 +771,16 @@ async def run_unified_ceo_intelligence(limit: int = 200, dry_run: bool = False):
 
             progress.advance(task)
 
+        if output_lines:
+            progress.console.print("\n".join(output_lines))
+
+    if pending_labels:
+        console.print(
+            f"🏷️  Applying labels to {len(pending_labels)} emails in Gmail..."
+        )
+        # Blocking Gmail client calls run off the event loop
+        await asyncio.to_thread(_apply_gmail_labels, service, pending_labels, stats)
+
     # Display comprehensive results
     console.print(
         "\n[bold green]✅ Unified Intelligence Processing Complete![/bold green]\n"
@@ -655,10 +855,11 @@ if __name__ == "__main__":
 
     limit = 200
     dry_run = "--dry-run" in sys.argv
+    verbose = "--verbose" in sys.argv
 
     # Parse command line arguments
     for i, arg in enumerate(sys.argv):
         if arg.isdigit():
             limit = int(arg)
 
-    asyncio.run(run_unified_ceo_intelligence(limit, dry_run))
+    asyncio.run(run_unified_ceo_intelligence(limit, dry_run, verbose))
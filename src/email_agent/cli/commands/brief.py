@@ -1,6 +1,5 @@
 """Daily brief generation and viewing commands."""
 
-import asyncio
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -14,6 +13,7 @@ from rich.table import Table
 from ...agents import EmailAgentCrew
 from ...config import settings
 from ...storage import DatabaseManager
+from ..utils import run_async
 
 console = Console()
 app = typer.Typer()
@@ -80,7 +80,7 @@ def generate(
         except Exception as e:
             console.print(f"[red]Brief generation failed: {str(e)}[/red]")
 
-    asyncio.run(run_generate())
+    run_async(run_generate())
 
 
 @app.command()
@@ -179,7 +179,7 @@ def narrative(
     ),
 ):
     """Generate narrative-style daily brief optimized for <60 second reading."""
-    asyncio.run(_generate_narrative_brief(date_str, save, format))
+    run_async(_generate_narrative_brief(date_str, save, format))
 
 
 @app.command()
@@ -22,9 +22,11 @@ from ...agents.collaborative_processor import CollaborativeEmailProcessor
 from ...agents.enhanced_ceo_labeler import EnhancedCEOLabeler
 from ...agents.relationship_intelligence import RelationshipIntelligence
 from ...agents.thread_intelligence import ThreadIntelligence
+from ...agents.unified_ceo_intelligence import run_unified_ceo_intelligence
 from ...connectors.gmail_service import GmailService
 from ...models import Email, EmailAddress, EmailCategory, EmailPriority
 from ...storage.database import DatabaseManager
+from ..utils import run_async
 
 console = Console()
 
@@ -40,19 +42,19 @@ def label(
     ),
 ):
     """Apply CEO labels to emails in Gmail."""
-    asyncio.run(_label_emails(limit, dry_run))
+    run_async(_label_emails(limit, dry_run))
 
 
 @app.command()
 def analyze():
     """Analyze CEO-labeled emails and show insights."""
-    asyncio.run(_analyze_labels())
+    run_async(_analyze_labels())
 
 
 @app.command()
 def setup():
     """Create all CEO labels in Gmail."""
-    asyncio.run(_setup_labels())
+    run_async(_setup_labels())
 
 
 @app.command()
@@ -63,7 +65,7 @@ def pull(
     ),
 ):
     """Pull emails from Gmail for processing."""
-    asyncio.run(_pull_emails(days, max_emails))
+    run_async(_pull_emails(days, max_emails))
 
 
 @app.command()
@@ -74,7 +76,21 @@ def intelligence(
     ),
 ):
     """Apply enhanced CEO intelligence with relationship and thread analysis."""
-    asyncio.run(_apply_intelligence(limit, dry_run))
+    run_async(_apply_intelligence(limit, dry_run))
+
+
+@app.command()
+def unified(
+    limit: int = typer.Option(200, "--limit", "-l", help="Number of emails to analyze"),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Analyze without applying labels"
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", "-v", help="Show the prediction for every email"
+    ),
+):
+    """Run the unified CEO intelligence system with predictive labeling."""
+    run_async(run_unified_ceo_intelligence(limit, dry_run, verbose))
 
 
 @app.command()
@@ -82,7 +98,7 @@ def relationships(
     limit: int = typer.Option(1000, "--limit", "-l", help="Number of emails to analyze")
 ):
     """Analyze relationship intelligence and show strategic contacts."""
-    asyncio.run(_analyze_relationships(limit))
+    run_async(_analyze_relationships(limit))
 
 
 @app.command()
@@ -90,7 +106,7 @@ def threads(
     limit: int = typer.Option(1000, "--limit", "-l", help="Number of emails to analyze")
 ):
     """Analyze thread intelligence and show conversation patterns."""
-    asyncio.run(_analyze_threads(limit))
+    run_async(_analyze_threads(limit))
 
 
 @app.command()
@@ -107,7 +123,7 @@ def collaborative(
     ),
 ):
     """Process emails using collaborative multi-agent intelligence."""
-    asyncio.run(_collaborative_processing(limit, dry_run, show_reasoning, batch_size))
+    run_async(_collaborative_processing(limit, dry_run, show_reasoning, batch_size))
 
 
 @app.command()
@@ -124,7 +140,7 @@ def process_inbox(
     batch_size: int = typer.Option(20, "--batch-size", help="Optimal batch size"),
 ):
     """Process entire inbox using optimized collaborative batching."""
-    asyncio.run(_process_inbox_batched(dry_run, show_progress, max_emails, batch_size))
+    run_async(_process_inbox_batched(dry_run, show_progress, max_emails, batch_size))
 
 
 async def _setup_labels():
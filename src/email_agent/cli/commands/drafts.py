@@ -1,7 +1,5 @@
 """CLI commands for AI draft suggestions."""
 
-import asyncio
-
 import typer
 from rich.console import Console
 from rich.panel import Panel
@@ -9,6 +7,7 @@ from rich.table import Table
 
 from ...agents.crew import EmailAgentCrew
 from ...storage.database import DatabaseManager
+from ..utils import run_async
 
 console = Console()
 app = typer.Typer()
@@ -25,7 +24,7 @@ def generate(
     ),
 ):
     """Generate draft suggestions for responding to an email."""
-    asyncio.run(_generate_drafts(email_id, num_suggestions, context))
+    run_async(_generate_drafts(email_id, num_suggestions, context))
 
 
 @app.command()
@@ -36,13 +35,13 @@ def analyze_style(
     min_emails: int = typer.Option(10, help="Minimum number of sent emails to analyze"),
 ):
     """Analyze your writing style from sent emails."""
-    asyncio.run(_analyze_writing_style(force_refresh, min_emails))
+    run_async(_analyze_writing_style(force_refresh, min_emails))
 
 
 @app.command()
 def style_summary():
     """Show summary of current writing style analysis."""
-    asyncio.run(_show_style_summary())
+    run_async(_show_style_summary())
 
 
 @app.command()
@@ -53,7 +52,7 @@ def use_draft(
     ),
 ):
     """Use a draft suggestion and copy it to clipboard or save as draft."""
-    asyncio.run(_use_draft_suggestion(email_id, draft_index))
+    run_async(_use_draft_suggestion(email_id, draft_index))
 
 
 async def _generate_drafts(email_id: str, num_suggestions: int, context: str):
@@ -1,6 +1,5 @@
 """CLI commands for smart inbox and triage management."""
 
-import asyncio
 from typing import List
 
 import typer
@@ -11,6 +10,7 @@ from rich.table import Table
 from ...agents.crew import EmailAgentCrew
 from ...models import Email
 from ...storage.database import DatabaseManager
+from ..utils import run_async
 
 app = typer.Typer()
 console = Console()
@@ -26,7 +26,7 @@ def smart(
     ),
 ):
     """Create smart inbox with AI-powered triage."""
-    asyncio.run(_smart_inbox(limit, days, show_scores, auto_archive))
+    run_async(_smart_inbox(limit, days, show_scores, auto_archive))
 
 
 @app.command()
@@ -35,7 +35,7 @@ def priority(
     min_score: float = typer.Option(0.7, help="Minimum attention score for priority"),
 ):
     """Show priority inbox - emails that need immediate attention."""
-    asyncio.run(_priority_inbox(limit, min_score))
+    run_async(_priority_inbox(limit, min_score))
 
 
 @app.command()
@@ -44,13 +44,13 @@ def archived(
     days: int = typer.Option(7, help="Number of days to look back"),
 ):
     """Show auto-archived emails with recovery options."""
-    asyncio.run(_archived_emails(limit, days))
+    run_async(_archived_emails(limit, days))
 
 
 @app.command()
 def stats():
     """Show triage statistics and performance metrics."""
-    asyncio.run(_triage_stats())
+    run_async(_triage_stats())
 
 
 @app.command()
@@ -64,7 +64,7 @@ def tune(
     show_current: bool = typer.Option(True, "--show", help="Show current settings"),
 ):
     """Tune triage thresholds and preferences."""
-    asyncio.run(_tune_triage(priority_threshold, archive_threshold, show_current))
+    run_async(_tune_triage(priority_threshold, archive_threshold, show_current))
 
 
 @app.command()
@@ -79,19 +79,19 @@ def feedback(
     ),
 ):
     """Provide feedback to improve triage accuracy."""
-    asyncio.run(_provide_feedback(email_id, correct_decision, user_action))
+    run_async(_provide_feedback(email_id, correct_decision, user_action))
 
 
 @app.command()
 def learning():
     """Show what the system has learned from your email habits."""
-    asyncio.run(_show_learning_insights())
+    run_async(_show_learning_insights())
 
 
 @app.command()
 def senders():
     """Show learned sender importance scores."""
-    asyncio.run(_show_sender_importance())
+    run_async(_show_sender_importance())
 
 
 async def _smart_inbox(limit: int, days: int, show_scores: bool, auto_archive: bool):
@@ -1,6 +1,5 @@
 """Initialization commands for Email Agent."""
 
-import asyncio
 from pathlib import Path
 
 import typer
@@ -10,6 +9,7 @@ from rich.prompt import Confirm, Prompt
 
 from ...config import settings
 from ...storage import DatabaseManager
+from ..utils import run_async
 
 console = Console()
 app = typer.Typer()
@@ -175,7 +175,7 @@ def test_gmail_connection(client_id: str, client_secret: str):
         except Exception as e:
             console.print(f"[red]Gmail test failed: {str(e)}[/red]")
 
-    asyncio.run(run_test())
+    run_async(run_test())
 
 
 @app.command()
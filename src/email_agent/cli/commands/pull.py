@@ -1,6 +1,5 @@
 """Email pulling and synchronization commands."""
 
-import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -11,6 +10,7 @@ from rich.table import Table
 
 from ...agents import EmailAgentCrew
 from ...storage import DatabaseManager
+from ..utils import run_async
 
 console = Console()
 app = typer.Typer()
@@ -114,7 +114,7 @@ def sync(
         except Exception as e:
             console.print(f"[red]Pull failed: {str(e)}[/red]")
 
-    asyncio.run(run_pull())
+    run_async(run_pull())
 
 
 @app.command()
@@ -199,7 +199,7 @@ def test(connector: str = typer.Argument(help="Connector name to test")):
         except Exception as e:
             console.print(f"[red]Test failed: {str(e)}[/red]")
 
-    asyncio.run(run_test())
+    run_async(run_test())
 
 
 def parse_time_string(time_str: Optional[str]) -> datetime:
@@ -1,6 +1,5 @@
 """Main CLI interface for Email Agent."""
 
-import asyncio
 import json
 import logging
 from datetime import datetime, timedelta
@@ -28,6 +27,7 @@ from .commands import (
     rules,
     status,
 )
+from .utils import run_async
 
 # Setup logging
 logging.basicConfig(level=getattr(logging, settings.log_level.upper()))
@@ -190,7 +190,7 @@ def sync(
         except Exception as e:
             console.print(f"[red]Sync failed: {str(e)}[/red]")
 
-    asyncio.run(run_sync())
+    run_async(run_sync())
 
 
 @app.command()
@@ -278,7 +278,7 @@ def smart_inbox(
     """Create smart inbox with AI-powered triage."""
     from .commands.inbox import _smart_inbox
 
-    asyncio.run(_smart_inbox(limit, days, show_scores, True))
+    run_async(_smart_inbox(limit, days, show_scores, True))
 
 
 @app.command()
@@ -289,7 +289,7 @@ def priority_inbox(
     """Show priority inbox - emails that need immediate attention."""
     from .commands.inbox import _priority_inbox
 
-    asyncio.run(_priority_inbox(limit, min_score))
+    run_async(_priority_inbox(limit, min_score))
 
 
 @app.command()
@@ -297,7 +297,7 @@ def triage_stats():
     """Show triage statistics and performance metrics."""
     from .commands.inbox import _triage_stats
 
-    asyncio.run(_triage_stats())
+    run_async(_triage_stats())
 
 
 @app.command()
@@ -435,7 +435,7 @@ def auto_handle(
         await crew.shutdown()
         console.print("\n[bold green]✨ Email handling complete![/bold green]")
 
-    asyncio.run(run_auto_handler())
+    run_async(run_auto_handler())
 
 
 @app.command()
@@ -677,7 +677,7 @@ def smart_actions(
                 f"[yellow]📅 {summary['deadlines_this_week']} items due this week[/yellow]"
             )
 
-    asyncio.run(run_smart_actions())
+    run_async(run_smart_actions())
 
 
 @app.command()
@@ -693,6 +693,16 @@ def thread_summary(
     overview: bool = typer.Option(
         False, "--overview", help="Generate overview of all thread summaries"
     ),
+    semantic_dedup: bool = typer.Option(
+        False,
+        "--semantic-dedup",
+        help="Summarize near-identical threads once, using content embeddings",
+    ),
+    batch_api: bool = typer.Option(
+        False,
+        "--batch-api",
+        help="Submit large jobs through the cheaper but slower OpenAI Batch API",
+    ),
 ):
     """Summarize email threads with AI-powered insights."""
 
@@ -702,6 +712,8 @@ def thread_summary(
         days=days,
         insights=insights,
         overview=overview,
+        semantic_dedup=semantic_dedup,
+        batch_api=batch_api,
     ):
         from ..agents.thread_summarizer import ThreadSummarizerAgent
         from ..models import Email, EmailAddress, EmailPriority
@@ -813,7 +825,12 @@ def thread_summary(
 
         # Summarize threads
         console.print("\n[cyan]Summarizing threads...[/cyan]")
-        summaries = await summarizer.summarize_multiple_threads(email_thread_groups)
+        summaries = await summarizer.summarize_multiple_threads(
+            email_thread_groups,
+            use_batch_api=batch_api,
+            semantic_dedup=semantic_dedup,
+            with_insights=insights,
+        )
 
         # Display results
         for i, (emails, summary) in enumerate(zip(email_thread_groups, summaries)):
@@ -871,19 +888,24 @@ def thread_summary(
 
             # Generate insights if requested
             if insights:
-                console.print("\n   [cyan]Generating insights...[/cyan]")
-                thread_insights = await summarizer.get_thread_insights(summary)
+                thread_insights = summary.get("insights")
+                if thread_insights is None:
+                    console.print("\n   [cyan]Generating insights...[/cyan]")
+                    thread_insights = await summarizer.get_thread_insights(summary)
 
                 if "error" not in thread_insights:
                     if thread_insights.get("escalation_needed"):
                         console.print("   [red]🚨 Escalation recommended![/red]")
 
-                    console.print(
-                        f"   📈 Efficiency Score: {thread_insights.get('efficiency_score', 'N/A')}/10"
-                    )
-                    console.print(
-                        f"   🤝 Collaboration Score: {thread_insights.get('collaboration_score', 'N/A')}/10"
-                    )
+                    # Threads too trivial for a model call are not scored
+                    if thread_insights.get("efficiency_score") is not None:
+                        console.print(
+                            f"   📈 Efficiency Score: {thread_insights['efficiency_score']}/10"
+                        )
+                    if thread_insights.get("collaboration_score") is not None:
+                        console.print(
+                            f"   🤝 Collaboration Score: {thread_insights['collaboration_score']}/10"
+                        )
 
                     if thread_insights.get("recommendations"):
                         console.print("   💭 [bold]Recommendations:[/bold]")
@@ -921,7 +943,7 @@ def thread_summary(
             f"\n[green]✅ Summarized {len([s for s in summaries if 'error' not in s])} threads successfully[/green]"
         )
 
-    asyncio.run(run_thread_summary())
+    run_async(run_thread_summary())
 
 
 @app.command()
@@ -1027,7 +1049,7 @@ def feedback(
         else:
             console.print("\n[red]❌ Failed to record feedback[/red]")
 
-    asyncio.run(run_feedback())
+    run_async(run_feedback())
 
 
 @app.command()
@@ -1087,7 +1109,7 @@ def learning_stats():
             f"\n[dim]Stats generated: {stats['stats_generated_at'][:19]}[/dim]"
         )
 
-    asyncio.run(run_learning_stats())
+    run_async(run_learning_stats())
 
 
 @app.command()
@@ -1112,7 +1134,7 @@ def export_learning(
         else:
             console.print("[red]❌ Failed to export learning data[/red]")
 
-    asyncio.run(run_export())
+    run_async(run_export())
 
 
 @app.command()
@@ -1315,7 +1337,7 @@ def commitments(
                 f"  Recent activity: {stats['recent_commitments_7days']} new commitments (7 days)"
             )
 
-    asyncio.run(run_commitments())
+    run_async(run_commitments())
 
 
 @app.command()
@@ -1347,7 +1369,7 @@ def mark_complete(
         else:
             console.print(f"[red]❌ Failed to update commitment {commitment_id}[/red]")
 
-    asyncio.run(run_mark_complete())
+    run_async(run_mark_complete())
 
 
 def run_tui():
@@ -0,0 +1,24 @@
+"""Shared helpers for CLI commands."""
+
+import asyncio
+from typing import Awaitable, TypeVar
+
+from ..agents.openai_client import close_openai_clients
+
+T = TypeVar("T")
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Run a command coroutine in a fresh event loop.
+
+    Shared OpenAI clients are bound to the loop they run on, so they are
+    closed on that loop before ``asyncio.run`` tears it down.
+    """
+
+    async def run_then_close_clients() -> T:
+        try:
+            return await coro
+        finally:
+            await close_openai_clients()
+
+    return asyncio.run(run_then_close_clients())
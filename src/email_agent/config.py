@@ -16,6 +16,8 @@ class Settings(BaseSettings):
     # API Keys
     openai_api_key: Optional[str] = Field(None, env="OPENAI_API_KEY")
     openai_model: str = Field("gpt-4", env="OPENAI_MODEL")
+    openai_requests_per_minute: int = Field(500, env="OPENAI_REQUESTS_PER_MINUTE")
+    openai_tokens_per_minute: int = Field(30000, env="OPENAI_TOKENS_PER_MINUTE")
 
     anthropic_api_key: Optional[str] = Field(None, env="ANTHROPIC_API_KEY")
     anthropic_model: str = Field("claude-3-sonnet-20240229", env="ANTHROPIC_MODEL")
@@ -38,6 +40,7 @@ class Settings(BaseSettings):
     brief_generation_enabled: bool = Field(True, env="BRIEF_GENERATION_ENABLED")
     brief_output_dir: str = Field("~/Briefs", env="BRIEF_OUTPUT_DIR")
     categorization_batch_size: int = Field(100, env="CATEGORIZATION_BATCH_SIZE")
+    triage_ai_urgency: bool = Field(False, env="TRIAGE_AI_URGENCY")
 
     # Logging
     log_level: str = Field("INFO", env="LOG_LEVEL")
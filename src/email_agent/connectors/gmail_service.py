@@ -7,6 +7,7 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 
+from ..agents.openai_client import get_openai_client, release_openai_client
 from ..config import settings
 from ..models import Email
 
@@ -215,10 +216,9 @@ class GmailService:
         self, email: Email, actions: Dict[str, Any]
     ) -> Optional[str]:
         """Generate smart reply suggestions based on email content and actions."""
+        client = None
         try:
-            from openai import AsyncOpenAI
-
-            client = AsyncOpenAI(api_key=settings.openai_api_key)
+            client = get_openai_client()
 
             # Determine reply type based on actions
             reply_context = []
@@ -270,6 +270,9 @@ class GmailService:
         except Exception as e:
             logger.error(f"Failed to generate smart reply: {e}")
             return None
+        finally:
+            if client is not None:
+                await release_openai_client(client)
 
     async def create_follow_up_reminder(self, email: Email, deadline: str) -> bool:
         """Create a follow-up reminder for an email with deadline."""
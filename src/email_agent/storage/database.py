@@ -1,10 +1,12 @@
 """Database management for Email Agent."""
 
+import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import orjson
 from sqlalchemy import and_, asc, create_engine, desc, func, or_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
@@ -25,6 +27,23 @@ from .models import Base, ConnectorConfigORM, EmailORM, EmailRuleORM
 logger = logging.getLogger(__name__)
 
 
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON columns (e.g. connector_data) with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _json_deserializer(value: str) -> Any:
+    """Deserialize JSON columns, falling back to the stdlib for legacy rows.
+
+    Rows written with the stdlib serializer may contain NaN or Infinity,
+    which orjson rejects.
+    """
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return json.loads(value)
+
+
 class DatabaseManager:
     """Database manager for Email Agent storage operations."""
 
@@ -49,6 +68,8 @@ class DatabaseManager:
                 self.database_url,
                 echo=settings.log_level.upper() == "DEBUG",
                 pool_pre_ping=True,
+                json_serializer=_json_serializer,
+                json_deserializer=_json_deserializer,
             )
 
             # Create session factory
@@ -245,3 +245,19 @@ class TestCLIIntegration:
         result = self.runner.invoke(app, ["stats"])
         assert result.exit_code == 0
         assert "10000" in result.output
+
+    @patch('email_agent.cli.commands.ceo.run_unified_ceo_intelligence')
+    def test_ceo_unified_verbose(self, mock_run):
+        """Test that ceo unified passes its options to the intelligence run."""
+        async def run(*args):
+            return None
+
+        mock_run.side_effect = run
+
+        result = self.runner.invoke(app, ["ceo", "unified", "--limit", "5"])
+        assert result.exit_code == 0
+        mock_run.assert_called_with(5, False, False)
+
+        result = self.runner.invoke(app, ["ceo", "unified", "--dry-run", "--verbose"])
+        assert result.exit_code == 0
+        mock_run.assert_called_with(200, True, True)
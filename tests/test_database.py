@@ -1,7 +1,10 @@
 """Tests for database operations."""
 
+import math
+
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy import text
 
 from email_agent.models import EmailCategory, EmailPriority
 
@@ -107,6 +110,23 @@ class TestDatabaseManager:
         assert saved_config.type == config.type
         assert saved_config.name == config.name
 
+    def test_legacy_json_with_nan(self, temp_db, sample_connector_config):
+        """Test reading JSON columns the stdlib serializer wrote with NaN."""
+        temp_db.save_connector_config(sample_connector_config)
+        with temp_db.get_session() as session:
+            session.execute(
+                text(
+                    "UPDATE connector_configs "
+                    "SET config = '{\"threshold\": NaN, \"limit\": Infinity}'"
+                )
+            )
+            session.commit()
+
+        configs = temp_db.get_connector_configs()
+        assert len(configs) == 1
+        assert math.isnan(configs[0].config["threshold"])
+        assert configs[0].config["limit"] == math.inf
+
     def test_database_pagination(self, temp_db, sample_emails):
         """Test database pagination."""
         # Create more emails for pagination testing
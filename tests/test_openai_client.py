@@ -0,0 +1,107 @@
+"""Tests for the shared OpenAI client cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from email_agent.agents import openai_client
+from email_agent.agents.openai_client import (
+    close_openai_clients,
+    get_openai_client,
+    release_openai_client,
+)
+from email_agent.cli.utils import run_async
+
+
+@pytest.fixture(autouse=True)
+def fake_clients(monkeypatch):
+    """Replace AsyncOpenAI with mocks and start from an empty cache."""
+    monkeypatch.setattr(openai_client, "_clients", {})
+    monkeypatch.setattr(openai_client, "_refcounts", {})
+    monkeypatch.setattr(
+        openai_client, "AsyncOpenAI", lambda **kwargs: Mock(close=AsyncMock())
+    )
+
+
+async def get_client(api_key="test-key"):
+    """Get the shared client from inside a running loop."""
+    return get_openai_client(api_key)
+
+
+class TestOpenAIClientCache:
+    """Test sharing and releasing OpenAI clients."""
+
+    @pytest.mark.asyncio
+    async def test_shared_within_loop(self):
+        """Test that agents on one loop share a client per API key."""
+        first = get_openai_client("test-key")
+        assert get_openai_client("test-key") is first
+        assert get_openai_client("other-key") is not first
+
+    @pytest.mark.asyncio
+    async def test_closed_on_last_release(self):
+        """Test that the client is closed once every user released it."""
+        client = get_openai_client("test-key")
+        get_openai_client("test-key")
+
+        await release_openai_client(client)
+        client.close.assert_not_awaited()
+        await release_openai_client(client)
+        client.close.assert_awaited_once()
+
+        # Releasing again is a no-op, and the next user gets a new client
+        await release_openai_client(client)
+        assert get_openai_client("test-key") is not client
+
+    def test_not_shared_across_loops(self):
+        """Test that every event loop gets its own client."""
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+        assert first is not second
+
+    def test_closed_loop_clients_dropped(self):
+        """Test that clients of closed loops are forgotten."""
+        asyncio.run(get_client())
+        assert len(openai_client._clients) == 1
+
+        get_openai_client("test-key")
+        assert list(openai_client._clients) == [(None, "test-key")]
+        assert list(openai_client._refcounts) == [(None, "test-key")]
+
+    @pytest.mark.asyncio
+    async def test_close_clients_of_running_loop(self):
+        """Test that shutdown closes this loop's and loop-less clients."""
+        other_loop = Mock(is_closed=Mock(return_value=False))
+        other = Mock(close=AsyncMock())
+        openai_client._clients[(other_loop, "test-key")] = other
+        openai_client._refcounts[(other_loop, "test-key")] = 1
+        loopless = Mock(close=AsyncMock())
+        openai_client._clients[(None, "test-key")] = loopless
+        openai_client._refcounts[(None, "test-key")] = 1
+        client = get_openai_client("test-key")
+
+        await close_openai_clients()
+
+        client.close.assert_awaited_once()
+        loopless.close.assert_awaited_once()
+        other.close.assert_not_awaited()
+        assert list(openai_client._clients) == [(other_loop, "test-key")]
+
+    def test_run_async_closes_clients(self):
+        """Test that CLI commands close the clients they opened."""
+        client = run_async(get_client())
+        client.close.assert_awaited_once()
+        assert openai_client._clients == {}
+
+    def test_run_async_closes_clients_on_error(self):
+        """Test that clients are closed when the command fails."""
+        clients = []
+
+        async def failing_command():
+            clients.append(get_openai_client("test-key"))
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            run_async(failing_command())
+        clients[0].close.assert_awaited_once()
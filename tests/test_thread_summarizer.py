@@ -0,0 +1,606 @@
+"""Tests for the thread summarizer agent."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+import openai
+import orjson
+import pytest
+
+from email_agent.agents import thread_summarizer
+from email_agent.agents.thread_summarizer import (
+    JSON_OBJECT_RESPONSE_FORMAT,
+    SUMMARY_RESPONSE_FORMAT,
+    ThreadSummarizerAgent,
+)
+from email_agent.config import settings
+from email_agent.models import Email, EmailAddress
+
+SUMMARY = {
+    "thread_summary": "Budget review",
+    "key_decisions": [],
+    "action_items": [],
+    "participants": [],
+    "thread_status": "ongoing",
+    "priority_level": "medium",
+    "sentiment": "neutral",
+    "next_steps": [],
+    "key_dates": [],
+    "thread_type": "discussion",
+    "requires_attention": False,
+    "estimated_resolution_time": "1 week",
+}
+
+
+def api_error(error_class, status_code: int):
+    """Create an OpenAI API error for a response with ``status_code``."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return error_class("API error", response=response, body=None)
+
+
+def completion(content: dict):
+    """Create a chat completion response carrying ``content`` as JSON."""
+    message = SimpleNamespace(content=orjson.dumps(content).decode())
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def make_thread(count: int = 2):
+    """Create a thread of ``count`` emails, one hour apart."""
+    start = datetime(2024, 1, 1, 9, 0)
+    return [
+        Email(
+            id=f"email-{i}",
+            message_id=f"msg-{i}",
+            thread_id="thread-1",
+            subject="Budget review",
+            sender=EmailAddress(email=f"person{i}@example.com"),
+            body_text=f"Message {i}",
+            date=start + timedelta(hours=i),
+            received_date=start + timedelta(hours=i),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def make_summarizer(monkeypatch, tmp_path):
+    """Create summarizers for a model, with a mocked OpenAI client."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def factory(model: str = "gpt-4o") -> ThreadSummarizerAgent:
+        client = Mock()
+        client.chat.completions.create = AsyncMock(return_value=completion(SUMMARY))
+        monkeypatch.setattr(thread_summarizer, "get_openai_client", lambda: client)
+        monkeypatch.setattr(settings, "openai_model", model)
+        return ThreadSummarizerAgent()
+
+    return factory
+
+
+class TestResponseFormat:
+    """Test that the response format matches what the model supports."""
+
+    @pytest.mark.parametrize(
+        "model,expected",
+        [
+            ("gpt-4o", SUMMARY_RESPONSE_FORMAT),
+            ("gpt-4o-mini", SUMMARY_RESPONSE_FORMAT),
+            ("gpt-4.1", SUMMARY_RESPONSE_FORMAT),
+            ("gpt-4o-2024-05-13", JSON_OBJECT_RESPONSE_FORMAT),
+            ("gpt-4-turbo", JSON_OBJECT_RESPONSE_FORMAT),
+            ("gpt-3.5-turbo", JSON_OBJECT_RESPONSE_FORMAT),
+            ("gpt-4", None),
+            ("gpt-4-0613", None),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_summary_response_format(self, make_summarizer, model, expected):
+        """Test the response format sent with summary requests."""
+        summarizer = make_summarizer(model)
+
+        result = await summarizer.summarize_thread(make_thread())
+
+        assert result["thread_summary"] == "Budget review"
+        kwargs = summarizer.client.chat.completions.create.call_args.kwargs
+        assert kwargs.get("response_format") == expected
+
+    @pytest.mark.asyncio
+    async def test_default_model_is_prompted_for_json(self, make_summarizer):
+        """Test that the default gpt-4 model gets the JSON shape in the prompt."""
+        summarizer = make_summarizer("gpt-4")
+
+        await summarizer.summarize_thread(make_thread())
+
+        kwargs = summarizer.client.chat.completions.create.call_args.kwargs
+        assert "response_format" not in kwargs
+        assert "Return only valid JSON" in kwargs["messages"][0]["content"]
+
+
+STREAMED = {
+    "thread_summary": "Budget, review {draft}",
+    "efficiency_score": 8.5,
+    "count": -12,
+    "ratio": 1e3,
+    "requires_attention": True,
+    "deadline": None,
+    "next_steps": ["Send deck", "Book room"],
+    "owner": {"email": "a@example.com"},
+}
+
+
+def chunks(text: str, size: int):
+    """Split ``text`` into chunks of ``size`` characters."""
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestStreamingObjectParser:
+    """Test incremental parsing of streamed JSON objects."""
+
+    @pytest.mark.parametrize("indent", [False, True])
+    @pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 1000])
+    def test_fields_across_chunk_boundaries(self, indent, size):
+        """Test that every field is emitted once, complete, for any chunking."""
+        option = orjson.OPT_INDENT_2 if indent else None
+        text = orjson.dumps(STREAMED, option=option).decode()
+        parser = thread_summarizer._StreamingObjectParser()
+
+        fields = []
+        for chunk in chunks(text, size):
+            fields.extend(parser.feed(chunk))
+
+        assert fields == list(STREAMED.items())
+        assert parser.done
+
+    @pytest.mark.parametrize("split", range(1, 12))
+    def test_split_number_is_not_truncated(self, split):
+        """Test that a number cut by a chunk boundary is emitted whole."""
+        text = '{"score": 8.5e1, "b": 2}'
+        parser = thread_summarizer._StreamingObjectParser()
+
+        fields = parser.feed(text[: 10 + split]) + parser.feed(text[10 + split :])
+
+        assert fields == [("score", 85.0), ("b", 2)]
+
+    def test_value_waits_for_delimiter(self):
+        """Test that a value is held back until its delimiter arrives."""
+        parser = thread_summarizer._StreamingObjectParser()
+
+        assert parser.feed('{"score": 8') == []
+        assert parser.feed("  ") == []
+        assert parser.feed("}") == [("score", 8)]
+        assert parser.done
+
+    def test_rejects_non_object(self):
+        """Test that a stream not starting with an object is rejected."""
+        parser = thread_summarizer._StreamingObjectParser()
+        with pytest.raises(ValueError):
+            parser.feed("[1, 2]")
+
+
+class TestStreamThreadSummary:
+    """Test streaming a thread summary from chunked completions."""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_fields_then_summary(self, make_summarizer):
+        """Test that fields stream in order before the full summary."""
+        summarizer = make_summarizer()
+        text = orjson.dumps(SUMMARY).decode()
+
+        async def stream():
+            for chunk in chunks(text, 4):
+                delta = SimpleNamespace(content=chunk)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+        summarizer.client.chat.completions.create = AsyncMock(return_value=stream())
+
+        events = [
+            event async for event in summarizer.stream_thread_summary(make_thread())
+        ]
+
+        assert events[:-1] == list(SUMMARY.items())
+        field, result = events[-1]
+        assert field is None
+        assert result["thread_summary"] == "Budget review"
+        assert result["email_count"] == 2
+
+
+class TestEmbeddingCache:
+    """Test the persisted embedding cache."""
+
+    def test_summarizer_does_not_create_database(self, make_summarizer, tmp_path):
+        """Test that the cache only exists once semantic dedup uses it."""
+        summarizer = make_summarizer()
+
+        assert summarizer._embedding_cache is None
+        assert not (tmp_path / ".email_agent" / "thread_embeddings.db").exists()
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        """Test that stored embeddings are read back from disk."""
+        db_path = tmp_path / "embeddings.db"
+        cache = thread_summarizer._EmbeddingCache(db_path)
+        assert not db_path.exists()
+
+        await cache.put_many("model", {"a": [0.5, 1.0], "b": [2.0, 0.0]})
+
+        reloaded = thread_summarizer._EmbeddingCache(db_path)
+        assert await reloaded.get_many(["a", "b", "c"]) == {
+            "a": [0.5, 1.0],
+            "b": [2.0, 0.0],
+        }
+
+    @pytest.mark.asyncio
+    async def test_memory_eviction(self):
+        """Test that the in-memory cache evicts least recently used entries."""
+        cache = thread_summarizer._EmbeddingCache(maxsize=2)
+        await cache.put_many("model", {"a": [1.0], "b": [2.0]})
+        await cache.get_many(["a"])
+        await cache.put_many("model", {"c": [3.0]})
+
+        assert list(cache._memory) == ["a", "c"]
+        assert await cache.get_many(["b"]) == {}
+
+
+class TestSemanticDedup:
+    """Test summarizing near-identical threads once."""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_share_one_summary(self, make_summarizer, tmp_path):
+        """Test that duplicate threads are summarized with a single request."""
+        summarizer = make_summarizer()
+
+        async def embed(model, input):
+            data = [
+                SimpleNamespace(index=i, embedding=[1.0, 0.0])
+                for i in range(len(input))
+            ]
+            return SimpleNamespace(data=data)
+
+        summarizer.client.embeddings.create = AsyncMock(side_effect=embed)
+        threads = [make_thread(2), make_thread(3)]
+
+        results = await summarizer.summarize_multiple_threads(
+            threads, semantic_dedup=True
+        )
+
+        assert summarizer.client.chat.completions.create.await_count == 1
+        assert [r["email_count"] for r in results] == [2, 3]
+        assert results[1]["deduplicated_from"] == "thread-1"
+        assert (tmp_path / ".email_agent" / "thread_embeddings.db").exists()
+
+        # Embeddings come from the cache the second time
+        await summarizer.summarize_multiple_threads(threads, semantic_dedup=True)
+        assert summarizer.client.embeddings.create.await_count == 1
+
+
+class TestBatchApi:
+    """Test summarizing large jobs through the Batch API."""
+
+    @pytest.mark.asyncio
+    async def test_batch_results_map_to_threads(self, make_summarizer, monkeypatch):
+        """Test that batch output lines are matched to their threads."""
+        summarizer = make_summarizer()
+        monkeypatch.setattr(summarizer, "BATCH_API_MIN_THREADS", 2)
+        monkeypatch.setattr(summarizer, "BATCH_API_POLL_INTERVAL", 0)
+
+        def output_line(custom_id, status_code=200):
+            content = orjson.dumps(SUMMARY).decode()
+            body = {"choices": [{"message": {"content": content}}]}
+            return orjson.dumps(
+                {
+                    "custom_id": custom_id,
+                    "response": {"status_code": status_code, "body": body},
+                }
+            ).decode()
+
+        client = summarizer.client
+        client.files.create = AsyncMock(return_value=SimpleNamespace(id="file-1"))
+        client.batches.create = AsyncMock(
+            return_value=SimpleNamespace(id="batch-1", status="in_progress")
+        )
+        client.batches.retrieve = AsyncMock(
+            return_value=SimpleNamespace(
+                id="batch-1", status="completed", output_file_id="file-2"
+            )
+        )
+        client.files.content = AsyncMock(
+            return_value=SimpleNamespace(
+                text="\n".join([output_line("2", status_code=500), output_line("0")])
+            )
+        )
+
+        results = await summarizer.summarize_multiple_threads(
+            [make_thread(2), [], make_thread(3)], use_batch_api=True
+        )
+
+        assert results[0]["email_count"] == 2
+        assert results[1] == {"error": "No emails provided"}
+        assert "error" in results[2]
+        client.chat.completions.create.assert_not_called()
+
+
+class TestThreadsOverview:
+    """Test the overview built from several thread summaries."""
+
+    @pytest.mark.asyncio
+    async def test_trivial_threads_are_not_scored(self, make_summarizer):
+        """Test that locally generated insights carry no scores."""
+        summarizer = make_summarizer()
+        summary = dict(SUMMARY, email_count=2, thread_status="resolved")
+
+        insights = await summarizer.get_thread_insights(summary)
+
+        assert insights["generated_locally"]
+        assert insights["efficiency_score"] is None
+        assert insights["collaboration_score"] is None
+        summarizer.client.chat.completions.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unscored_threads_left_out_of_averages(self, make_summarizer):
+        """Test that unscored threads do not bias the averages."""
+        summarizer = make_summarizer()
+        scored = dict(
+            SUMMARY, insights={"efficiency_score": 4, "collaboration_score": 6}
+        )
+        unscored = dict(
+            SUMMARY,
+            insights={"efficiency_score": None, "collaboration_score": None},
+        )
+
+        overview = await summarizer.generate_threads_overview([scored, unscored])
+
+        assert overview["total_threads"] == 2
+        assert overview["efficiency_metrics"] == {
+            "avg_efficiency": 4,
+            "avg_collaboration": 6,
+            "unscored_threads": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_no_scored_threads(self, make_summarizer):
+        """Test the averages when no thread was scored."""
+        summarizer = make_summarizer()
+        unscored = dict(
+            SUMMARY,
+            insights={"efficiency_score": None, "collaboration_score": None},
+        )
+
+        overview = await summarizer.generate_threads_overview([unscored])
+
+        assert overview["efficiency_metrics"]["avg_efficiency"] is None
+        assert overview["efficiency_metrics"]["avg_collaboration"] is None
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand, or by the patched asyncio.sleep."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the summarizer's clock and sleeps from a fake clock."""
+    fake = FakeClock()
+    monkeypatch.setattr(thread_summarizer, "time", fake)
+    monkeypatch.setattr(thread_summarizer.asyncio, "sleep", fake.sleep)
+    return fake
+
+
+class TestAsyncTokenBucket:
+    """Test the proactive rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_full_bucket_does_not_wait(self, clock):
+        """Test that a full bucket admits its capacity immediately."""
+        bucket = thread_summarizer._AsyncTokenBucket(60, period=60.0)
+
+        for _ in range(60):
+            await bucket.acquire()
+
+        assert clock.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self, clock):
+        """Test that an empty bucket waits exactly for the missing tokens."""
+        bucket = thread_summarizer._AsyncTokenBucket(60, period=60.0)
+        await bucket.acquire(60)
+
+        await bucket.acquire(3)
+
+        assert clock.sleeps == [pytest.approx(3.0)]
+
+    @pytest.mark.asyncio
+    async def test_refills_over_time_up_to_capacity(self, clock):
+        """Test that idle time refills the bucket, but never past capacity."""
+        bucket = thread_summarizer._AsyncTokenBucket(10, period=10.0)
+        await bucket.acquire(10)
+
+        clock.now += 1000
+        await bucket.acquire(10)
+        assert clock.sleeps == []
+
+        await bucket.acquire(1)
+        assert clock.sleeps == [pytest.approx(1.0)]
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_is_capped(self, clock):
+        """Test that a request above capacity waits for a full bucket only."""
+        bucket = thread_summarizer._AsyncTokenBucket(10, period=10.0)
+        await bucket.acquire(10)
+
+        await bucket.acquire(50)
+
+        assert clock.sleeps == [pytest.approx(10.0)]
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    def make_breaker(self):
+        return thread_summarizer._CircuitBreaker(
+            failure_threshold=3, reset_timeout=30.0, max_reset_timeout=100.0
+        )
+
+    def open_breaker(self, breaker):
+        for _ in range(breaker.failure_threshold):
+            breaker.before_call()
+            breaker.record_failure()
+
+    def test_opens_after_threshold(self, clock):
+        """Test that consecutive failures open the circuit."""
+        breaker = self.make_breaker()
+
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        assert breaker.state == breaker.CLOSED
+
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == breaker.OPEN
+        with pytest.raises(thread_summarizer._CircuitOpenError):
+            breaker.before_call()
+
+    def test_success_resets_failure_count(self, clock):
+        """Test that only consecutive failures count towards opening."""
+        breaker = self.make_breaker()
+
+        for _ in range(2):
+            breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == breaker.CLOSED
+
+    def test_half_open_admits_single_probe(self, clock):
+        """Test that after the timeout only one probe call is admitted."""
+        breaker = self.make_breaker()
+        self.open_breaker(breaker)
+
+        clock.now += 30
+        breaker.before_call()
+        assert breaker.state == breaker.HALF_OPEN
+        with pytest.raises(thread_summarizer._CircuitOpenError):
+            breaker.before_call()
+
+    def test_successful_probe_closes(self, clock):
+        """Test that a successful probe closes the circuit."""
+        breaker = self.make_breaker()
+        self.open_breaker(breaker)
+
+        clock.now += 30
+        breaker.before_call()
+        breaker.record_success()
+
+        assert breaker.state == breaker.CLOSED
+        assert breaker.failure_count == 0
+        breaker.before_call()
+
+    def test_failed_probe_reopens_with_backoff(self, clock):
+        """Test that a failed probe re-opens with a doubled, capped timeout."""
+        breaker = self.make_breaker()
+        self.open_breaker(breaker)
+
+        for expected_timeout in (60.0, 100.0, 100.0):
+            clock.now += breaker.open_timeout
+            breaker.before_call()
+            breaker.record_failure()
+            assert breaker.state == breaker.OPEN
+            assert breaker.open_timeout == expected_timeout
+
+        clock.now += 99
+        with pytest.raises(thread_summarizer._CircuitOpenError):
+            breaker.before_call()
+
+    def test_released_probe_can_be_retried(self, clock):
+        """Test that a cancelled probe frees the half-open slot."""
+        breaker = self.make_breaker()
+        self.open_breaker(breaker)
+
+        clock.now += 30
+        breaker.before_call()
+        breaker.release_probe()
+        breaker.before_call()
+
+        assert breaker.state == breaker.HALF_OPEN
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_requests(self, make_summarizer, clock):
+        """Test that summaries fail fast without calling the API when open."""
+        summarizer = make_summarizer()
+        summarizer.client.chat.completions.create = AsyncMock(
+            side_effect=api_error(openai.InternalServerError, 500)
+        )
+
+        threshold = summarizer._circuit_breaker.failure_threshold
+        for _ in range(threshold):
+            result = await summarizer.summarize_thread(make_thread())
+            assert result["error"] == "API error"
+
+        result = await summarizer.summarize_thread(make_thread())
+
+        assert result["error"] == "circuit_open"
+        assert summarizer.client.chat.completions.create.await_count == threshold
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            openai.APIConnectionError(
+                request=httpx.Request("POST", "https://api.openai.com")
+            ),
+            api_error(openai.RateLimitError, 429),
+            api_error(openai.InternalServerError, 503),
+        ],
+    )
+    def test_outage_errors_count(self, error):
+        """Test that connection, rate limit and 5xx errors signal an outage."""
+        assert thread_summarizer._is_outage_error(error)
+
+    @pytest.mark.asyncio
+    async def test_bad_request_does_not_open(self, make_summarizer, clock):
+        """Test that rejected requests do not open the circuit."""
+        summarizer = make_summarizer()
+        summarizer.client.chat.completions.create = AsyncMock(
+            side_effect=api_error(openai.BadRequestError, 400)
+        )
+
+        threshold = summarizer._circuit_breaker.failure_threshold
+        for _ in range(threshold + 1):
+            result = await summarizer.summarize_thread(make_thread())
+            assert result["error"] == "API error"
+
+        assert summarizer._circuit_breaker.state == "closed"
+        assert summarizer._circuit_breaker.failure_count == 0
+        assert summarizer.client.chat.completions.create.await_count == threshold + 1
+
+    @pytest.mark.asyncio
+    async def test_bad_probe_releases_half_open_slot(self, make_summarizer, clock):
+        """Test that a rejected probe neither re-opens nor blocks the circuit."""
+        summarizer = make_summarizer()
+        breaker = summarizer._circuit_breaker
+        self.open_breaker(breaker)
+        clock.now += breaker.open_timeout
+        summarizer.client.chat.completions.create = AsyncMock(
+            side_effect=api_error(openai.BadRequestError, 400)
+        )
+
+        result = await summarizer.summarize_thread(make_thread())
+
+        assert result["error"] == "API error"
+        assert breaker.state == breaker.HALF_OPEN
+        assert not breaker.probe_in_flight
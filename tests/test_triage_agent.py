@@ -0,0 +1,402 @@
+"""Tests for the triage agent."""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import orjson
+import pytest
+
+from email_agent.agents import triage_agent
+from email_agent.agents.triage_agent import TriageAgent
+from email_agent.config import settings
+from email_agent.models import Email, EmailAddress, EmailCategory
+
+
+def make_email(
+    subject: str = "Project notes",
+    body: str = "",
+    sender: str = "colleague@example.org",
+    category: EmailCategory = EmailCategory.PRIMARY,
+    email_id: str = "email-1",
+) -> Email:
+    """Create an email for triage."""
+    return Email(
+        id=email_id,
+        message_id=f"msg-{email_id}",
+        subject=subject,
+        sender=EmailAddress(email=sender),
+        body_text=body,
+        category=category,
+        date=datetime.now(),
+        received_date=datetime.now(),
+    )
+
+
+def urgency_completion(scores):
+    """Create a chat completion carrying batched urgency scores."""
+    content = orjson.dumps({"scores": scores}).decode()
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def agent(monkeypatch, tmp_path):
+    """Create a triage agent whose data lives in a temporary home."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return TriageAgent()
+
+
+@pytest.fixture
+def ai_agent(agent, monkeypatch):
+    """Create a triage agent with the AI urgency analysis enabled."""
+    monkeypatch.setattr(settings, "triage_ai_urgency", True)
+    agent.openai_client = Mock()
+    agent.openai_client.chat.completions.create = AsyncMock(
+        side_effect=lambda **kwargs: urgency_completion(
+            [0.9] * kwargs["messages"][1]["content"].count("\nEmail ")
+        )
+    )
+    return agent
+
+
+class TestUrgencyCache:
+    """Test the persisted AI urgency cache."""
+
+    def test_not_created_when_ai_urgency_disabled(self, agent, tmp_path):
+        """Test that the default configuration never creates the database."""
+        assert agent._urgency_cache is None
+        assert not (tmp_path / ".email_agent" / "triage_urgency.db").exists()
+
+    @pytest.mark.asyncio
+    async def test_rule_based_triage_does_not_create_cache(self, agent, tmp_path):
+        """Test that scoring without the AI analysis leaves the cache alone."""
+        await agent.calculate_attention_score(make_email("Please respond"))
+
+        assert agent._urgency_cache is None
+        assert not (tmp_path / ".email_agent" / "triage_urgency.db").exists()
+
+    @pytest.mark.asyncio
+    async def test_persists_across_instances(self, tmp_path):
+        """Test that stored scores are read back from disk."""
+        db_path = tmp_path / "urgency.db"
+        cache = triage_agent._UrgencyCache(db_path)
+        assert not db_path.exists()
+
+        await cache.put("key", 0.75)
+
+        score, age = await triage_agent._UrgencyCache(db_path).get("key")
+        assert score == 0.75
+        assert 0 <= age < 60
+        assert await cache.get("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_memory_eviction(self):
+        """Test that the in-memory cache evicts least recently used entries."""
+        cache = triage_agent._UrgencyCache(maxsize=2)
+        await cache.put("a", 0.1)
+        await cache.put("b", 0.2)
+        await cache.get("a")
+        await cache.put("c", 0.3)
+
+        assert list(cache._memory) == ["a", "c"]
+        assert await cache.get("b") is None
+
+    @pytest.mark.asyncio
+    async def test_ai_analysis_uses_cache(self, ai_agent, tmp_path):
+        """Test that a repeated email is answered from the cache."""
+        email = make_email("Please respond")
+
+        assert await ai_agent._ai_urgency_analysis(email) == 0.9
+        assert await ai_agent._ai_urgency_analysis(email) == 0.9
+
+        assert ai_agent.openai_client.chat.completions.create.await_count == 1
+        assert (tmp_path / ".email_agent" / "triage_urgency.db").exists()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_served_and_refreshed(self, ai_agent, monkeypatch):
+        """Test stale-while-revalidate for old cached scores."""
+        email = make_email("Please respond")
+        cache = ai_agent._get_urgency_cache()
+        key = triage_agent._UrgencyCache.key(settings.openai_model, email)
+        await cache.put(key, 0.2)
+        stale = ai_agent.URGENCY_CACHE_FRESH_SECONDS + 60
+        cache._memory[key] = (0.2, cache._memory[key][1] - stale)
+
+        assert await ai_agent._ai_urgency_analysis(email) == 0.2
+
+        for task in list(ai_agent._background_tasks):
+            await task
+        score, _ = await cache.get(key)
+        assert score == 0.9
+
+
+class TestSenderImportance:
+    """Test learning and bounding sender importance scores."""
+
+    async def give_feedback(self, agent, sender, decision):
+        await agent._update_sender_importance_from_feedback(sender, decision, "moved")
+
+    @pytest.mark.asyncio
+    async def test_eviction_keeps_demoted_senders(self, agent, monkeypatch):
+        """Test that the least recently updated sender is evicted, not the lowest."""
+        monkeypatch.setattr(
+            agent, "SENDER_IMPORTANCE_MAX_SIZE", len(agent.sender_importance) + 2
+        )
+        await self.give_feedback(agent, "old@example.org", "priority_inbox")
+        await self.give_feedback(agent, "spammy@example.org", "spam_folder")
+        await self.give_feedback(agent, "new@example.org", "priority_inbox")
+
+        assert "old@example.org" not in agent.sender_importance
+        assert agent._score_by_lowered_sender("spammy@example.org") < 0.4
+        assert "new@example.org" in agent.sender_importance
+
+    @pytest.mark.asyncio
+    async def test_updating_a_sender_refreshes_its_recency(self, agent, monkeypatch):
+        """Test that repeated feedback keeps a sender from being evicted."""
+        monkeypatch.setattr(
+            agent, "SENDER_IMPORTANCE_MAX_SIZE", len(agent.sender_importance) + 2
+        )
+        await self.give_feedback(agent, "first@example.org", "priority_inbox")
+        await self.give_feedback(agent, "second@example.org", "priority_inbox")
+        await self.give_feedback(agent, "first@example.org", "priority_inbox")
+        await self.give_feedback(agent, "third@example.org", "priority_inbox")
+
+        assert "first@example.org" in agent.sender_importance
+        assert "second@example.org" not in agent.sender_importance
+
+    @pytest.mark.asyncio
+    async def test_default_patterns_are_never_evicted(self, agent, monkeypatch):
+        """Test that eviction only drops learned senders."""
+        defaults = dict(triage_agent._DEFAULT_SENDER_IMPORTANCE)
+        monkeypatch.setattr(agent, "SENDER_IMPORTANCE_MAX_SIZE", 1)
+        for i in range(3):
+            await self.give_feedback(agent, f"s{i}@example.org", "priority_inbox")
+
+        for pattern in defaults:
+            assert pattern in agent.sender_importance
+        assert "s2@example.org" in agent.sender_importance
+        assert "s1@example.org" not in agent.sender_importance
+
+    @pytest.mark.asyncio
+    async def test_feedback_keeps_pattern_index_current(self, agent):
+        """Test that learned patterns and addresses are looked up incrementally."""
+        assert agent._score_by_lowered_sender("boss@example.org") == 0.9
+        assert agent._score_by_lowered_sender("someone@partner.io") == 0.4
+
+        await self.give_feedback(agent, "@partner.io", "spam_folder")
+        await self.give_feedback(agent, "vip@partner.io", "priority_inbox")
+
+        assert agent._score_by_lowered_sender("someone@partner.io") < 0.4
+        assert agent._score_by_lowered_sender("vip@partner.io") > 0.4
+        assert agent._score_by_lowered_sender("boss@example.org") == 0.9
+
+    @pytest.mark.asyncio
+    async def test_evicted_pattern_is_unindexed(self, agent, monkeypatch):
+        """Test that an evicted pattern no longer matches senders."""
+        monkeypatch.setattr(
+            agent, "SENDER_IMPORTANCE_MAX_SIZE", len(agent.sender_importance) + 1
+        )
+        await self.give_feedback(agent, "@partner.io", "spam_folder")
+        assert agent._score_by_lowered_sender("someone@partner.io") < 0.4
+
+        await self.give_feedback(agent, "other@example.org", "priority_inbox")
+
+        assert "@partner.io" not in agent._sender_domains
+        assert agent._score_by_lowered_sender("someone@partner.io") == 0.4
+
+
+class TestTimePressureUrgency:
+    """Test that implied time pressure only nudges urgency."""
+
+    @pytest.mark.parametrize(
+        "subject,body,urgency",
+        [
+            ("Lunch today?", "", 0.3),
+            ("Notes", "See you tomorrow at the standup.", 0.2),
+            ("Plans for this week", "", 0.2),
+            ("Quarterly notes", "Nothing pressing here.", 0.0),
+            ("Urgent: server down", "", 0.9),
+            ("Server down", "This is an emergency.", 0.36),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_urgency_factor(self, agent, subject, body, urgency):
+        """Test the urgency factor for benign and urgent emails."""
+        score = await agent.calculate_attention_score(make_email(subject, body))
+
+        assert score.factors["urgency"] == pytest.approx(urgency)
+
+    @pytest.mark.parametrize(
+        "subject,body,expected",
+        [
+            ("Lunch today?", "Are you free today?", 0.58),
+            ("Tomorrow", "See you tomorrow, have a good evening tonight.", 0.57),
+            ("Update", "Quick update for this week, nothing due.", 0.552),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_benign_emails_stay_in_regular_inbox(
+        self, agent, subject, body, expected
+    ):
+        """Test that everyday time words do not flag emails as priority."""
+        email = make_email(subject, body)
+
+        decision, score = await agent.make_triage_decision(email)
+
+        assert decision == triage_agent.TriageDecision.REGULAR_INBOX
+        assert score.score == pytest.approx(expected)
+
+    @pytest.mark.asyncio
+    async def test_zero_weight_ignores_time_pressure(self, agent):
+        """Test that a zero weight scores explicit urgency words only."""
+        agent.user_preferences["time_pressure_weight"] = 0.0
+
+        benign = await agent.calculate_attention_score(make_email("Lunch today?"))
+        urgent = await agent.calculate_attention_score(
+            make_email("ASAP today", email_id="email-2")
+        )
+
+        assert benign.factors["urgency"] == 0.0
+        assert urgent.factors["urgency"] == 0.9
+
+
+class TestFactorCache:
+    """Test the content factor cache."""
+
+    @pytest.mark.asyncio
+    async def test_same_subject_different_urgency(self, agent):
+        """Test that a reply reusing a subject is scored from its own body."""
+        calm = make_email("Re: Quick question", "No rush, whenever you can.")
+        pressing = make_email(
+            "Re: Quick question", "Need this ASAP today.", email_id="email-2"
+        )
+
+        calm_score = await agent.calculate_attention_score(calm)
+        pressing_score = await agent.calculate_attention_score(pressing)
+
+        assert calm_score.factors["urgency"] == 0.0
+        assert pressing_score.factors["urgency"] == pytest.approx(0.72)
+        assert len(agent._factor_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_repeated_email_hits_cache(self, agent, monkeypatch):
+        """Test that identical templated emails reuse the cached factors."""
+        await agent.calculate_attention_score(make_email("Digest", "Weekly news"))
+        scorer = Mock(side_effect=AssertionError("factors recomputed"))
+        monkeypatch.setattr(agent, "_local_urgency_score", scorer)
+
+        score = await agent.calculate_attention_score(
+            make_email("Digest", "Weekly news", email_id="email-2")
+        )
+
+        assert score.factors["urgency"] == 0.0
+
+
+class TestUrgencyBatching:
+    """Test batching AI urgency requests into shared completions."""
+
+    def make_emails(self, count):
+        return [
+            make_email(f"Please respond {i}", email_id=f"email-{i}")
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_completion(self, ai_agent):
+        """Test that requests queued together are flushed as one batch."""
+        scores = await asyncio.gather(
+            *(ai_agent._request_ai_urgency(email) for email in self.make_emails(5))
+        )
+
+        assert scores == [0.9] * 5
+        assert ai_agent.openai_client.chat.completions.create.await_count == 1
+        assert ai_agent._urgency_queue == []
+
+    @pytest.mark.asyncio
+    async def test_full_batches_flush_immediately(self, ai_agent):
+        """Test that queues are split at the batch size."""
+        count = ai_agent.URGENCY_BATCH_SIZE + 4
+
+        scores = await asyncio.gather(
+            *(ai_agent._request_ai_urgency(e) for e in self.make_emails(count))
+        )
+
+        assert len(scores) == count
+        calls = ai_agent.openai_client.chat.completions.create.await_args_list
+        batch_sizes = [
+            call.kwargs["messages"][1]["content"].count("\nEmail ") for call in calls
+        ]
+        assert batch_sizes == [ai_agent.URGENCY_BATCH_SIZE, 4]
+
+    @pytest.mark.asyncio
+    async def test_sequential_requests_are_not_held_back(self, ai_agent):
+        """Test that a lone request is sent on the next loop iteration."""
+        for email in self.make_emails(2):
+            assert await ai_agent._request_ai_urgency(email) == 0.9
+
+        assert ai_agent.openai_client.chat.completions.create.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_fails_every_request(self, ai_agent):
+        """Test that a malformed response fails all emails in the batch."""
+        ai_agent.openai_client.chat.completions.create = AsyncMock(
+            return_value=urgency_completion([0.5])
+        )
+        emails = self.make_emails(3)
+
+        results = await asyncio.gather(
+            *(ai_agent._request_ai_urgency(email) for email in emails),
+            return_exceptions=True,
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+        # The analysis degrades to no AI urgency instead of raising
+        scores = await asyncio.gather(
+            *(ai_agent._ai_urgency_analysis(email) for email in emails)
+        )
+        assert scores == [0.0] * 3
+
+    @pytest.mark.asyncio
+    async def test_triage_batch_shares_completions(self, ai_agent):
+        """Test that scoring a triage batch batches its AI urgency calls."""
+        # Mentions time, but no local urgency cue, so the AI is consulted
+        emails = [
+            make_email(f"Time to sync {i}", email_id=f"email-{i}") for i in range(6)
+        ]
+
+        scores = await ai_agent.score_email_batch(emails)
+
+        assert [score.factors["urgency"] for score in scores] == [0.9] * 6
+        assert ai_agent.openai_client.chat.completions.create.await_count == 1
+
+
+class TestFeedbackHistory:
+    """Test the bounded feedback history used for accuracy stats."""
+
+    @pytest.mark.asyncio
+    async def test_accuracy_tracks_recorded_feedback(self, agent):
+        """Test that accuracy counts feedback confirming the decision."""
+        for action in ("marked_correct", "moved", "marked_correct", "archived"):
+            agent._record_feedback({"user_action": action})
+
+        stats = await agent.get_triage_stats()
+
+        assert stats["feedback_count"] == 4
+        assert stats["accuracy_percentage"] == 50.0
+
+    @pytest.mark.asyncio
+    async def test_evicted_feedback_leaves_the_count(self, agent):
+        """Test that the correct count follows entries out of the history."""
+        agent.stats["accuracy_feedback"] = deque(maxlen=3)
+        actions = ["marked_correct", "marked_correct", "moved", "moved", "correct"]
+        for action in actions:
+            agent._record_feedback({"user_action": action})
+
+        stats = await agent.get_triage_stats()
+
+        assert len(agent.stats["accuracy_feedback"]) == 3
+        assert agent.stats["accuracy_correct"] == 1
+        assert stats["accuracy_percentage"] == pytest.approx(100 / 3)
@@ -0,0 +1,127 @@
+"""Tests for the unified CEO intelligence escalation rules."""
+
+from datetime import datetime
+
+import pytest
+
+from email_agent.agents.enhanced_ceo_labeler import SenderProfile
+from email_agent.agents.relationship_intelligence import ContactProfile
+from email_agent.agents.unified_ceo_intelligence import (
+    UnifiedCEOIntelligence,
+    UnifiedIntelligence,
+)
+from email_agent.models import Email, EmailAddress
+
+
+def make_contact(relationship_type: str, importance_level: str) -> ContactProfile:
+    """Create a contact profile as the relationship intelligence builds it."""
+    return ContactProfile(
+        email="contact@example.com",
+        name="Contact",
+        company="Example",
+        role=None,
+        relationship_type=relationship_type,
+        importance_level=importance_level,
+        first_contact=None,
+        last_contact=None,
+        total_interactions=3,
+        recent_interactions=1,
+        response_pattern="fast",
+        typical_subjects=[],
+        decision_maker=False,
+        escalation_priority=3,
+        tags=[],
+        notes="",
+    )
+
+
+def make_sender(relationship_type: str, strategic_importance: str) -> SenderProfile:
+    """Create a sender profile as the enhanced labeler builds it."""
+    return SenderProfile(
+        email="contact@example.com",
+        name="Contact",
+        total_emails=3,
+        recent_emails=1,
+        strategic_importance=strategic_importance,
+        relationship_type=relationship_type,
+    )
+
+
+def make_email(subject: str) -> Email:
+    """Create an email from the profiled contact."""
+    return Email(
+        id="email-1",
+        message_id="msg-1",
+        subject=subject,
+        sender=EmailAddress(email="contact@example.com"),
+        date=datetime.now(),
+        received_date=datetime.now(),
+    )
+
+
+def make_intel(contact=None, sender=None) -> UnifiedIntelligence:
+    """Create unified intelligence knowing only the given profiles."""
+    return UnifiedIntelligence(
+        sender_intelligence={
+            "profiles": {"contact@example.com": sender} if sender else {}
+        },
+        relationship_intelligence={
+            "contacts": {"contact@example.com": contact} if contact else {}
+        },
+        thread_intelligence={"threads": {}},
+        predictive_patterns={"subject_top_labels": {}, "sender_patterns": {}},
+        auto_escalation_rules=[],
+    )
+
+
+@pytest.fixture
+def intelligence():
+    """Create the unified intelligence system."""
+    return UnifiedCEOIntelligence()
+
+
+class TestEscalationRules:
+    """Test the auto-escalation decision table."""
+
+    @pytest.mark.parametrize(
+        "relationship_type,importance_level,subject,rule_name",
+        [
+            ("board", "medium", "Quarterly update", "Board Member Priority"),
+            ("board", "critical", "Urgent: sign", "Board Member Priority"),
+            ("customer", "critical", "URGENT outage", "Critical Sender Urgent"),
+            ("customer", "critical", "Weekly sync", None),
+            ("investor", "high", "Fund update", "Investor Communication"),
+            ("vendor", "low", "Please sign the contract", "Legal/Signature Required"),
+            ("vendor", "low", "Lunch?", None),
+        ],
+    )
+    def test_rules_with_contact_profile(
+        self, intelligence, relationship_type, importance_level, subject, rule_name
+    ):
+        """Test every rule against a real contact profile."""
+        profile = make_contact(relationship_type, importance_level)
+        rule = intelligence._match_escalation_rule(profile, subject.lower())
+        assert (rule["name"] if rule else None) == rule_name
+
+    def test_rules_with_sender_profile(self, intelligence):
+        """Test that sender profiles use their strategic importance."""
+        profile = make_sender("unknown", "critical")
+        rule = intelligence._match_escalation_rule(profile, "asap please")
+        assert rule["name"] == "Critical Sender Urgent"
+
+    def test_rules_without_profile(self, intelligence):
+        """Test that unknown senders only match subject rules."""
+        assert intelligence._match_escalation_rule(None, "urgent") is None
+        rule = intelligence._match_escalation_rule(None, "legal review")
+        assert rule["name"] == "Legal/Signature Required"
+
+    @pytest.mark.asyncio
+    async def test_board_contact_is_escalated(self, intelligence):
+        """Test a full prediction for mail from a known board contact."""
+        intel = make_intel(contact=make_contact("board", "critical"))
+        prediction = await intelligence.predict_email_handling(
+            make_email("Board deck review"), intel
+        )
+        assert prediction.escalation_recommended
+        assert "Board" in prediction.suggested_labels
+        assert "Auto-escalation rule: Board Member Priority" in prediction.reasoning